@@ -1,7 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
 
 class BooksConfig(AppConfig):
     name = "bookaloo.books"
     verbose_name = _("Books")
+
+    def ready(self):
+        import bookaloo.books.signals
+
+        if settings.SERVER_TIMING_SAMPLE_RATE:
+            from bookaloo.timing import install_serializer_timing
+
+            install_serializer_timing()
@@ -0,0 +1,83 @@
+"""
+Availability summaries of books and editions: how many copies there are in
+each condition, and how many of them are available.
+
+Summaries are read from the `CopyAvailability` rows, one per edition and
+condition, maintained by `bookaloo.books.counters` along with the copy
+counters. A summary thus costs an index scan of a handful of rows, whatever
+the number of copies, and never touches `BookCopy`.
+"""
+
+from collections import defaultdict
+
+from bookaloo.books.enums import BookCondition
+from bookaloo.books.models import CopyAvailability
+
+CONDITION_ORDER = {condition: index for index, condition in enumerate(BookCondition)}
+
+
+def summarize_conditions(counts):
+    """
+    Returns the totals of the `{condition: (total, available)}` counts,
+    with the counts per condition, best condition first.
+    """
+    return {
+        "total": sum(total for total, _available in counts.values()),
+        "available": sum(available for _total, available in counts.values()),
+        "conditions": [
+            {"condition": condition, "total": total, "available": available}
+            for condition, (total, available) in sorted(
+                counts.items(),
+                key=lambda item: CONDITION_ORDER[item[0]],
+            )
+        ],
+    }
+
+
+def get_availability_rows(**filters):
+    return (
+        CopyAvailability.objects.filter(copies_count_total__gt=0, **filters)
+        .order_by("book_edition_id")
+        .values_list(
+            "book_edition_id",
+            "condition",
+            "copies_count_total",
+            "copies_count_available",
+        )
+    )
+
+
+def get_book_availability(book_id):
+    """
+    Returns the availability summary of the book, as a whole and per edition;
+    editions without copies are left out.
+    """
+    book_counts: defaultdict[str, tuple[int, int]] = defaultdict(lambda: (0, 0))
+    edition_counts: defaultdict[int, dict[str, tuple[int, int]]] = defaultdict(dict)
+    for edition_id, condition, total, available in get_availability_rows(
+        book_id=book_id,
+    ):
+        edition_counts[edition_id][condition] = (total, available)
+        book_total, book_available = book_counts[condition]
+        book_counts[condition] = (book_total + total, book_available + available)
+    return {
+        "book": book_id,
+        **summarize_conditions(book_counts),
+        "editions": [
+            {"book_edition": edition_id, **summarize_conditions(counts)}
+            for edition_id, counts in edition_counts.items()
+        ],
+    }
+
+
+def get_edition_availability(book_edition_id):
+    """
+    Returns the availability summary of the edition.
+    """
+    counts = {
+        condition: (total, available)
+        for _edition_id, condition, total, available in get_availability_rows(
+            book_edition_id=book_edition_id,
+        )
+    }
+    return {"book_edition": book_edition_id, **summarize_conditions(counts)}
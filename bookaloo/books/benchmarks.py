@@ -0,0 +1,508 @@
+"""
+Query count, latency and size benchmarks of the API routes.
+
+Every scenario requests one route with the Django test client a number of
+times, against a dataset generated with `generate_dataset`, recording the
+number of queries, the p50 / p95 latencies and the size of the rendered
+response. The results of a run can be saved as a JSON baseline, and later
+runs compared against it with `find_regressions`.
+
+`run_concurrency_benchmark` compares the throughput of the WSGI and ASGI
+deployments (see `config.asgi`) under concurrent read traffic.
+"""
+
+import asyncio
+import importlib
+import itertools
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches
+
+from bookaloo.books.datasets import DatasetSpec
+from bookaloo.books.models import Author
+from bookaloo.books.models import BookCopy
+from bookaloo.books.models import BookEdition
+from bookaloo.books.models import BookLoan
+from bookaloo.books.models import Publisher
+from bookaloo.visitors.models import Visitor
+
+BENCHMARK_UNTIL = datetime(2025, 1, 1, tzinfo=UTC)
+BENCHMARK_SIZES = {
+    "small": DatasetSpec(
+        seed=1,
+        publishers=20,
+        authors=50,
+        books=200,
+        visitors=200,
+        loans_per_copy=2,
+        until=BENCHMARK_UNTIL,
+    ),
+    "medium": DatasetSpec(
+        seed=1,
+        publishers=100,
+        authors=1000,
+        books=10_000,
+        visitors=5000,
+        loans_per_copy=3,
+        until=BENCHMARK_UNTIL,
+    ),
+    "large": DatasetSpec(
+        seed=1,
+        publishers=500,
+        authors=20_000,
+        books=200_000,
+        visitors=50_000,
+        loans_per_copy=5,
+        until=BENCHMARK_UNTIL,
+    ),
+}
+BATCH_SIZE = 10
+
+# Allowed increase of the number of queries (absolute), of the p95 latency
+# (relative, and at least `latency_floor_ms`) and of the response size
+# (relative), compared with the baseline
+DEFAULT_THRESHOLDS = {
+    "queries": 0,
+    "latency": 0.5,
+    "latency_floor_ms": 5,
+    "bytes": 0.1,
+}
+
+# Name, method, path, request body and expected status; paths and bodies
+# are built from the benchmark fixture and the iteration number
+BENCHMARK_SCENARIOS = [
+    ("authors-list", "get", lambda f, i: "/books/authors/", None, 200),
+    (
+        "authors-search",
+        "get",
+        lambda f, i: f"/books/authors/?search={f['author_name']}",
+        None,
+        200,
+    ),
+    (
+        "authors-retrieve",
+        "get",
+        lambda f, i: f"/books/authors/{f['author_id']}/",
+        None,
+        200,
+    ),
+    ("publishers-list", "get", lambda f, i: "/books/publishers/", None, 200),
+    (
+        "publishers-retrieve",
+        "get",
+        lambda f, i: f"/books/publishers/{f['publisher_id']}/",
+        None,
+        200,
+    ),
+    (
+        "publishers-editions-list",
+        "get",
+        lambda f, i: f"/books/publishers/{f['publisher_id']}/editions/",
+        None,
+        200,
+    ),
+    ("books-list", "get", lambda f, i: "/books/", None, 200),
+    ("books-list-sparse", "get", lambda f, i: "/books/?fields=id,title", None, 200),
+    (
+        "books-search",
+        "get",
+        lambda f, i: f"/books/?search={f['title_word']}",
+        None,
+        200,
+    ),
+    ("books-retrieve", "get", lambda f, i: f"/books/{f['book_id']}/", None, 200),
+    (
+        "books-availability",
+        "get",
+        lambda f, i: f"/books/{f['book_id']}/availability/",
+        None,
+        200,
+    ),
+    (
+        "editions-list",
+        "get",
+        lambda f, i: f"/books/{f['book_id']}/editions/",
+        None,
+        200,
+    ),
+    (
+        "editions-retrieve",
+        "get",
+        lambda f, i: f"/books/{f['book_id']}/editions/{f['edition_id']}/",
+        None,
+        200,
+    ),
+    (
+        "copies-list",
+        "get",
+        lambda f, i: f"/books/{f['book_id']}/editions/{f['edition_id']}/copies/",
+        None,
+        200,
+    ),
+    ("loans-list", "get", lambda f, i: "/books/loans", None, 200),
+    (
+        "loans-export",
+        "get",
+        lambda f, i: f"/books/loans/export?since_id={f['export_since_id']}",
+        None,
+        200,
+    ),
+    (
+        "loans-create",
+        "post",
+        lambda f, i: "/books/loans",
+        lambda f, i: {
+            "book_copy_identifier": f["copy_identifiers"][i],
+            "visitor_identifier": f["visitor_identifier"],
+        },
+        201,
+    ),
+    (
+        "returns-create",
+        "post",
+        lambda f, i: "/books/returns",
+        lambda f, i: {"book_copy_identifier": f["copy_identifiers"][i]},
+        200,
+    ),
+    (
+        "loans-batch",
+        "post",
+        lambda f, i: "/books/loans/batch",
+        lambda f, i: {
+            "visitor_identifier": f["visitor_identifier"],
+            "book_copy_identifiers": f["batches"][i],
+        },
+        201,
+    ),
+    (
+        "returns-batch",
+        "post",
+        lambda f, i: "/books/returns/batch",
+        lambda f, i: {
+            "items": [
+                {"book_copy_identifier": identifier} for identifier in f["batches"][i]
+            ],
+        },
+        200,
+    ),
+]
+
+# Routes of the concurrency benchmark: the catalog and loan listings
+CONCURRENCY_SCENARIOS = (
+    "authors-list",
+    "authors-search",
+    "authors-retrieve",
+    "publishers-list",
+    "publishers-retrieve",
+    "publishers-editions-list",
+    "books-list",
+    "books-list-sparse",
+    "books-search",
+    "books-retrieve",
+    "books-availability",
+    "editions-list",
+    "copies-list",
+    "loans-list",
+)
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def get_benchmark_fixture(iterations):
+    """
+    Picks the objects the scenarios request, from the generated dataset.
+
+    Copies lent out by an iteration of the loan scenarios are returned by the
+    same iteration of the return scenarios, so every iteration needs its own
+    available copies.
+    """
+    author = Author.objects.earliest("pk")
+    edition = BookEdition.objects.earliest("pk")
+    book = edition.book
+    last_loan_id = BookLoan.objects.order_by("-pk").values_list("pk", flat=True)[0]
+    copy_identifiers = list(
+        BookCopy.objects.filter(is_available=True)
+        .order_by("pk")
+        .values_list("identifier", flat=True)[: iterations * (BATCH_SIZE + 1)],
+    )
+    if len(copy_identifiers) < iterations * (BATCH_SIZE + 1):
+        msg = "Not enough available copies for the number of iterations."
+        raise BenchmarkError(msg)
+    batches = [
+        copy_identifiers[iterations + i * BATCH_SIZE :][:BATCH_SIZE]
+        for i in range(iterations)
+    ]
+    return {
+        "author_id": author.pk,
+        "author_name": author.full_name.split()[-1],
+        "publisher_id": Publisher.objects.earliest("pk").pk,
+        "book_id": book.pk,
+        "edition_id": edition.pk,
+        "title_word": book.title.split()[0],
+        "export_since_id": max(last_loan_id - 1000, 0),
+        "visitor_identifier": Visitor.objects.filter(is_active=True)
+        .earliest("pk")
+        .identifier,
+        "copy_identifiers": copy_identifiers[:iterations],
+        "batches": batches,
+    }
+
+
+def percentile(values, fraction):
+    """
+    Returns the nearest-rank percentile of `values`.
+    """
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def run_benchmarks(client, iterations):
+    """
+    Runs every scenario `iterations` times after a warm-up request.
+    Returns the measurements per scenario.
+    """
+    # NOTE: The warm-up request is one more iteration
+    fixture = get_benchmark_fixture(iterations + 1)
+    results = {}
+    for name, method, get_path, get_data, expected_status in BENCHMARK_SCENARIOS:
+        durations = []
+        queries = size = 0
+        for iteration in range(iterations + 1):
+            url = get_path(fixture, iteration)
+            data = get_data(fixture, iteration) if get_data else None
+            with CaptureQueriesContext(connection) as captured:
+                started_at = time.perf_counter()
+                if data is None:
+                    response = getattr(client, method)(url)
+                else:
+                    response = getattr(client, method)(
+                        url,
+                        data,
+                        content_type="application/json",
+                    )
+                content = (
+                    b"".join(response.streaming_content)
+                    if response.streaming
+                    else response.content
+                )
+                duration = time.perf_counter() - started_at
+            if response.status_code != expected_status:
+                msg = (
+                    f"{name}: {method.upper()} {url} returned "
+                    f"{response.status_code} instead of {expected_status}."
+                )
+                raise BenchmarkError(msg)
+            if iteration == 0:
+                continue
+            durations.append(duration * 1000)
+            queries = max(queries, len(captured))
+            size = max(size, len(content))
+        results[name] = {
+            "queries": queries,
+            "p50_ms": round(percentile(durations, 0.5), 2),
+            "p95_ms": round(percentile(durations, 0.95), 2),
+            "bytes": size,
+        }
+    return results
+
+
+def find_regressions(baseline, results, thresholds=None):
+    """
+    Compares results with a baseline, both keyed by size and scenario;
+    see `DEFAULT_THRESHOLDS`. Returns a description of each regression.
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    regressions = []
+    for size, scenarios in results.items():
+        for name, result in scenarios.items():
+            previous = baseline.get(size, {}).get(name)
+            if previous is None:
+                continue
+            label = f"{size}/{name}"
+            if result["queries"] > previous["queries"] + thresholds["queries"]:
+                regressions.append(
+                    f"{label}: {result['queries']} queries "
+                    f"(baseline: {previous['queries']})",
+                )
+            allowed_latency = max(
+                previous["p95_ms"] * (1 + thresholds["latency"]),
+                previous["p95_ms"] + thresholds["latency_floor_ms"],
+            )
+            if result["p95_ms"] > allowed_latency:
+                regressions.append(
+                    f"{label}: p95 of {result['p95_ms']:.1f} ms "
+                    f"(baseline: {previous['p95_ms']:.1f} ms)",
+                )
+            if result["bytes"] > previous["bytes"] * (1 + thresholds["bytes"]):
+                regressions.append(
+                    f"{label}: {result['bytes']} bytes (baseline: {previous['bytes']})",
+                )
+    return regressions
+
+
+def reload_urls(*, async_views):
+    """
+    Rebuilds the URL patterns with the sync or async views,
+    which are picked when the URLs are loaded (see `ASYNC_VIEWS`).
+    """
+    settings.ASYNC_VIEWS = async_views
+    for name in ("bookaloo.books.urls", settings.ROOT_URLCONF):
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+def wsgi_get(handler, url, stall):
+    environ = RequestFactory().get(url).environ
+    statuses = []
+    response = handler(environ, lambda status, headers: statuses.append(status))
+    try:
+        b"".join(response)
+    finally:
+        # NOTE: Sends `request_finished`, which closes the connections
+        response.close()
+    # A slow client, holding the worker
+    time.sleep(stall)
+    return int(statuses[0].split()[0])
+
+
+async def asgi_get(handler, url, stall):
+    parts = urlsplit(url)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": parts.path,
+        "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+    messages = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    await handler(scope, receive, send)
+    # A slow client, holding nothing but its task
+    await asyncio.sleep(stall)
+    return messages[0]["status"]
+
+
+async def _run_clients(get, urls, concurrency, requests):
+    """
+    Sends `requests` requests with `get`, cycling through `urls`,
+    from `concurrency` concurrent clients. Returns the latencies in ms
+    and the number of failed requests.
+    """
+    urls = itertools.islice(itertools.cycle(urls), requests)
+    durations = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        for url in urls:
+            started_at = time.perf_counter()
+            status = await get(url)
+            durations.append((time.perf_counter() - started_at) * 1000)
+            errors += status != 200  # noqa: PLR2004
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return durations, errors
+
+
+def run_concurrency_benchmark(
+    interface,
+    *,
+    concurrency,
+    workers,
+    requests,
+    stall_ms=0,
+):
+    """
+    Sends the GET requests of `CONCURRENCY_SCENARIOS` from `concurrency`
+    concurrent clients through Django's WSGI or ASGI handler.
+
+    - `wsgi`: requests are served by `workers` threads, like as many sync
+      gunicorn workers, with the sync views;
+    - `asgi`: requests are served on one event loop, like an uvicorn
+      worker, with the async views.
+
+    Clients take `stall_ms` to read each response, like slow clients or
+    network stalls do; meanwhile, a sync worker can't serve other requests.
+    Returns the throughput, the p50 / p95 latencies and the error count.
+    """
+    fixture = get_benchmark_fixture(0)
+    urls = [
+        get_path(fixture, 0)
+        for name, _method, get_path, *_rest in BENCHMARK_SCENARIOS
+        if name in CONCURRENCY_SCENARIOS
+    ]
+    stall = stall_ms / 1000
+    async_views = settings.ASYNC_VIEWS
+    reload_urls(async_views=interface == "asgi")
+    try:
+        if interface == "asgi":
+            asgi_handler = ASGIHandler()
+
+            async def get(url):
+                return await asgi_get(asgi_handler, url, stall)
+
+            started_at = time.perf_counter()
+            durations, errors = asyncio.run(
+                _run_clients(get, urls, concurrency, requests),
+            )
+        else:
+            wsgi_handler = WSGIHandler()
+            executor = ThreadPoolExecutor(workers)
+
+            async def get(url):
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    executor,
+                    wsgi_get,
+                    wsgi_handler,
+                    url,
+                    stall,
+                )
+
+            started_at = time.perf_counter()
+            with executor:
+                durations, errors = asyncio.run(
+                    _run_clients(get, urls, concurrency, requests),
+                )
+        duration = time.perf_counter() - started_at
+    finally:
+        reload_urls(async_views=async_views)
+    return {
+        "requests_per_second": round(requests / duration, 1),
+        "p50_ms": round(percentile(durations, 0.5), 2),
+        "p95_ms": round(percentile(durations, 0.95), 2),
+        "errors": errors,
+    }
@@ -0,0 +1,107 @@
+"""
+Fast inserts of many rows, for data loading commands.
+
+On PostgreSQL, rows are written with `COPY ... FROM STDIN`, with primary keys
+allocated upfront from the table's sequence, so that the objects can be
+referenced right away. Elsewhere, `bulk_create` is used.
+
+Like `bulk_create`, neither `save()` nor signals are called: callers must
+maintain the copy counters and search vectors of what they insert.
+"""
+
+from django.core.management.color import no_style
+from django.db import connections
+from django.db import router
+
+
+def uses_copy(model):
+    using = router.db_for_write(model)
+    return connections[using].vendor == "postgresql"
+
+
+def allocate_ids(model, count):
+    """
+    Reserves `count` primary key values from the sequence of `model`'s table.
+    """
+    if not count:
+        return []
+    using = router.db_for_write(model)
+    opts = model._meta  # noqa: SLF001
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+            "FROM generate_series(1, %s)",
+            [opts.db_table, opts.pk.column, count],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def copy_insert(objs):
+    """
+    Inserts model instances with a single `COPY`, setting their primary keys.
+    """
+    if not objs:
+        return objs
+    model = type(objs[0])
+    using = router.db_for_write(model)
+    connection = connections[using]
+    opts = model._meta  # noqa: SLF001
+    fields = [field for field in opts.concrete_fields if not field.generated]
+    for obj, pk in zip(objs, allocate_ids(model, len(objs)), strict=True):
+        obj.pk = pk
+        obj._state.adding = False  # noqa: SLF001
+        obj._state.db = using  # noqa: SLF001
+
+    copy_rows(
+        model,
+        [field.column for field in fields],
+        (
+            [
+                field.get_db_prep_save(getattr(obj, field.attname), connection)
+                for field in fields
+            ]
+            for obj in objs
+        ),
+    )
+    return objs
+
+
+def copy_rows(model, columns, rows):
+    """
+    Writes rows of plain column values into `model`'s table with a single
+    `COPY`, without building model instances. Returns the number of rows.
+    """
+    connection = connections[router.db_for_write(model)]
+    quote_name = connection.ops.quote_name
+    table = quote_name(model._meta.db_table)  # noqa: SLF001
+    sql = f"COPY {table} ({', '.join(map(quote_name, columns))}) FROM STDIN"
+    count = 0
+    with connection.cursor() as cursor, cursor.copy(sql) as copy:
+        for row in rows:
+            copy.write_row(row)
+            count += 1
+    return count
+
+
+def reset_sequences(*models):
+    """
+    Moves the primary key sequences of `models` past their largest ids,
+    after rows were inserted with explicit ids.
+    """
+    for model in models:
+        connection = connections[router.db_for_write(model)]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+                cursor.execute(sql)
+
+
+def bulk_insert(objs, batch_size=5000):
+    """
+    Inserts model instances of a single model as fast as the database allows,
+    setting their primary keys.
+    """
+    if not objs:
+        return objs
+    if uses_copy(type(objs[0])):
+        return copy_insert(objs)
+    return type(objs[0]).objects.bulk_create(objs, batch_size=batch_size)
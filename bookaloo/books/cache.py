@@ -0,0 +1,314 @@
+"""
+Response cache and conditional GETs of the catalog read endpoints.
+
+Cached responses and ETags are derived from the request and from the current
+*generations* of the resources they are built from. Instead of deleting cached
+responses, writes bump the generations of the affected resources, so that all
+keys derived from the previous generations are never looked up again (and
+expire on their own).
+
+Writes going through `Model.save()` / `Model.delete()` (viewsets, admin)
+bump the generations from the signal receivers in `bookaloo.books.signals`;
+code writing with `QuerySet.update()` or `bulk_create()` must call
+`bump_cache_generations` itself. Generations are bumped once the transaction
+is committed, so that a concurrent request can't cache a stale response
+under the new generation.
+"""
+
+import hashlib
+import math
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+
+from bookaloo.books.models import Author
+from bookaloo.books.models import Book
+from bookaloo.books.models import BookCopy
+from bookaloo.books.models import BookEdition
+from bookaloo.books.models import BookLoan
+from bookaloo.books.models import Publisher
+from bookaloo.metrics import API_CACHE_REQUESTS
+from bookaloo.replicas import read_from
+
+if TYPE_CHECKING:
+    from rest_framework.viewsets import ReadOnlyModelViewSet
+
+    from bookaloo.views import AsyncReadMixin
+
+    class _CachedViewSet(AsyncReadMixin, ReadOnlyModelViewSet): ...
+else:
+    _CachedViewSet = object
+
+AUTHORS = "authors"
+PUBLISHERS = "publishers"
+BOOKS = "books"
+EDITIONS = "editions"
+COPIES = "copies"
+
+# Resource whose generation is bumped on writes, per model
+MODEL_RESOURCES = {
+    Author: AUTHORS,
+    Publisher: PUBLISHERS,
+    Book: BOOKS,
+    BookEdition: EDITIONS,
+    BookCopy: COPIES,
+    # Loans and returns change the copy availability
+    BookLoan: COPIES,
+}
+
+GENERATION_KEY_PREFIX = "api:generation"
+MODIFIED_KEY_PREFIX = "api:modified"
+RESPONSE_KEY_PREFIX = "api:response"
+
+
+def get_generation_key(resource):
+    return f"{GENERATION_KEY_PREFIX}:{resource}"
+
+
+def get_modified_key(resource):
+    return f"{MODIFIED_KEY_PREFIX}:{resource}"
+
+
+def get_resource_versions(resources):
+    """
+    Returns the current generations of `resources` and the (Unix) time
+    of their last modification, initializing missing ones.
+    """
+    keys = {
+        resource: (get_generation_key(resource), get_modified_key(resource))
+        for resource in resources
+    }
+    values = cache.get_many([key for pair in keys.values() for key in pair])
+    missing = {}
+    for generation_key, modified_key in keys.values():
+        if generation_key not in values or modified_key not in values:
+            missing[generation_key] = _initial_generation()
+            missing[modified_key] = time.time()
+    if missing:
+        cache.set_many(missing, timeout=None)
+        values.update(missing)
+    generations = [values[generation_key] for generation_key, _key in keys.values()]
+    last_modified = max(values[modified_key] for _key, modified_key in keys.values())
+    return generations, last_modified
+
+
+def _initial_generation():
+    # A time-based value, so that the generation of an evicted key
+    # doesn't start over and collide with the previous ones
+    return time.time_ns()
+
+
+def _bump_generations(resources):
+    for resource in resources:
+        key = get_generation_key(resource)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_generation(), timeout=None)
+    modified = time.time()
+    cache.set_many(
+        {get_modified_key(resource): modified for resource in resources},
+        timeout=None,
+    )
+
+
+def bump_cache_generations(*resources):
+    """
+    Invalidates the cached responses built from `resources`
+    once the current transaction is committed.
+    """
+    transaction.on_commit(lambda: _bump_generations(resources))
+
+
+@dataclass
+class CacheLookup:
+    """
+    Outcome of the cache lookup of a request, see `CachedResponseMixin`.
+    """
+
+    # The 304 or cached response, if any
+    response: HttpResponse | None = None
+    # Key the response is to be cached under, with `API_CACHE_ENABLED`
+    key: str | None = None
+    etag: str | None = None
+    last_modified_at: int | None = None
+    read_from_primary: bool = False
+
+
+class CachedResponseMixin(_CachedViewSet):
+    """
+    Caches the `list` and `retrieve` responses of a viewset, on both sides,
+    and their async counterparts (see `bookaloo.views.AsyncReadMixin`).
+
+    `cache_resources` lists the resources the responses are built from;
+    the first one names the cache in the hit/miss stats.
+
+    - With `API_CACHE_ENABLED`, responses are cached in the default cache
+      and carry an `X-Cache: HIT` / `MISS` header.
+    - With `API_CONDITIONAL_GET_ENABLED`, responses carry a strong `ETag`
+      and, unless the resources were modified within the current second,
+      a `Last-Modified` header derived from the resource generations,
+      and conditional requests are answered with 304 before the queryset
+      is evaluated or anything is serialized.
+    """
+
+    cache_resources: tuple[str, ...] = ()
+    cache_header = "X-Cache"
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.aget_cached_response(
+            super().alist,
+            request,
+            *args,
+            **kwargs,
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.aget_cached_response(
+            super().aretrieve,
+            request,
+            *args,
+            **kwargs,
+        )
+
+    def is_cache_enabled(self):
+        return settings.API_CACHE_ENABLED or settings.API_CONDITIONAL_GET_ENABLED
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if not self.is_cache_enabled():
+            return handler(request, *args, **kwargs)
+        lookup = self.lookup_response(request)
+        if lookup.response is not None:
+            return lookup.response
+        with read_from(None) if lookup.read_from_primary else nullcontext():
+            response = handler(request, *args, **kwargs)
+        return self.store_response(response, lookup)
+
+    async def aget_cached_response(self, handler, request, *args, **kwargs):
+        if not self.is_cache_enabled():
+            return await handler(request, *args, **kwargs)
+        lookup = await sync_to_async(self.lookup_response)(request)
+        if lookup.response is not None:
+            return lookup.response
+        with read_from(None) if lookup.read_from_primary else nullcontext():
+            response = await handler(request, *args, **kwargs)
+        return await sync_to_async(self.store_response)(response, lookup)
+
+    def lookup_response(self, request):
+        """
+        Answers the request with a 304 or a cached response, if possible;
+        otherwise returns what's needed to cache and tag the response.
+        """
+        generations, last_modified = get_resource_versions(self.cache_resources)
+        current_time = time.time()
+        lookup = CacheLookup(
+            # NOTE: Replicas may not have caught up with the last writes
+            #       yet, see `bookaloo.replicas`
+            read_from_primary=(
+                current_time - last_modified < settings.DATABASE_REPLICA_MAX_LAG
+            ),
+        )
+        request_key = self.get_request_cache_key(request)
+        if settings.API_CONDITIONAL_GET_ENABLED:
+            lookup.etag = etag = self.get_etag(request, request_key, generations)
+            # NOTE: HTTP dates have a one-second resolution, so the date is
+            #       rounded up, and only sent once that second is over, as
+            #       later writes could otherwise share it; until then, the
+            #       ETag alone tells the versions apart
+            if math.ceil(last_modified) < current_time:
+                lookup.last_modified_at = math.ceil(last_modified)
+            not_modified = get_conditional_response(
+                request,
+                etag=lookup.etag,
+                last_modified=lookup.last_modified_at,
+            )
+            if not_modified is not None:
+                not_modified["ETag"] = etag
+                lookup.response = not_modified
+                return lookup
+
+        if settings.API_CACHE_ENABLED:
+            lookup.key = self.get_response_cache_key(request_key, generations)
+            response = self.get_response_from_cache(lookup.key)
+            if response is not None:
+                lookup.response = self.tag_response(response, lookup)
+        return lookup
+
+    def get_response_from_cache(self, key):
+        resource = self.cache_resources[0]
+        cached = cache.get(key)
+        if cached is None:
+            API_CACHE_REQUESTS.labels(resource, "miss").inc()
+            return None
+        API_CACHE_REQUESTS.labels(resource, "hit").inc()
+        status, data = cached
+        response = Response(data, status=status)
+        response[self.cache_header] = "HIT"
+        return response
+
+    def store_response(self, response, lookup):
+        """
+        Caches the response built by the view, if enabled, and tags it.
+        """
+        if lookup.key is not None:
+            if response.status_code == 200:  # noqa: PLR2004
+                cache.set(
+                    lookup.key,
+                    (response.status_code, response.data),
+                    timeout=settings.API_CACHE_TIMEOUT,
+                )
+            response[self.cache_header] = "MISS"
+        return self.tag_response(response, lookup)
+
+    def tag_response(self, response, lookup):
+        if lookup.etag is not None and response.status_code == 200:  # noqa: PLR2004
+            response["ETag"] = lookup.etag
+            if lookup.last_modified_at is not None:
+                response["Last-Modified"] = http_date(lookup.last_modified_at)
+            patch_vary_headers(response, ["Accept"])
+        return response
+
+    def get_request_cache_key(self, request):
+        # NOTE: The host is a part of the key, as paginated
+        #       responses carry absolute links
+        return "|".join(
+            [
+                self.basename,
+                request.get_host(),
+                request.path,
+                *sorted(f"{key}={value}" for key, value in request.GET.lists()),
+            ],
+        )
+
+    def get_response_cache_key(self, request_key, generations):
+        digest = hashlib.sha256(request_key.encode()).hexdigest()
+        generation = ".".join(str(generation) for generation in generations)
+        return f"{RESPONSE_KEY_PREFIX}:{self.basename}:{generation}:{digest}"
+
+    def get_etag(self, request, request_key, generations):
+        # NOTE: Strong ETags promise identical bytes,
+        #       so the negotiated media type is a part of them
+        parts = [
+            request_key,
+            request.headers.get("Accept", ""),
+            *(str(generation) for generation in generations),
+        ]
+        return quote_etag(hashlib.sha256("|".join(parts).encode()).hexdigest()[:32])
@@ -0,0 +1,369 @@
+"""
+Write paths of the loan desk: checking book copies out to visitors
+and taking them back.
+
+They are written to keep the number of database round trips of a request
+constant, relying on database constraints instead of read-then-write checks.
+"""
+
+from datetime import timedelta
+
+from django.db import IntegrityError
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import Exists
+from django.db.models import F
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import JSONObject
+from django.utils.timezone import now
+
+from bookaloo.books.cache import COPIES
+from bookaloo.books.cache import bump_cache_generations
+from bookaloo.books.counters import availability_counters_delta
+from bookaloo.books.counters import copy_change_delta
+from bookaloo.books.counters import merge_copy_counters_deltas
+from bookaloo.books.counters import update_copy_counters
+from bookaloo.books.enums import BatchItemStatus
+from bookaloo.books.models import BookCopy
+from bookaloo.books.models import BookLoan
+from bookaloo.books.reservations import allocate_returned_copies
+from bookaloo.books.reservations import fulfil_reservations
+from bookaloo.books.reservations import get_reserved_for
+from bookaloo.books.reservations import has_waiting_reservations
+from bookaloo.metrics import CHECKOUT
+from bookaloo.metrics import RETURN
+from bookaloo.metrics import record_loan_operations
+from bookaloo.visitors.models import Visitor
+
+ACTIVE_LOAN_CONSTRAINT = "unique_active_loan_per_book_copy"
+DEFAULT_LOAN_PERIOD = timedelta(weeks=2)
+
+# NOTE: The visitor of a checkout is read as a JSON object; its values are
+#       converted back with each field's `to_python`, so that dates, decimals
+#       or UUIDs don't come back as strings. Fields left out are deferred.
+CHECKOUT_VISITOR_FIELDS = (
+    "id",
+    "identifier",
+    "full_name",
+    "email",
+    "phone_number",
+    "is_active",
+)
+
+
+class BookCopyNotAvailable(Exception):  # noqa: N818
+    """
+    Raised when a book copy is already lent out.
+    """
+
+
+def is_constraint_violation(error, constraint_name):
+    """
+    Tells whether the `IntegrityError` was caused by the given constraint.
+    """
+    diag = getattr(error.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None) == constraint_name
+
+
+def get_default_due_date():
+    return now() + DEFAULT_LOAN_PERIOD
+
+
+def is_available_for(book_copy, visitor):
+    """
+    Tells whether the copy can be lent to the visitor: copies held for
+    a reservation (see `bookaloo.books.reservations`) only to its visitor.
+    The copy should be annotated with `reserved_for_id`.
+    """
+    reserved_for_id = getattr(book_copy, "reserved_for_id", None)
+    if reserved_for_id is not None:
+        return reserved_for_id == visitor.pk
+    return book_copy.is_available
+
+
+def get_book_copy_for_checkout(book_copy_identifier, visitor_identifier):
+    """
+    Fetches and locks the book copy, along with its edition, book and author,
+    the visitor and the id of the visitor it is held for, in a single query.
+
+    Returns `(book_copy, visitor)`; either of them is `None` if not found.
+    """
+    visitor_data = Visitor.objects.filter(identifier=visitor_identifier)
+    book_copy = (
+        BookCopy.objects.select_for_update(of=("self",))
+        .select_related("book_edition__book__author")
+        .annotate(
+            visitor_data=Subquery(
+                visitor_data.values(
+                    data=JSONObject(**{name: name for name in CHECKOUT_VISITOR_FIELDS}),
+                ),
+            ),
+            reserved_for_id=get_reserved_for(),
+        )
+        .filter(identifier=book_copy_identifier)
+        .first()
+    )
+    if book_copy is None:
+        visitor = Visitor.objects.filter(identifier=visitor_identifier).first()
+        return None, visitor
+    if book_copy.visitor_data is None:
+        return book_copy, None
+    fields = [
+        field
+        for field in Visitor._meta.fields  # noqa: SLF001
+        if field.name in CHECKOUT_VISITOR_FIELDS
+    ]
+    visitor = Visitor.from_db(
+        book_copy._state.db,  # noqa: SLF001
+        [field.attname for field in fields],
+        [field.to_python(book_copy.visitor_data[field.name]) for field in fields],
+    )
+    return book_copy, visitor
+
+
+def checkout(*, book_copy, visitor, due_date):
+    """
+    Lends the book copy to the visitor.
+
+    The copy should be locked with `get_book_copy_for_checkout`.
+    Instead of checking for active loans upfront, the insert relies on
+    the `unique_active_loan_per_book_copy` constraint, which catches
+    copies marked as available by mistake, too.
+
+    Copies held for the visitor's reservation are already counted
+    as unavailable; their reservation is fulfilled instead.
+    """
+    if not is_available_for(book_copy, visitor):
+        raise BookCopyNotAvailable
+    try:
+        with transaction.atomic():
+            book_loan = BookLoan.objects.create(
+                book_copy=book_copy,
+                visitor=visitor,
+                due_date=due_date,
+            )
+    except IntegrityError as e:
+        if not is_constraint_violation(e, ACTIVE_LOAN_CONSTRAINT):
+            raise
+        raise BookCopyNotAvailable from e
+    if fulfil_reservations([book_copy], visitor):
+        record_loan_operations(CHECKOUT)
+        return book_loan
+    BookCopy.objects.filter(pk=book_copy.pk).update(is_available=False)
+    book_copy.is_available = False
+    update_copy_counters(
+        availability_counters_delta(
+            book_id=book_copy.book_edition.book_id,
+            book_edition_id=book_copy.book_edition_id,
+            condition=book_copy.condition,
+            is_available=False,
+        ),
+    )
+    record_loan_operations(CHECKOUT)
+    return book_loan
+
+
+def checkout_many(*, visitor, book_copy_identifiers, due_date, atomic=True):
+    """
+    Lends a stack of book copies to the visitor with a fixed number of queries.
+
+    The copies are fetched and locked with one query, which also tells
+    whether they have any active loans and whom they are held for. The loans
+    are created with a single `bulk_create` and the copies flagged with
+    a single `UPDATE`; the reservations of held copies are fulfilled
+    with another one.
+
+    Returns one result per identifier, in the given order, with a
+    `BatchItemStatus` and the created `book_loan` (if any). With `atomic`,
+    nothing is lent out unless every copy can be.
+    """
+    book_copies = {
+        book_copy.identifier: book_copy
+        for book_copy in BookCopy.objects.select_for_update(of=("self",))
+        .select_related("book_edition__book__author")
+        .annotate(
+            has_active_loan=Exists(
+                BookLoan.objects.filter(
+                    book_copy=OuterRef("pk"),
+                    return_date__isnull=True,
+                ),
+            ),
+            reserved_for_id=get_reserved_for(),
+        )
+        .filter(identifier__in=book_copy_identifiers)
+        # Lock in a consistent order, to avoid deadlocks between batches
+        .order_by("pk")
+    }
+
+    results = []
+    seen = set()
+    for identifier in book_copy_identifiers:
+        book_copy = book_copies.get(identifier)
+        if identifier in seen:
+            status = BatchItemStatus.DUPLICATE
+        elif book_copy is None:
+            status = BatchItemStatus.NOT_FOUND
+        elif not is_available_for(book_copy, visitor) or book_copy.has_active_loan:
+            status = BatchItemStatus.NOT_AVAILABLE
+        else:
+            status = BatchItemStatus.LOANED
+        seen.add(identifier)
+        results.append(
+            {
+                "book_copy_identifier": identifier,
+                "status": status,
+                "book_copy": book_copy,
+                "book_loan": None,
+            },
+        )
+
+    to_loan = [
+        result for result in results if result["status"] == BatchItemStatus.LOANED
+    ]
+    if atomic and len(to_loan) < len(results):
+        for result in to_loan:
+            result["status"] = BatchItemStatus.SKIPPED
+        return results
+    if not to_loan:
+        return results
+
+    loaned_copies = [book_copies[result["book_copy_identifier"]] for result in to_loan]
+    book_loans = BookLoan.objects.bulk_create(
+        [
+            BookLoan(book_copy=book_copy, visitor=visitor, due_date=due_date)
+            for book_copy in loaned_copies
+        ],
+    )
+    for result, book_loan in zip(to_loan, book_loans, strict=True):
+        result["book_loan"] = book_loan
+    held = fulfil_reservations(loaned_copies, visitor)
+    # NOTE: Copies held for the visitor are already counted as unavailable
+    to_flag = [book_copy for book_copy in loaned_copies if book_copy.pk not in held]
+    BookCopy.objects.filter(pk__in=[book_copy.pk for book_copy in to_flag]).update(
+        is_available=False,
+    )
+    deltas = []
+    for book_copy in to_flag:
+        book_copy.is_available = False
+        deltas.append(
+            availability_counters_delta(
+                book_id=book_copy.book_edition.book_id,
+                book_edition_id=book_copy.book_edition_id,
+                condition=book_copy.condition,
+                is_available=False,
+            ),
+        )
+    update_copy_counters(merge_copy_counters_deltas(*deltas))
+    bump_cache_generations(COPIES)
+    record_loan_operations(CHECKOUT, len(to_loan))
+    return results
+
+
+def return_many(items):
+    """
+    Takes a stack of book copies back with a fixed number of queries.
+
+    `items` is a list of `{"book_copy_identifier": ..., "book_copy_condition": ...}`
+    dicts, the condition being optional. The open loans of all the copies are
+    fetched and locked with one query; the loans are closed with one `UPDATE`
+    and the copies flagged (and their conditions updated) with another one.
+    Copies of books with waiting reservations are held for the heads of
+    the queues instead, see `bookaloo.books.reservations`.
+
+    Returns one result per item, in the given order, with a `BatchItemStatus`
+    and the closed `book_loan` (if any).
+    """
+    identifiers = [item["book_copy_identifier"] for item in items]
+    book_loans = {
+        book_loan.book_copy.identifier: book_loan
+        for book_loan in BookLoan.objects.select_for_update(of=("self", "book_copy"))
+        .select_related("book_copy__book_edition")
+        .annotate(
+            has_waiting_reservations=has_waiting_reservations(
+                "book_copy__book_edition",
+            ),
+        )
+        .filter(book_copy__identifier__in=identifiers, return_date__isnull=True)
+        # Lock in a consistent order, to avoid deadlocks between batches
+        .order_by("book_copy_id")
+    }
+    missing = set(identifiers).difference(book_loans)
+    if missing:
+        existing = set(
+            BookCopy.objects.filter(identifier__in=missing).values_list(
+                "identifier",
+                flat=True,
+            ),
+        )
+        missing.difference_update(existing)
+
+    results = []
+    seen = set()
+    for item in items:
+        identifier = item["book_copy_identifier"]
+        if identifier in seen:
+            status = BatchItemStatus.DUPLICATE
+        elif identifier in missing:
+            status = BatchItemStatus.NOT_FOUND
+        elif identifier not in book_loans:
+            status = BatchItemStatus.NOT_LOANED
+        else:
+            status = BatchItemStatus.RETURNED
+        seen.add(identifier)
+        results.append(
+            {
+                "book_copy_identifier": identifier,
+                "status": status,
+                "book_loan": book_loans.get(identifier)
+                if status == BatchItemStatus.RETURNED
+                else None,
+                "book_copy_condition": item.get("book_copy_condition"),
+            },
+        )
+
+    to_return = [result for result in results if result["book_loan"] is not None]
+    if not to_return:
+        return results
+
+    return_date = now()
+    BookLoan.objects.filter(
+        pk__in=[result["book_loan"].pk for result in to_return],
+    ).update(return_date=return_date)
+    held = allocate_returned_copies([result["book_loan"] for result in to_return])
+    conditions = [
+        When(pk=result["book_loan"].book_copy_id, then=Value(condition))
+        for result in to_return
+        if (condition := result["book_copy_condition"])
+    ]
+    BookCopy.objects.filter(
+        pk__in=[result["book_loan"].book_copy_id for result in to_return],
+    ).update(
+        is_available=~Q(pk__in=held) if held else True,
+        condition=Case(*conditions, default=F("condition")),
+    )
+    deltas = []
+    for result in to_return:
+        book_loan = result["book_loan"]
+        book_copy = book_loan.book_copy
+        book_loan.return_date = return_date
+        previous_condition = book_copy.condition
+        was_available = book_copy.is_available
+        if result["book_copy_condition"]:
+            book_copy.condition = result["book_copy_condition"]
+        if not book_copy.is_available and book_copy.pk not in held:
+            book_copy.is_available = True
+        deltas.append(
+            copy_change_delta(
+                book_copy,
+                condition=previous_condition,
+                is_available=was_available,
+            ),
+        )
+    update_copy_counters(merge_copy_counters_deltas(*deltas))
+    bump_cache_generations(COPIES)
+    record_loan_operations(RETURN, len(to_return))
+    return results
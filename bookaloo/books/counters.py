@@ -0,0 +1,322 @@
+"""
+Maintenance of the denormalized copy counters stored on `Book` and `BookEdition`,
+and of the per-condition `CopyAvailability` rows of the editions.
+
+`copies_count_total` and `copies_count_available` are derived from `BookCopy`
+rows. They exist so that catalog listings don't have to aggregate over the
+Book -> BookEdition -> BookCopy join. Every code path that creates, deletes,
+moves, (un)borrows or changes the condition of a copy must report the change
+through `update_copy_counters`, within the same transaction as the change
+itself.
+
+`CopyAvailability` rows are updated with relative increments as well, so that
+concurrent loans and returns of copies of the same edition don't overwrite
+each other's changes.
+"""
+
+import operator
+from collections import defaultdict
+from functools import reduce
+
+from django.db.models import Case
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import IntegerField
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
+from django.db.models import Sum
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Coalesce
+
+from bookaloo.books.models.book import Book
+from bookaloo.books.models.book_copy import BookCopy
+from bookaloo.books.models.book_edition import BookEdition
+from bookaloo.books.models.copy_availability import CopyAvailability
+
+COUNTER_FIELDS = ("copies_count_total", "copies_count_available")
+
+
+def copy_counters_delta(*, book_id, book_edition_id, condition, is_available, sign=1):
+    """
+    Returns the counters delta caused by adding (`sign=1`)
+    or removing (`sign=-1`) a single copy.
+    """
+    return {
+        (book_id, book_edition_id, condition): (sign, sign if is_available else 0),
+    }
+
+
+def availability_counters_delta(*, book_id, book_edition_id, condition, is_available):
+    """
+    Returns the counters delta caused by a single copy
+    becoming available (`is_available=True`) or borrowed.
+    """
+    return {
+        (book_id, book_edition_id, condition): (0, 1 if is_available else -1),
+    }
+
+
+def copy_change_delta(book_copy, *, condition, is_available):
+    """
+    Returns the counters delta caused by a single copy changing from the given
+    condition and availability to its current ones.
+    """
+    ids = {
+        "book_id": book_copy.book_edition.book_id,
+        "book_edition_id": book_copy.book_edition_id,
+    }
+    return merge_copy_counters_deltas(
+        copy_counters_delta(
+            **ids,
+            condition=condition,
+            is_available=is_available,
+            sign=-1,
+        ),
+        copy_counters_delta(
+            **ids,
+            condition=book_copy.condition,
+            is_available=book_copy.is_available,
+        ),
+    )
+
+
+def merge_copy_counters_deltas(*deltas):
+    merged: defaultdict[tuple, tuple[int, int]] = defaultdict(lambda: (0, 0))
+    for delta in deltas:
+        for key, (total, available) in delta.items():
+            merged_total, merged_available = merged[key]
+            merged[key] = (merged_total + total, merged_available + available)
+    return dict(merged)
+
+
+def _apply_deltas(queryset, deltas):
+    deltas = {pk: delta for pk, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+    updates = {}
+    for index, field_name in enumerate(COUNTER_FIELDS):
+        whens = [
+            When(pk=pk, then=Value(delta[index]))
+            for pk, delta in deltas.items()
+            if delta[index]
+        ]
+        if whens:
+            updates[field_name] = F(field_name) + Case(
+                *whens,
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+    queryset.filter(pk__in=deltas).update(**updates)
+
+
+def _apply_availability_deltas(deltas):
+    deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+    # NOTE: Rows only need to be created as copies are added; rows created
+    #       concurrently by another transaction are left as they are
+    CopyAvailability.objects.bulk_create(
+        [
+            CopyAvailability(
+                book_id=book_id,
+                book_edition_id=edition_id,
+                condition=condition,
+            )
+            for (book_id, edition_id, condition), (total, _available) in sorted(
+                deltas.items(),
+            )
+            if total > 0
+        ],
+        ignore_conflicts=True,
+    )
+    rows = {key: Q(book_edition_id=key[1], condition=key[2]) for key in deltas}
+    updates = {}
+    for index, field_name in enumerate(COUNTER_FIELDS):
+        whens = [
+            When(rows[key], then=Value(delta[index]))
+            for key, delta in deltas.items()
+            if delta[index]
+        ]
+        if whens:
+            updates[field_name] = F(field_name) + Case(
+                *whens,
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+    CopyAvailability.objects.filter(reduce(operator.or_, rows.values())).update(
+        **updates,
+    )
+
+
+def update_copy_counters(deltas):
+    """
+    Applies counter deltas with at most one query per table, plus one to
+    create the missing `CopyAvailability` rows when copies are added.
+
+    `deltas` maps `(book_id, book_edition_id, condition)` keys to
+    `(total, available)` increments. `book_edition_id` and `condition` may be
+    `None` to adjust only the book, e.g. when a whole edition is moved to
+    another book.
+    """
+    book_deltas = merge_copy_counters_deltas(
+        *(
+            {book_id: delta}
+            for (book_id, _edition_id, _condition), delta in deltas.items()
+        ),
+    )
+    edition_deltas = merge_copy_counters_deltas(
+        *(
+            {edition_id: delta}
+            for (_book_id, edition_id, _condition), delta in deltas.items()
+            if edition_id is not None
+        ),
+    )
+    availability_deltas = {
+        key: delta
+        for key, delta in deltas.items()
+        if key[1] is not None and key[2] is not None
+    }
+    _apply_availability_deltas(availability_deltas)
+    _apply_deltas(BookEdition.objects.all(), edition_deltas)
+    _apply_deltas(Book.objects.all(), book_deltas)
+
+
+def actual_edition_counters():
+    """
+    Returns the expressions computing the edition counters from `BookCopy` rows.
+    """
+    copies = (
+        BookCopy.objects.filter(book_edition=OuterRef("pk"))
+        .order_by()
+        .values("book_edition")
+    )
+    return {
+        "copies_count_total": Coalesce(
+            Subquery(copies.annotate(count=Count("pk")).values("count")),
+            0,
+        ),
+        "copies_count_available": Coalesce(
+            Subquery(
+                copies.annotate(
+                    count=Count("pk", filter=Q(is_available=True)),
+                ).values("count"),
+            ),
+            0,
+        ),
+    }
+
+
+def actual_book_counters():
+    """
+    Returns the expressions computing the book counters from edition counters.
+    """
+    editions = BookEdition.objects.filter(book=OuterRef("pk")).order_by().values("book")
+    return {
+        field_name: Coalesce(
+            Subquery(editions.annotate(total=Sum(field_name)).values("total")),
+            0,
+        )
+        for field_name in COUNTER_FIELDS
+    }
+
+
+def actual_copy_availability(book_ids):
+    """
+    Returns the `CopyAvailability` values of the given books' copies,
+    computed from `BookCopy` rows.
+    """
+    return (
+        BookCopy.objects.filter(book_edition__book_id__in=book_ids)
+        .order_by()
+        .values("book_edition_id", "condition", book_id=F("book_edition__book_id"))
+        .annotate(
+            copies_count_total=Count("pk"),
+            copies_count_available=Count("pk", filter=Q(is_available=True)),
+        )
+    )
+
+
+def rebuild_copy_counters(book_ids):
+    """
+    Recomputes the counters and the availability rows of the given books
+    and all of their editions.
+    """
+    BookEdition.objects.filter(book_id__in=book_ids).update(
+        **actual_edition_counters(),
+    )
+    Book.objects.filter(pk__in=book_ids).update(**actual_book_counters())
+    CopyAvailability.objects.filter(book_id__in=book_ids).delete()
+    CopyAvailability.objects.bulk_create(
+        [CopyAvailability(**values) for values in actual_copy_availability(book_ids)],
+    )
+
+
+def find_copy_availability_drift(book_ids):
+    """
+    Returns the `(book_edition_id, condition)` keys of the given books whose
+    stored availability doesn't match the actual one, with both counters.
+    """
+    actual = {
+        (values["book_edition_id"], values["condition"]): (
+            values["copies_count_total"],
+            values["copies_count_available"],
+        )
+        for values in actual_copy_availability(book_ids)
+    }
+    stored = {
+        (edition_id, condition): (total, available)
+        for edition_id, condition, total, available in CopyAvailability.objects.filter(
+            book_id__in=book_ids,
+        ).values_list("book_edition_id", "condition", *COUNTER_FIELDS)
+        if total or available
+    }
+    return {
+        key: (stored.get(key, (0, 0)), actual.get(key, (0, 0)))
+        for key in stored.keys() | actual.keys()
+        if stored.get(key) != actual.get(key)
+    }
+
+
+def find_copy_counters_drift(queryset):
+    """
+    Returns the objects of `queryset` (books or editions)
+    whose stored counters don't match the actual ones.
+    """
+    if queryset.model is Book:
+        actual = {
+            "actual_total": Coalesce(
+                Subquery(
+                    BookCopy.objects.filter(book_edition__book=OuterRef("pk"))
+                    .order_by()
+                    .values("book_edition__book")
+                    .annotate(count=Count("pk"))
+                    .values("count"),
+                ),
+                0,
+            ),
+            "actual_available": Coalesce(
+                Subquery(
+                    BookCopy.objects.filter(
+                        book_edition__book=OuterRef("pk"),
+                        is_available=True,
+                    )
+                    .order_by()
+                    .values("book_edition__book")
+                    .annotate(count=Count("pk"))
+                    .values("count"),
+                ),
+                0,
+            ),
+        }
+    else:
+        edition_counters = actual_edition_counters()
+        actual = {
+            "actual_total": edition_counters["copies_count_total"],
+            "actual_available": edition_counters["copies_count_available"],
+        }
+    return queryset.annotate(**actual).exclude(
+        copies_count_total=F("actual_total"),
+        copies_count_available=F("actual_available"),
+    )
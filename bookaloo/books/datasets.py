@@ -0,0 +1,370 @@
+"""
+Deterministic synthetic datasets, for load tests and benchmarks.
+
+Rows are generated in blocks of `DATASET_BLOCK_SIZE` ids, each block with its
+own random generator seeded with the dataset seed, the kind of rows and the
+first id of the block. The generated data thus only depends on the seed and
+the sizes, not on how many workers generate it or in which order.
+
+Every book has the same number of editions, every edition the same number of
+copies and every copy the same number of loans, so all ids are derived from
+the book ids: workers write disjoint id ranges with `COPY`, in parallel and
+without coordinating. The copy counters and availability rows are computed
+while generating, and the search vectors are refreshed per block.
+"""
+
+import random
+import string
+from collections import defaultdict
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+
+from django.db import transaction
+
+from bookaloo.books.bulk import copy_rows
+from bookaloo.books.circulation import DEFAULT_LOAN_PERIOD
+from bookaloo.books.enums import BookCondition
+from bookaloo.books.models import Author
+from bookaloo.books.models import Book
+from bookaloo.books.models import BookCopy
+from bookaloo.books.models import BookEdition
+from bookaloo.books.models import BookLoan
+from bookaloo.books.models import CopyAvailability
+from bookaloo.books.models import Publisher
+from bookaloo.books.search import refresh_search_vectors
+from bookaloo.visitors.models import Visitor
+
+DATASET_BLOCK_SIZE = 1000
+
+HOUR = 3600
+DAY = 24 * HOUR
+FIRST_PUBLICATION_DAY = date(1950, 1, 1).toordinal()
+
+# In insertion order
+DATASET_MODELS = [
+    Publisher,
+    Author,
+    Visitor,
+    Book,
+    BookEdition,
+    BookCopy,
+    CopyAvailability,
+    BookLoan,
+]
+
+IDENTIFIER_ALPHABET = string.digits + string.ascii_uppercase
+IDENTIFIER_LENGTH = 6
+MAX_IDENTIFIED_ROWS = len(IDENTIFIER_ALPHABET) ** IDENTIFIER_LENGTH - 1
+
+FIRST_NAMES = [
+    "Anna", "Adam", "Beata", "Cyprian", "Dorota", "Emil", "Felicja", "Gustaw",
+    "Halina", "Igor", "Joanna", "Karol", "Laura", "Marek", "Nina", "Olaf",
+    "Paulina", "Roman", "Sylwia", "Tomasz", "Urszula", "Wiktor", "Zofia", "Jan",
+]  # fmt: skip
+LAST_NAMES = [
+    "Nowak", "Kowalski", "Wiśniewska", "Wójcik", "Kowalczyk", "Kamińska",
+    "Lewandowski", "Zielińska", "Szymański", "Woźniak", "Dąbrowska", "Kozłowski",
+    "Jankowska", "Mazur", "Kwiatkowski", "Krawczyk", "Piotrowska", "Grabowski",
+]  # fmt: skip
+TITLE_WORDS = [
+    "river", "shadow", "garden", "winter", "stone", "letters", "silence", "city",
+    "crown", "ocean", "forest", "memory", "glass", "journey", "night", "island",
+    "fire", "mirror", "empire", "storm", "house", "orchard", "song", "bridge",
+    "lantern", "harbor", "promise", "secret", "dragon", "machine", "star", "road",
+]  # fmt: skip
+PUBLISHER_NAMES = [
+    "Northwind", "Blue Heron", "Old Mill", "Lighthouse", "Granite", "Paper Crane",
+    "Meridian", "Foxglove", "Riverside", "Copper Leaf", "Tall Pine", "Half Moon",
+]  # fmt: skip
+PUBLISHER_SUFFIXES = ["Press", "Books", "Publishing", "House"]
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    seed: int = 0
+    publishers: int = 100
+    authors: int = 1000
+    books: int = 10_000
+    editions_per_book: int = 2
+    copies_per_edition: int = 3
+    visitors: int = 10_000
+    loans_per_copy: int = 5
+    # Share of copies whose most recent loan is still open
+    active_loan_ratio: float = 0.1
+    # Loans are generated back in time from this moment
+    until: datetime = field(
+        default_factory=lambda: datetime.now(tz=UTC).replace(
+            hour=0,
+            minute=0,
+            second=0,
+            microsecond=0,
+        ),
+    )
+
+    @property
+    def editions(self):
+        return self.books * self.editions_per_book
+
+    @property
+    def copies(self):
+        return self.editions * self.copies_per_edition
+
+    @property
+    def loans(self):
+        return self.copies * self.loans_per_copy
+
+    def validate(self):
+        """
+        Returns a list of problems with the sizes.
+        """
+        problems = []
+        if self.books and not self.authors:
+            problems.append("Books need authors.")
+        if self.editions and not self.publishers:
+            problems.append("Editions need publishers.")
+        if self.loans and not self.visitors:
+            problems.append("Loans need visitors.")
+        if max(self.copies, self.visitors) > MAX_IDENTIFIED_ROWS:
+            problems.append(
+                f"At most {MAX_IDENTIFIED_ROWS} copies and visitors can be "
+                f"identified with {IDENTIFIER_LENGTH} characters.",
+            )
+        return problems
+
+
+def get_identifier(pk):
+    """
+    Returns the fixed-length base 36 identifier of the `pk`-th copy or visitor.
+    """
+    digits = []
+    for _i in range(IDENTIFIER_LENGTH):
+        pk, digit = divmod(pk, len(IDENTIFIER_ALPHABET))
+        digits.append(IDENTIFIER_ALPHABET[digit])
+    return "".join(reversed(digits))
+
+
+def get_publisher_name(pk):
+    name = PUBLISHER_NAMES[(pk - 1) % len(PUBLISHER_NAMES)]
+    suffix = PUBLISHER_SUFFIXES[
+        (pk - 1) // len(PUBLISHER_NAMES) % len(PUBLISHER_SUFFIXES)
+    ]
+    number = (pk - 1) // (len(PUBLISHER_NAMES) * len(PUBLISHER_SUFFIXES))
+    return f"{name} {suffix}" + (f" {number + 1}" if number else "")
+
+
+def get_blocks(count, block_size=DATASET_BLOCK_SIZE):
+    """
+    Splits the ids from 1 to `count` into `(start, stop)` ranges.
+    """
+    return [
+        (start, min(start + block_size, count + 1))
+        for start in range(1, count + 1, block_size)
+    ]
+
+
+def get_tasks(spec):
+    """
+    Returns the `(kind, start, stop)` blocks to generate, in two stages:
+    the ones the books depend on, then the books.
+    """
+    return [
+        [("publishers", start, stop) for start, stop in get_blocks(spec.publishers)]
+        + [("authors", start, stop) for start, stop in get_blocks(spec.authors)]
+        + [("visitors", start, stop) for start, stop in get_blocks(spec.visitors)],
+        [("books", start, stop) for start, stop in get_blocks(spec.books)],
+    ]
+
+
+def generate_block(spec, kind, start, stop):
+    """
+    Generates and writes the `kind` rows with ids from `start` to `stop`,
+    in a transaction. Returns the number of rows written, per model.
+    """
+    rng = random.Random(f"{spec.seed}:{kind}:{start}")  # noqa: S311
+    generator = {
+        "publishers": _generate_publishers,
+        "authors": _generate_authors,
+        "visitors": _generate_visitors,
+        "books": _generate_books,
+    }[kind]
+    with transaction.atomic():
+        return generator(spec, rng, start, stop)
+
+
+def _generate_publishers(spec, rng, start, stop):
+    rows = [
+        (pk, get_publisher_name(pk), f"{rng.randint(1, 200)} Market Street")
+        for pk in range(start, stop)
+    ]
+    return {Publisher: copy_rows(Publisher, ["id", "name", "address"], rows)}
+
+
+def _generate_authors(spec, rng, start, stop):
+    rows = [
+        (
+            pk,
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            rng.randint(1800, 2000),
+            "",
+        )
+        for pk in range(start, stop)
+    ]
+    columns = ["id", "full_name", "birth_year", "description"]
+    return {Author: copy_rows(Author, columns, rows)}
+
+
+def _generate_visitors(spec, rng, start, stop):
+    rows = [
+        (
+            pk,
+            get_identifier(pk),
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            f"visitor{pk}@example.com",
+            f"+48{pk:09d}",
+            rng.random() > 0.05,  # noqa: PLR2004
+        )
+        for pk in range(start, stop)
+    ]
+    columns = ["id", "identifier", "full_name", "email", "phone_number", "is_active"]
+    return {Visitor: copy_rows(Visitor, columns, rows)}
+
+
+def _generate_loans(spec, rng, copy_id):
+    """
+    Returns the loan history of a copy, going back in time from `spec.until`,
+    and whether its most recent loan is still open.
+    """
+    history = []
+    end = spec.until - timedelta(seconds=rng.randrange(30 * DAY))
+    is_loaned = spec.loans_per_copy > 0 and rng.random() < spec.active_loan_ratio
+    for index in range(spec.loans_per_copy):
+        if index == 0 and is_loaned:
+            return_date = None
+            loan_date = end - timedelta(seconds=rng.randrange(21 * DAY))
+        else:
+            return_date = end
+            loan_date = end - timedelta(seconds=rng.randrange(HOUR, 28 * DAY))
+        history.append((loan_date, return_date))
+        end = loan_date - timedelta(seconds=rng.randrange(30 * DAY))
+
+    # Oldest first, so that loan ids follow loan dates
+    first_id = (copy_id - 1) * spec.loans_per_copy + 1
+    loans = [
+        (
+            first_id + index,
+            rng.randint(1, spec.visitors),
+            copy_id,
+            loan_date,
+            loan_date + DEFAULT_LOAN_PERIOD,
+            return_date,
+        )
+        for index, (loan_date, return_date) in enumerate(reversed(history))
+    ]
+    return loans, is_loaned
+
+
+def _generate_books(spec, rng, start, stop):
+    books = []
+    editions = []
+    copies = []
+    loans = []
+    availability: defaultdict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+    conditions = BookCondition.values
+    for book_id in range(start, stop):
+        book_available = 0
+        first_edition_id = (book_id - 1) * spec.editions_per_book + 1
+        for edition_id in range(
+            first_edition_id,
+            first_edition_id + spec.editions_per_book,
+        ):
+            edition_available = 0
+            first_copy_id = (edition_id - 1) * spec.copies_per_edition + 1
+            for copy_id in range(
+                first_copy_id, first_copy_id + spec.copies_per_edition
+            ):
+                copy_loans, is_loaned = _generate_loans(spec, rng, copy_id)
+                loans.extend(copy_loans)
+                edition_available += not is_loaned
+                condition = rng.choice(conditions)
+                copies.append(
+                    (
+                        copy_id,
+                        get_identifier(copy_id),
+                        edition_id,
+                        condition,
+                        not is_loaned,
+                    ),
+                )
+                counts = availability[book_id, edition_id, condition]
+                counts[0] += 1
+                counts[1] += not is_loaned
+            book_available += edition_available
+            editions.append(
+                (
+                    edition_id,
+                    book_id,
+                    rng.randint(1, spec.publishers),
+                    date.fromordinal(
+                        rng.randint(FIRST_PUBLICATION_DAY, spec.until.toordinal()),
+                    ),
+                    f"979{edition_id:010d}",
+                    spec.copies_per_edition,
+                    edition_available,
+                ),
+            )
+        title_words = rng.sample(TITLE_WORDS, rng.randint(1, 4))
+        books.append(
+            (
+                book_id,
+                " ".join(title_words).capitalize(),
+                rng.randint(1, spec.authors),
+                spec.editions_per_book * spec.copies_per_edition,
+                book_available,
+            ),
+        )
+
+    counters = ["copies_count_total", "copies_count_available"]
+    written = {
+        Book: copy_rows(Book, ["id", "title", "author_id", *counters], books),
+        BookEdition: copy_rows(
+            BookEdition,
+            ["id", "book_id", "publisher_ref", "publication_date", "isbn", *counters],
+            editions,
+        ),
+        BookCopy: copy_rows(
+            BookCopy,
+            ["id", "identifier", "book_edition_id", "condition", "is_available"],
+            copies,
+        ),
+        # NOTE: Ids are left to the sequence, as nothing refers to them
+        CopyAvailability: copy_rows(
+            CopyAvailability,
+            ["book_id", "book_edition_id", "condition", *counters],
+            ((*key, *counts) for key, counts in availability.items()),
+        ),
+        BookLoan: copy_rows(
+            BookLoan,
+            [
+                "id",
+                "visitor_id",
+                "book_copy_id",
+                "loan_date",
+                "due_date",
+                "return_date",
+            ],
+            loans,
+        ),
+    }
+    refresh_search_vectors(Book.objects.filter(pk__gte=start, pk__lt=stop))
+    refresh_search_vectors(
+        BookEdition.objects.filter(book_id__gte=start, book_id__lt=stop)
+    )
+    if copies:
+        refresh_search_vectors(
+            BookCopy.objects.filter(pk__gte=copies[0][0], pk__lte=copies[-1][0]),
+        )
+    return written
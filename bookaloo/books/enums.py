@@ -7,3 +7,25 @@ class BookCondition(TextChoices):
     GOOD = "Good", _("Good")
     ACCEPTABLE = "Acceptable", _("Acceptable")
     POOR = "Poor", _("Poor")
+
+
+class BatchMode(TextChoices):
+    ATOMIC = "atomic", _("All or nothing")
+    BEST_EFFORT = "best_effort", _("Best effort")
+
+
+class BatchItemStatus(TextChoices):
+    LOANED = "loaned", _("Loaned")
+    RETURNED = "returned", _("Returned")
+    NOT_FOUND = "not_found", _("Not found")
+    NOT_AVAILABLE = "not_available", _("Not available")
+    NOT_LOANED = "not_loaned", _("Not loaned")
+    DUPLICATE = "duplicate", _("Duplicate")
+    SKIPPED = "skipped", _("Skipped")
+
+
+class ReservationStatus(TextChoices):
+    WAITING = "waiting", _("Waiting")
+    READY = "ready", _("Ready for pickup")
+    FULFILLED = "fulfilled", _("Fulfilled")
+    CANCELLED = "cancelled", _("Cancelled")
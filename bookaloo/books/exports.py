@@ -0,0 +1,159 @@
+"""
+Streaming export of the loan history.
+
+Loans are read with a server-side cursor in `EXPORT_CHUNK_SIZE` batches of
+plain tuples (no model instances, no serializers) and encoded row by row,
+so the memory used doesn't depend on the number of exported loans.
+
+Server-side cursors can't be used behind a transaction-level pooler (see
+`DISABLE_SERVER_SIDE_CURSORS`), where the batches are fetched with keyset
+pagination on the id instead, each in its own query.
+
+Under ASGI, Django consumes sync iterators whole before streaming them, so
+the encoded chunks are handed over with `aiter_chunks` instead.
+"""
+
+import csv
+import datetime
+from functools import partial
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+from bookaloo.books.models import BookLoan
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Column name and lookup, in order
+LOAN_EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("visitor_identifier", "visitor__identifier"),
+    ("book_copy_identifier", "book_copy__identifier"),
+    ("isbn", "book_copy__book_edition__isbn"),
+    ("book_id", "book_copy__book_edition__book_id"),
+    ("loan_date", "loan_date"),
+    ("due_date", "due_date"),
+    ("return_date", "return_date"),
+]
+
+
+def get_loan_export_queryset(since_id=None):
+    """
+    Returns the exported rows, as tuples ordered by id,
+    optionally only the ones created after the loan `since_id`.
+    """
+    queryset = BookLoan.objects.order_by("pk")
+    if since_id is not None:
+        queryset = queryset.filter(pk__gt=since_id)
+    return queryset.values_list(*(lookup for _name, lookup in LOAN_EXPORT_COLUMNS))
+
+
+def iter_loan_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Iterates over the rows of `get_loan_export_queryset`.
+    """
+    if connections[queryset.db].settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+        return iter_loan_row_batches(queryset, chunk_size)
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def iter_loan_row_batches(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Iterates over the rows of `get_loan_export_queryset`,
+    fetching them `chunk_size` at a time, after the last id fetched.
+    """
+    batch = list(queryset[:chunk_size])
+    while batch:
+        yield from batch
+        if len(batch) < chunk_size:
+            return
+        last_id = batch[-1][0]
+        batch = list(queryset.filter(pk__gt=last_id)[:chunk_size])
+
+
+def format_datetime(value):
+    # Same format as the API responses
+    representation = value.isoformat()
+    if representation.endswith("+00:00"):
+        representation = representation[:-6] + "Z"
+    return representation
+
+
+def iter_ndjson(rows, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Encodes rows as newline-delimited JSON objects,
+    yielding the lines in chunks of `chunk_size`.
+    """
+    names = [name for name, _lookup in LOAN_EXPORT_COLUMNS]
+    lines = []
+    for row in rows:
+        lines.append(
+            orjson.dumps(
+                dict(zip(names, row, strict=True)),
+                option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE,
+            ),
+        )
+        if len(lines) >= chunk_size:
+            yield b"".join(lines)
+            lines = []
+    if lines:
+        yield b"".join(lines)
+
+
+class _Buffer:
+    """
+    A file-like object returning what is written to it,
+    to pass `csv.writer` output on.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Encodes rows as CSV with a header line,
+    yielding the lines in chunks of `chunk_size`.
+    """
+    writer = csv.writer(_Buffer())
+    lines = [writer.writerow([name for name, _lookup in LOAN_EXPORT_COLUMNS])]
+    for row in rows:
+        lines.append(
+            writer.writerow(
+                [
+                    format_datetime(value)
+                    if isinstance(value, datetime.datetime)
+                    else value
+                    for value in row
+                ],
+            ),
+        )
+        if len(lines) >= chunk_size:
+            yield "".join(lines).encode()
+            lines = []
+    if lines:
+        yield "".join(lines).encode()
+
+
+EXPORT_FORMATS = {
+    "ndjson": iter_ndjson,
+    "csv": iter_csv,
+}
+
+
+async def aiter_chunks(chunks):
+    """
+    Iterates asynchronously over the sync iterator `chunks`, one chunk at
+    a time, with the queries run in the request's thread.
+    """
+    chunks = iter(chunks)
+    done = object()
+    try:
+        while (chunk := await sync_to_async(partial(next, chunks, done))()) is not done:
+            yield chunk
+    finally:
+        # NOTE: Releases the server-side cursor if the client went away
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            await sync_to_async(close)()
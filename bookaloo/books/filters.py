@@ -0,0 +1,94 @@
+from django.contrib.postgres.search import SearchRank
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.filters import SearchFilter
+
+from bookaloo.books.search import build_search_query
+from bookaloo.books.serializers.fieldsets import EXCLUDE_QUERY_PARAM
+from bookaloo.books.serializers.fieldsets import FIELDS_QUERY_PARAM
+from bookaloo.books.serializers.fieldsets import is_field_requested
+
+
+class SearchVectorFilter(SearchFilter):
+    """
+    Drop-in replacement for `SearchFilter`, backed by PostgreSQL full-text search.
+
+    For models with a `search_vector` (see `bookaloo.books.search`), the search
+    terms are matched against the GIN-indexed vector and the results are
+    ranked by relevance. The vector covers the same columns as the view's
+    `search_fields`, which are kept as they are and still used for models
+    without a vector (served by trigram indexes) and for other databases.
+    """
+
+    search_vector_field = "search_vector"
+
+    def uses_search_vector(self, queryset):
+        try:
+            queryset.model._meta.get_field(self.search_vector_field)  # noqa: SLF001
+        except FieldDoesNotExist:
+            return False
+        return connections[queryset.db].vendor == "postgresql"
+
+    def filter_queryset(self, request, queryset, view):
+        if not self.uses_search_vector(queryset):
+            return super().filter_queryset(request, queryset, view)
+        search_query = build_search_query(self.get_search_terms(request))
+        if search_query is None:
+            return queryset
+        return (
+            queryset.filter(**{self.search_vector_field: search_query})
+            .annotate(
+                search_rank=SearchRank(F(self.search_vector_field), search_query),
+            )
+            .order_by("-search_rank", "pk")
+        )
+
+
+class SparseFieldsetFilter(BaseFilterBackend):
+    """
+    Drops the joins of response fields left out with `?fields=` / `?exclude=`
+    (see `bookaloo.books.serializers.fieldsets.SparseFieldsetMixin`).
+
+    The view's `sparse_fieldset_select_related` maps response fields to the
+    `select_related` lookups they need; lookups of fields that aren't
+    rendered are removed from the queryset.
+    """
+
+    fields_description = _(
+        "Comma-separated names of the fields to include in the response.",
+    )
+    exclude_description = _(
+        "Comma-separated names of the fields to leave out of the response.",
+    )
+
+    def filter_queryset(self, request, queryset, view):
+        select_related = getattr(view, "sparse_fieldset_select_related", {})
+        if not select_related:
+            return queryset
+        lookups = [
+            lookup
+            for field_name, field_lookups in select_related.items()
+            if is_field_requested(request, field_name)
+            for lookup in field_lookups
+        ]
+        queryset = queryset.select_related(None)
+        # NOTE: `select_related()` without lookups would follow all relations
+        return queryset.select_related(*lookups) if lookups else queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": name,
+                "required": False,
+                "in": "query",
+                "description": str(description),
+                "schema": {"type": "string"},
+            }
+            for name, description in [
+                (FIELDS_QUERY_PARAM, self.fields_description),
+                (EXCLUDE_QUERY_PARAM, self.exclude_description),
+            ]
+        ]
@@ -0,0 +1,296 @@
+"""
+Bulk import of catalog records (authors, books, editions and copies).
+
+Each record describes a single copy of a book edition, "MARC-lite" style:
+
+    author, author_birth_year, title, publisher, publication_date, isbn,
+    copy_identifier, copy_condition
+
+`author_birth_year`, `copy_identifier` and `copy_condition` are optional;
+a record without a `copy_identifier` only creates the edition.
+
+Records are read in a streaming way and imported in batches, each in its own
+transaction. Authors, publishers and books are deduplicated with in-memory
+maps (by name and birth year, by name, and by author and title); editions
+and copies, by their unique ISBN and identifier. Existing rows are reused,
+so importing the same file twice doesn't create duplicates.
+"""
+
+import csv
+import datetime
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import orjson
+from django.db import transaction
+
+from bookaloo.books.bulk import bulk_insert
+from bookaloo.books.cache import AUTHORS
+from bookaloo.books.cache import BOOKS
+from bookaloo.books.cache import COPIES
+from bookaloo.books.cache import EDITIONS
+from bookaloo.books.cache import PUBLISHERS
+from bookaloo.books.cache import bump_cache_generations
+from bookaloo.books.counters import rebuild_copy_counters
+from bookaloo.books.enums import BookCondition
+from bookaloo.books.models import Author
+from bookaloo.books.models import Book
+from bookaloo.books.models import BookCopy
+from bookaloo.books.models import BookEdition
+from bookaloo.books.models import Publisher
+from bookaloo.books.search import refresh_search_vectors
+
+RECORD_FIELDS = [
+    "author",
+    "author_birth_year",
+    "title",
+    "publisher",
+    "publication_date",
+    "isbn",
+    "copy_identifier",
+    "copy_condition",
+]
+REQUIRED_RECORD_FIELDS = ["author", "title", "publisher", "publication_date", "isbn"]
+IMPORT_FORMATS = ["csv", "jsonl"]
+
+
+class InvalidRecord(ValueError):  # noqa: N818
+    pass
+
+
+def iter_records(path, import_format):
+    """
+    Yields the records of a CSV (with a header line) or JSON Lines file,
+    as dicts; records that can't be decoded are yielded as `None`.
+    """
+    with Path(path).open(newline="", encoding="utf-8") as file:
+        if import_format == "csv":
+            yield from csv.DictReader(file)
+            return
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                yield None
+
+
+def clean_record(record):
+    """
+    Validates and normalizes a raw record, raising `InvalidRecord`.
+    """
+    if not isinstance(record, dict):
+        msg = "Not a JSON object"
+        raise InvalidRecord(msg)
+    cleaned: dict[str, Any] = {
+        name: "" if record.get(name) is None else str(record[name]).strip()
+        for name in RECORD_FIELDS
+    }
+    missing = [name for name in REQUIRED_RECORD_FIELDS if not cleaned[name]]
+    if missing:
+        msg = f"Missing {', '.join(missing)}"
+        raise InvalidRecord(msg)
+    try:
+        cleaned["publication_date"] = datetime.date.fromisoformat(
+            cleaned["publication_date"],
+        )
+        birth_year = cleaned["author_birth_year"]
+        cleaned["author_birth_year"] = int(birth_year) if birth_year else None
+    except ValueError as e:
+        raise InvalidRecord(str(e)) from e
+    condition = cleaned["copy_condition"]
+    if condition and condition not in BookCondition.values:
+        msg = f"Unknown condition {condition!r}"
+        raise InvalidRecord(msg)
+    cleaned["copy_condition"] = condition or BookCondition.VERY_GOOD
+    for name, field in [
+        ("isbn", BookEdition._meta.get_field("isbn")),  # noqa: SLF001
+        ("copy_identifier", BookCopy._meta.get_field("identifier")),  # noqa: SLF001
+    ]:
+        max_length = field.max_length
+        if max_length is not None and len(cleaned[name]) > max_length:
+            msg = f"{name} longer than {max_length} characters"
+            raise InvalidRecord(msg)
+    return cleaned
+
+
+class CatalogImporter:
+    """
+    Imports batches of cleaned records; see the module docstring.
+    """
+
+    def __init__(self):
+        self.stats: Counter[str] = Counter()
+        self.authors = {
+            (full_name, birth_year): pk
+            for pk, full_name, birth_year in Author.objects.values_list(
+                "pk",
+                "full_name",
+                "birth_year",
+            ).iterator()
+        }
+        # NOTE: Of publishers sharing a name, the oldest one is used,
+        #       as in `bookaloo.books.publishers`
+        self.publishers = dict(
+            Publisher.objects.order_by("-pk").values_list("name", "pk").iterator(),
+        )
+        self.books = {
+            (author_id, title): pk
+            for pk, author_id, title in Book.objects.values_list(
+                "pk",
+                "author_id",
+                "title",
+            ).iterator()
+        }
+
+    @transaction.atomic
+    def import_batch(self, records):
+        for record in records:
+            record["author_key"] = (record["author"], record["author_birth_year"])
+        new_authors = self.create_missing(
+            self.authors,
+            {record["author_key"] for record in records},
+            lambda key: Author(full_name=key[0], birth_year=key[1]),
+        )
+        for record in records:
+            record["book_key"] = (self.authors[record["author_key"]], record["title"])
+        self.create_missing(
+            self.publishers,
+            {record["publisher"] for record in records},
+            lambda name: Publisher(name=name),
+        )
+        new_books = self.create_missing(
+            self.books,
+            {record["book_key"] for record in records},
+            lambda key: Book(author_id=key[0], title=key[1]),
+        )
+        editions, new_editions = self.import_editions(records)
+        new_copies = self.import_copies(records, editions)
+
+        self.stats["authors"] += len(new_authors)
+        self.stats["books"] += len(new_books)
+        self.stats["editions"] += len(new_editions)
+        self.stats["copies"] += len(new_copies)
+        self.stats["records"] += len(records)
+
+        # Bulk inserts skip `save()` and the signal receivers
+        rebuild_copy_counters(
+            {editions[copy.book_edition_id] for copy in new_copies},
+        )
+        refresh_search_vectors(Book.objects.filter(pk__in=new_books))
+        refresh_search_vectors(BookEdition.objects.filter(pk__in=new_editions))
+        refresh_search_vectors(
+            BookCopy.objects.filter(pk__in=[copy.pk for copy in new_copies]),
+        )
+        bump_cache_generations(AUTHORS, PUBLISHERS, BOOKS, EDITIONS, COPIES)
+
+    def create_missing(self, known, keys, build):
+        """
+        Inserts the objects of `keys` missing from the `known` map of ids,
+        adding them to it. Returns the ids of the inserted objects.
+        """
+        missing = [key for key in keys if key not in known]
+        objs = bulk_insert([build(key) for key in missing])
+        known.update(zip(missing, (obj.pk for obj in objs), strict=True))
+        return [obj.pk for obj in objs]
+
+    def import_editions(self, records):
+        """
+        Returns the map of edition ids to their book ids for all the records'
+        ISBNs, and the ids of the newly inserted editions.
+        """
+        isbns: dict[str, dict[str, Any]] = {}
+        for record in records:
+            isbns.setdefault(record["isbn"], record)
+        existing = {}
+        editions = {}
+        for isbn, pk, book_id in BookEdition.objects.filter(
+            isbn__in=isbns,
+        ).values_list("isbn", "pk", "book_id"):
+            existing[isbn] = pk
+            editions[pk] = book_id
+        new_editions = bulk_insert(
+            [
+                BookEdition(
+                    book_id=self.books[record["book_key"]],
+                    publisher_id=self.publishers[record["publisher"]],
+                    publication_date=record["publication_date"],
+                    isbn=isbn,
+                )
+                for isbn, record in isbns.items()
+                if isbn not in existing
+            ],
+        )
+        for edition in new_editions:
+            existing[edition.isbn] = edition.pk
+            editions[edition.pk] = edition.book_id
+        for record in records:
+            record["book_edition_id"] = existing[record["isbn"]]
+        return editions, [edition.pk for edition in new_editions]
+
+    def import_copies(self, records, editions):
+        identifiers: dict[str, dict[str, Any]] = {}
+        for record in records:
+            if record["copy_identifier"]:
+                identifiers.setdefault(record["copy_identifier"], record)
+        existing = set(
+            BookCopy.objects.filter(identifier__in=identifiers).values_list(
+                "identifier",
+                flat=True,
+            ),
+        )
+        self.stats["skipped_copies"] += len(existing)
+        return bulk_insert(
+            [
+                BookCopy(
+                    identifier=identifier,
+                    book_edition_id=record["book_edition_id"],
+                    condition=record["copy_condition"],
+                )
+                for identifier, record in identifiers.items()
+                if identifier not in existing
+            ],
+        )
+
+
+class Checkpoint:
+    """
+    Progress of an import, stored as JSON next to the imported file,
+    so that an interrupted import can be resumed.
+    """
+
+    def __init__(self, path, source):
+        self.path = Path(path)
+        self.source = str(Path(source).resolve())
+        self.records = 0
+        self.stats = {}
+
+    def load(self):
+        """
+        Loads the progress of a previous import of the same source, if any.
+        """
+        if not self.path.exists():
+            return False
+        data = json.loads(self.path.read_text())
+        if data.get("source") != self.source:
+            return False
+        self.records = data["records"]
+        self.stats = data["stats"]
+        return True
+
+    def save(self, records, stats):
+        self.records = records
+        self.stats = dict(stats)
+        temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+        temporary_path.write_text(
+            json.dumps(
+                {"source": self.source, "records": records, "stats": self.stats},
+            ),
+        )
+        temporary_path.replace(self.path)
+
+    def delete(self):
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.utils.translation import gettext_lazy as _
+
+from bookaloo.books.publishers import BACKFILL_BATCH_SIZE
+from bookaloo.books.publishers import backfill_edition_publishers
+
+PUBLISHER_FK_MIGRATION = ("books", "0010_edition_publisher_fk")
+PUBLISHER_NAME_REMOVAL_MIGRATION = ("books", "0012_remove_bookedition_publisher_name")
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill the publishers of the book editions from their former "
+        "free-text column, ahead of the migration dropping it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BACKFILL_BATCH_SIZE,
+            help=_("Number of editions updated per transaction."),
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        loader = MigrationLoader(connection)
+        if PUBLISHER_NAME_REMOVAL_MIGRATION in loader.applied_migrations:
+            self.stdout.write(self.style.SUCCESS("Publishers are already backfilled."))
+            return
+        if PUBLISHER_FK_MIGRATION not in loader.applied_migrations:
+            msg = f"Apply the {PUBLISHER_FK_MIGRATION[1]} migration first."
+            raise CommandError(msg)
+        # NOTE: The current models have no `publisher_name` anymore
+        apps = loader.project_state(PUBLISHER_FK_MIGRATION).apps
+        updated = backfill_edition_publishers(
+            apps,
+            batch_size=options["batch_size"],
+            progress=self.report_progress,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Backfilled the publishers of {updated} editions."),
+        )
+
+    def report_progress(self, updated):
+        if self.verbosity > 1:
+            self.stdout.write(f"Backfilled the publishers of {updated} editions")
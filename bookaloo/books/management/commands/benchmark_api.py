@@ -0,0 +1,171 @@
+import json
+from contextlib import contextmanager
+from dataclasses import asdict
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.color import no_style
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.test.utils import setup_databases
+from django.test.utils import teardown_databases
+from django.utils.translation import gettext_lazy as _
+
+from bookaloo.books.benchmarks import BENCHMARK_SIZES
+from bookaloo.books.benchmarks import DEFAULT_THRESHOLDS
+from bookaloo.books.benchmarks import BenchmarkError
+from bookaloo.books.benchmarks import find_regressions
+from bookaloo.books.benchmarks import run_benchmarks
+from bookaloo.books.datasets import DATASET_MODELS
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the query counts, latencies and response sizes of the API "
+        "routes on generated datasets, and compare them with a baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            choices=list(BENCHMARK_SIZES),
+            default=["small", "medium"],
+            help=_("Dataset sizes to benchmark."),
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help=_("Number of timed requests per route."),
+        )
+        parser.add_argument(
+            "--baseline",
+            default=str(settings.BASE_DIR / "benchmarks" / "api.json"),
+            help=_("Path of the JSON baseline."),
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help=_("Save the results as the new baseline instead of comparing."),
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help=_("Keep the benchmark database between runs."),
+        )
+        for name, help_text in [
+            ("queries", _("Allowed number of additional queries.")),
+            ("latency", _("Allowed relative increase of the p95 latency.")),
+            ("latency-floor-ms", _("Ignored p95 latency increases, in ms.")),
+            ("bytes", _("Allowed relative increase of the response sizes.")),
+        ]:
+            key = name.replace("-", "_")
+            parser.add_argument(
+                f"--{name}-threshold",
+                dest=f"{key}_threshold",
+                type=type(DEFAULT_THRESHOLDS[key]),
+                default=DEFAULT_THRESHOLDS[key],
+                help=help_text,
+            )
+
+    def handle(self, *args, **options):
+        with self.benchmark_database(keepdb=options["keepdb"]):
+            results = self.benchmark(options["sizes"], options["iterations"])
+
+        baseline_path = Path(options["baseline"])
+        if options["save_baseline"]:
+            baseline = (
+                json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+            )
+            baseline.update(results)
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(baseline, indent=2) + "\n")
+            self.stdout.write(
+                self.style.SUCCESS(f"Saved the baseline to {baseline_path}."),
+            )
+            return
+        if not baseline_path.exists():
+            self.stdout.write(
+                self.style.WARNING(
+                    f"No baseline at {baseline_path}; run with --save-baseline.",
+                ),
+            )
+            return
+        regressions = find_regressions(
+            json.loads(baseline_path.read_text()),
+            results,
+            {key: options[f"{key}_threshold"] for key in DEFAULT_THRESHOLDS},
+        )
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f"  {regression}"))
+            msg = f"{len(regressions)} regressions compared with {baseline_path}."
+            raise CommandError(msg)
+        self.stdout.write(self.style.SUCCESS("No regressions."))
+
+    @contextmanager
+    def benchmark_database(self, *, keepdb):
+        # NOTE: Datasets are generated into a separate database,
+        #       created like the test database
+        test_settings = connection.settings_dict.setdefault("TEST", {})
+        test_settings["NAME"] = f"benchmark_{connection.settings_dict['NAME']}"
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=keepdb)
+        try:
+            yield
+        except BenchmarkError as e:
+            raise CommandError(str(e)) from e
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=keepdb)
+
+    def generate(self, size):
+        self.stdout.write(f"Generating the {size} dataset...")
+        self.flush()
+        call_command(
+            "generate_dataset",
+            workers=1,
+            stdout=StringIO(),
+            **asdict(BENCHMARK_SIZES[size]),
+        )
+
+    def benchmark(self, sizes, iterations):
+        results = {}
+        for size in sizes:
+            self.generate(size)
+            # NOTE: Without the debug tools, and with the response cache
+            #       off, so that every request does the actual work
+            with override_settings(
+                DEBUG=False,
+                ALLOWED_HOSTS=["testserver"],
+                API_CACHE_ENABLED=False,
+                API_CONDITIONAL_GET_ENABLED=False,
+            ):
+                results[size] = run_benchmarks(Client(), iterations)
+            self.write_results(size, results[size])
+        return results
+
+    def flush(self):
+        tables = [model._meta.db_table for model in DATASET_MODELS]  # noqa: SLF001
+        connection.ops.execute_sql_flush(
+            connection.ops.sql_flush(
+                no_style(),
+                tables,
+                reset_sequences=True,
+                allow_cascade=True,
+            ),
+        )
+
+    def write_results(self, size, results):
+        self.stdout.write(
+            f"  {'route':<22}{'queries':>8}{'p50 ms':>10}{'p95 ms':>10}{'bytes':>10}",
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"  {name:<22}{result['queries']:>8}{result['p50_ms']:>10.2f}"
+                f"{result['p95_ms']:>10.2f}{result['bytes']:>10}",
+            )
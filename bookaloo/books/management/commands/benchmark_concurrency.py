@@ -0,0 +1,85 @@
+from django.test.utils import override_settings
+from django.utils.translation import gettext_lazy as _
+
+from bookaloo.books.benchmarks import BENCHMARK_SIZES
+from bookaloo.books.benchmarks import run_concurrency_benchmark
+from bookaloo.books.management.commands.benchmark_api import (
+    Command as BenchmarkAPICommand,
+)
+
+INTERFACES = ("wsgi", "asgi")
+
+
+class Command(BenchmarkAPICommand):
+    help = (
+        "Compare the throughput and latencies of the WSGI (sync views) and ASGI "
+        "(async views) deployments under concurrent read traffic, on a "
+        "generated dataset."
+    )
+    # NOTE: The URLs must not be loaded before the views are picked
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size",
+            choices=list(BENCHMARK_SIZES),
+            default="small",
+            help=_("Dataset size."),
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=100,
+            help=_("Number of concurrent clients."),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help=_("Number of sync workers (threads) serving the WSGI requests."),
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=2000,
+            help=_("Number of requests per interface."),
+        )
+        parser.add_argument(
+            "--stall-ms",
+            type=float,
+            default=0,
+            help=_("Time each client takes to read a response, in ms."),
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help=_("Keep the benchmark database between runs."),
+        )
+
+    def handle(self, *args, **options):
+        with self.benchmark_database(keepdb=options["keepdb"]):
+            self.generate(options["size"])
+            self.stdout.write(
+                f"  {'interface':<12}{'req/s':>10}{'p50 ms':>10}"
+                f"{'p95 ms':>10}{'errors':>8}",
+            )
+            for interface in INTERFACES:
+                # NOTE: See `benchmark_api`
+                with override_settings(
+                    DEBUG=False,
+                    ALLOWED_HOSTS=["testserver"],
+                    API_CACHE_ENABLED=False,
+                    API_CONDITIONAL_GET_ENABLED=False,
+                ):
+                    result = run_concurrency_benchmark(
+                        interface,
+                        concurrency=options["concurrency"],
+                        workers=options["workers"],
+                        requests=options["requests"],
+                        stall_ms=options["stall_ms"],
+                    )
+                self.stdout.write(
+                    f"  {interface:<12}{result['requests_per_second']:>10.1f}"
+                    f"{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+                    f"{result['errors']:>8}",
+                )
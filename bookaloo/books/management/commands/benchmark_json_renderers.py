@@ -0,0 +1,82 @@
+import math
+import timeit
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.utils.translation import gettext_lazy as _
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from bookaloo.books.serializers import BookLoanSerializer
+from bookaloo.books.views import BookLoanView
+from bookaloo.parsers import ORJSONParser
+from bookaloo.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the stdlib and orjson based JSON renderers "
+        "on a page of the loans listing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1000,
+            help=_(
+                "Number of loans per rendered page; "
+                "existing loans are repeated if there are fewer."
+            ),
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help=_("Number of timed renders per renderer."),
+        )
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+        loans = list(BookLoanView().get_queryset().order_by("-id")[:rows])
+        if not loans:
+            msg = "There are no loans to render; generate some data first."
+            raise CommandError(msg)
+        data = BookLoanSerializer(loans, many=True).data
+        data = (list(data) * math.ceil(rows / len(data)))[:rows]
+        page = {"count": rows, "next": None, "previous": None, "results": data}
+
+        stdlib_output = JSONRenderer().render(page)
+        orjson_output = ORJSONRenderer().render(page)
+        if stdlib_output != orjson_output:
+            msg = "The renderers' outputs differ."
+            raise CommandError(msg)
+
+        results = {}
+        for name, func in [
+            ("JSONRenderer", lambda: JSONRenderer().render(page)),
+            ("ORJSONRenderer", lambda: ORJSONRenderer().render(page)),
+            ("JSONParser", lambda: self.parse(JSONParser, stdlib_output)),
+            ("ORJSONParser", lambda: self.parse(ORJSONParser, stdlib_output)),
+        ]:
+            results[name] = min(timeit.repeat(func, number=1, repeat=repeat))
+
+        self.stdout.write(
+            f"Page of {rows} loans ({len(stdlib_output) / 1024:.0f} KiB), "
+            f"best of {repeat}:",
+        )
+        for name, seconds in results.items():
+            self.stdout.write(f"  {name:<16}{seconds * 1000:8.2f} ms")
+        render_speedup = results["JSONRenderer"] / results["ORJSONRenderer"]
+        parse_speedup = results["JSONParser"] / results["ORJSONParser"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"With orjson, rendering is {render_speedup:.1f}x "
+                f"and parsing {parse_speedup:.1f}x faster.",
+            ),
+        )
+
+    def parse(self, parser_class, content):
+        return parser_class().parse(BytesIO(content))
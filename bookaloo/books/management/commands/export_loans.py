@@ -0,0 +1,64 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.utils.translation import gettext_lazy as _
+
+from bookaloo.books.exports import EXPORT_CHUNK_SIZE
+from bookaloo.books.exports import EXPORT_FORMATS
+from bookaloo.books.exports import get_loan_export_queryset
+from bookaloo.books.exports import iter_loan_rows
+
+
+class Command(BaseCommand):
+    help = "Export the loan history as newline-delimited JSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=sorted(EXPORT_FORMATS),
+            default="ndjson",
+            help=_("Output format."),
+        )
+        parser.add_argument(
+            "--output",
+            default="-",
+            help=_("Output file path; the standard output by default."),
+        )
+        parser.add_argument(
+            "--since-id",
+            type=int,
+            default=None,
+            help=_("Only export the loans with a greater id."),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help=_("Number of rows fetched from the database at once."),
+        )
+
+    def handle(self, *args, **options):
+        queryset = get_loan_export_queryset(options["since_id"])
+        rows = self.count_rows(iter_loan_rows(queryset, options["chunk_size"]))
+        chunks = EXPORT_FORMATS[options["format"]](rows, options["chunk_size"])
+        started_at = time.monotonic()
+        if options["output"] == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending="")
+        else:
+            with Path(options["output"]).open("wb") as output:
+                output.writelines(chunks)
+        elapsed = time.monotonic() - started_at
+        self.stderr.write(
+            f"Exported {self.rows_count} loans "
+            f"(last id: {self.last_id}) in {elapsed:.1f}s.",
+        )
+
+    def count_rows(self, rows):
+        self.rows_count = 0
+        self.last_id = None
+        for row in rows:
+            self.rows_count += 1
+            self.last_id = row[0]
+            yield row
@@ -0,0 +1,156 @@
+import multiprocessing
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import connections
+from django.utils.translation import gettext_lazy as _
+
+from bookaloo.books.bulk import reset_sequences
+from bookaloo.books.cache import AUTHORS
+from bookaloo.books.cache import BOOKS
+from bookaloo.books.cache import COPIES
+from bookaloo.books.cache import EDITIONS
+from bookaloo.books.cache import PUBLISHERS
+from bookaloo.books.cache import bump_cache_generations
+from bookaloo.books.datasets import DATASET_MODELS
+from bookaloo.books.datasets import DatasetSpec
+from bookaloo.books.datasets import generate_block
+from bookaloo.books.datasets import get_tasks
+
+if TYPE_CHECKING:
+    from django.db.models import Model
+
+
+def until_date(value):
+    return datetime.fromisoformat(value).replace(tzinfo=UTC)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic synthetic dataset of any size into an empty "
+        "database, for load tests and benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        defaults = DatasetSpec()
+        for name, help_text in [
+            ("publishers", _("Number of publishers.")),
+            ("authors", _("Number of authors.")),
+            ("books", _("Number of books.")),
+            ("editions-per-book", _("Number of editions of each book.")),
+            ("copies-per-edition", _("Number of copies of each edition.")),
+            ("visitors", _("Number of visitors.")),
+            ("loans-per-copy", _("Depth of the loan history of each copy.")),
+        ]:
+            parser.add_argument(
+                f"--{name}",
+                type=int,
+                default=getattr(defaults, name.replace("-", "_")),
+                help=help_text,
+            )
+        parser.add_argument(
+            "--active-loan-ratio",
+            type=float,
+            default=defaults.active_loan_ratio,
+            help=_("Share of copies that are currently lent out."),
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=defaults.seed,
+            help=_("Seed of the random generators."),
+        )
+        parser.add_argument(
+            "--until",
+            type=until_date,
+            default=defaults.until,
+            help=_(
+                "Date (UTC) the loan history ends at; today by default. "
+                "Pass it to generate the same dataset on another day."
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help=_("Number of worker processes."),
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        spec = DatasetSpec(
+            seed=options["seed"],
+            publishers=options["publishers"],
+            authors=options["authors"],
+            books=options["books"],
+            editions_per_book=options["editions_per_book"],
+            copies_per_edition=options["copies_per_edition"],
+            visitors=options["visitors"],
+            loans_per_copy=options["loans_per_copy"],
+            active_loan_ratio=options["active_loan_ratio"],
+            until=options["until"],
+        )
+        problems = spec.validate()
+        if problems:
+            raise CommandError(" ".join(problems))
+        # NOTE: Ids are generated from 1, so that the dataset only
+        #       depends on the seed and the sizes
+        for model in DATASET_MODELS:
+            if model._default_manager.exists():  # noqa: SLF001
+                msg = (
+                    f"The {model._meta.db_table} table isn't empty; "  # noqa: SLF001
+                    "the dataset can only be generated into an empty database."
+                )
+                raise CommandError(msg)
+
+        started_at = time.monotonic()
+        written: Counter[type[Model]] = Counter()
+        for tasks in get_tasks(spec):
+            for counts in self.run_tasks(spec, tasks, options["workers"]):
+                written.update(counts)
+                if self.verbosity > 1:
+                    self.stdout.write(
+                        f"{written[DATASET_MODELS[-1]]} loans, "
+                        f"{time.monotonic() - started_at:.1f}s",
+                    )
+
+        reset_sequences(*DATASET_MODELS)
+        with connection.cursor() as cursor:
+            for model in DATASET_MODELS:
+                cursor.execute(
+                    f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}",  # noqa: SLF001
+                )
+        bump_cache_generations(AUTHORS, PUBLISHERS, BOOKS, EDITIONS, COPIES)
+
+        elapsed = time.monotonic() - started_at
+        for model in DATASET_MODELS:
+            self.stdout.write(f"{model.__name__}: {written[model]}")
+        total = sum(written.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {total} rows in {elapsed:.1f}s "
+                f"({total / elapsed:.0f} rows/s).",
+            ),
+        )
+
+    def run_tasks(self, spec, tasks, workers):
+        if workers <= 1:
+            for task in tasks:
+                yield generate_block(spec, *task)
+            return
+        # NOTE: Forked workers must not share the parent's connections
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            futures = [executor.submit(generate_block, spec, *task) for task in tasks]
+            for future in futures:
+                yield future.result()
@@ -0,0 +1,119 @@
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.utils.translation import gettext_lazy as _
+
+from bookaloo.books.imports import IMPORT_FORMATS
+from bookaloo.books.imports import CatalogImporter
+from bookaloo.books.imports import Checkpoint
+from bookaloo.books.imports import InvalidRecord
+from bookaloo.books.imports import clean_record
+from bookaloo.books.imports import iter_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Import authors, books, editions and copies from a CSV or JSON Lines file "
+        "of catalog records."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help=_("Path of the file to import."))
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            default=None,
+            help=_("Input format; inferred from the file extension by default."),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help=_("Number of records imported per transaction."),
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=None,
+            help=_(
+                "Path of the checkpoint file used to resume an interrupted import; "
+                "<path>.checkpoint by default."
+            ),
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help=_("Ignore any checkpoint and import the file from the start."),
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        path = Path(options["path"])
+        if not path.is_file():
+            msg = f"No such file: {path}"
+            raise CommandError(msg)
+        import_format = options["format"] or path.suffix.lstrip(".").lower()
+        if import_format not in IMPORT_FORMATS:
+            msg = "Unknown input format; use --format."
+            raise CommandError(msg)
+
+        checkpoint = Checkpoint(
+            options["checkpoint"] or f"{path}.checkpoint",
+            source=path,
+        )
+        importer = CatalogImporter()
+        if not options["restart"] and checkpoint.load():
+            importer.stats.update(checkpoint.stats)
+            self.stdout.write(f"Resuming after {checkpoint.records} records")
+
+        started_at = time.monotonic()
+        resumed_count = read_count = checkpoint.records
+        records = islice(
+            enumerate(iter_records(path, import_format), start=1),
+            resumed_count,
+            None,
+        )
+        while batch := list(islice(records, options["batch_size"])):
+            importer.import_batch(self.clean_batch(batch, importer.stats))
+            read_count = batch[-1][0]
+            checkpoint.save(read_count, importer.stats)
+            if self.verbosity > 1:
+                self.stdout.write(
+                    f"Imported {read_count} records "
+                    f"({self.get_rate(read_count - resumed_count, started_at)})",
+                )
+        checkpoint.delete()
+
+        stats = importer.stats
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {stats['authors']} authors, {stats['books']} books, "
+                f"{stats['editions']} editions and {stats['copies']} copies "
+                f"from {read_count} records in {time.monotonic() - started_at:.1f}s "
+                f"({self.get_rate(read_count - resumed_count, started_at)}).",
+            ),
+        )
+        if stats["invalid"] or stats["skipped_copies"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Skipped {stats['invalid']} invalid records "
+                    f"and {stats['skipped_copies']} existing copies.",
+                ),
+            )
+
+    def clean_batch(self, batch, stats):
+        cleaned = []
+        for line_number, record in batch:
+            try:
+                cleaned.append(clean_record(record))
+            except InvalidRecord as e:
+                stats["invalid"] += 1
+                if self.verbosity > 1:
+                    self.stderr.write(f"Record {line_number}: {e}")
+        return cleaned
+
+    def get_rate(self, count, started_at):
+        elapsed = time.monotonic() - started_at
+        return f"{count / elapsed if elapsed else 0:.0f} records/s"
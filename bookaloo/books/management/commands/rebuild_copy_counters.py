@@ -0,0 +1,112 @@
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from bookaloo.books.cache import BOOKS
+from bookaloo.books.cache import EDITIONS
+from bookaloo.books.cache import bump_cache_generations
+from bookaloo.books.counters import find_copy_availability_drift
+from bookaloo.books.counters import find_copy_counters_drift
+from bookaloo.books.counters import rebuild_copy_counters
+from bookaloo.books.models import Book
+from bookaloo.books.models import BookEdition
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the denormalized copy counters and availability of books and "
+        "editions, or verify them with --check."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help=_("Only verify the counters; exit with an error on any drift."),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help=_("Number of books rebuilt per transaction."),
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        if options["check"]:
+            self.check_counters(options["batch_size"])
+        else:
+            self.rebuild_counters(options["batch_size"])
+
+    def iter_book_id_batches(self, batch_size):
+        last_id = 0
+        while True:
+            book_ids = list(
+                Book.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size],
+            )
+            if not book_ids:
+                return
+            yield book_ids
+            last_id = book_ids[-1]
+
+    def rebuild_counters(self, batch_size):
+        books_count = 0
+        for book_ids in self.iter_book_id_batches(batch_size):
+            with transaction.atomic():
+                rebuild_copy_counters(book_ids)
+                bump_cache_generations(BOOKS, EDITIONS)
+            books_count += len(book_ids)
+            if self.verbosity > 1:
+                self.stdout.write(f"Rebuilt counters of {books_count} books")
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt copy counters of {books_count} books."),
+        )
+
+    def check_counters(self, batch_size):
+        drift_found = False
+        for model in (Book, BookEdition):
+            drifted = find_copy_counters_drift(model.objects.order_by("pk"))
+            drifted_count = drifted.count()
+            if not drifted_count:
+                continue
+            drift_found = True
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{drifted_count} {model._meta.verbose_name_plural} "  # noqa: SLF001
+                    "have drifted copy counters:",
+                ),
+            )
+            for obj in drifted[:20]:
+                self.stdout.write(
+                    f"  #{obj.pk}: stored "
+                    f"{obj.copies_count_total}/{obj.copies_count_available}, "
+                    f"actual {obj.actual_total}/{obj.actual_available} "
+                    "(total/available)",
+                )
+        drift_found |= self.check_availability(batch_size)
+        if drift_found:
+            msg = "Copy counters are out of sync; run without --check to rebuild."
+            raise CommandError(msg)
+        self.stdout.write(self.style.SUCCESS("Copy counters are in sync."))
+
+    def check_availability(self, batch_size):
+        drifted = {}
+        for book_ids in self.iter_book_id_batches(batch_size):
+            drifted.update(find_copy_availability_drift(book_ids))
+        if not drifted:
+            return False
+        self.stdout.write(
+            self.style.WARNING(
+                f"{len(drifted)} edition conditions have drifted availability:",
+            ),
+        )
+        for (edition_id, condition), (stored, actual) in sorted(drifted.items())[:20]:
+            self.stdout.write(
+                f"  edition #{edition_id}, {condition}: "
+                f"stored {stored[0]}/{stored[1]}, "
+                f"actual {actual[0]}/{actual[1]} (total/available)",
+            )
+        return True
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.8 on 2026-10-18 14:17
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_copy_counters(apps, schema_editor):
+    Book = apps.get_model("books", "Book")
+    BookCopy = apps.get_model("books", "BookCopy")
+    BookEdition = apps.get_model("books", "BookEdition")
+
+    copies = BookCopy.objects.filter(book_edition=OuterRef("pk")).order_by().values("book_edition")
+    BookEdition.objects.update(
+        copies_count_total=Coalesce(Subquery(copies.annotate(count=Count("pk")).values("count")), 0),
+        copies_count_available=Coalesce(
+            Subquery(copies.annotate(count=Count("pk", filter=Q(is_available=True))).values("count")),
+            0,
+        ),
+    )
+    editions = BookEdition.objects.filter(book=OuterRef("pk")).order_by().values("book")
+    Book.objects.update(
+        copies_count_total=Coalesce(
+            Subquery(editions.annotate(total=Sum("copies_count_total")).values("total")), 0
+        ),
+        copies_count_available=Coalesce(
+            Subquery(editions.annotate(total=Sum("copies_count_available")).values("total")), 0
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='copies_count_available',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of copies currently available for borrowing.'),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='copies_count_total',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of physical copies.'),
+        ),
+        migrations.AddField(
+            model_name='bookedition',
+            name='copies_count_available',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of copies currently available for borrowing.'),
+        ),
+        migrations.AddField(
+            model_name='bookedition',
+            name='copies_count_total',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of physical copies.'),
+        ),
+        migrations.RunPython(populate_copy_counters, migrations.RunPython.noop),
+    ]
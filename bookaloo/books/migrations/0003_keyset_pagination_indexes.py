@@ -0,0 +1,33 @@
+# Generated by Django 5.1.8 on 2026-10-18 14:19
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('books', '0002_copy_counters'),
+        ('visitors', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='author',
+            index=models.Index(fields=['full_name', 'id'], name='author_full_name_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='book',
+            index=models.Index(fields=['title', 'id'], name='book_title_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='bookloan',
+            index=models.Index(fields=['loan_date', 'id'], name='bookloan_loan_date_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='publisher',
+            index=models.Index(fields=['name', 'id'], name='publisher_name_id_idx'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.1.8 on 2026-10-18 14:21
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def words(column):
+    return f"regexp_replace(coalesce({column}, ''), '[^[:alnum:]]+', ' ', 'g')"
+
+
+def compact(column):
+    return f"regexp_replace(coalesce({column}, ''), '[^[:alnum:]]+', '', 'g')"
+
+
+def vector(*columns, weight):
+    text = " || ' ' || ".join(columns)
+    return f"setweight(to_tsvector('simple', {text}), '{weight}')"
+
+
+POPULATE_SEARCH_VECTORS_SQL = [
+    f"""
+    UPDATE books_book AS b SET search_vector =
+        {vector(words("b.title"), weight="A")}
+        || {vector(words("a.full_name"), weight="B")}
+    FROM books_author AS a
+    WHERE a.id = b.author_id
+    """,
+    f"""
+    UPDATE books_bookedition AS e SET search_vector =
+        {vector(words("e.isbn"), compact("e.isbn"), weight="A")}
+        || {vector(words("b.title"), weight="B")}
+        || {vector(words("a.full_name"), weight="C")}
+        || {vector(words("e.publisher"), weight="D")}
+    FROM books_book AS b
+    INNER JOIN books_author AS a ON a.id = b.author_id
+    WHERE b.id = e.book_id
+    """,
+    f"""
+    UPDATE books_bookcopy AS c SET search_vector =
+        {vector(words("c.identifier"), compact("c.identifier"), words("e.isbn"), compact("e.isbn"), weight="A")}
+        || {vector(words("b.title"), weight="B")}
+        || {vector(words("a.full_name"), weight="C")}
+        || {vector(words("e.publisher"), weight="D")}
+    FROM books_bookedition AS e
+    INNER JOIN books_book AS b ON b.id = e.book_id
+    INNER JOIN books_author AS a ON a.id = b.author_id
+    WHERE e.id = c.book_edition_id
+    """,
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='book',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='bookcopy',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='bookedition',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(POPULATE_SEARCH_VECTORS_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.8 on 2026-10-18 14:21
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('books', '0004_search_vectors'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='author',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('full_name'), name='gin_trgm_ops'), name='author_full_name_trgm_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='book',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='book_search_vector_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='bookcopy',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='bookcopy_search_vector_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='bookedition',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='bookedition_search_vector_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='publisher',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='publisher_name_trgm_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='publisher',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('address'), name='gin_trgm_ops'), name='publisher_address_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.8 on 2026-10-18 14:57
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('books', '0005_search_indexes'),
+        ('visitors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookloan',
+            name='overdue_at',
+            field=models.DateTimeField(blank=True, default=None, help_text='The date and time when the loan was found overdue, see `bookaloo.books.overdue`.', null=True),
+        ),
+        AddIndexConcurrently(
+            model_name='bookloan',
+            index=models.Index(condition=models.Q(('return_date__isnull', True)), fields=['due_date', 'id'], name='bookloan_open_due_date_id_idx'),
+        ),
+    ]
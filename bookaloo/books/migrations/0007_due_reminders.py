@@ -0,0 +1,18 @@
+# Generated by Django 5.1.8 on 2026-10-18 14:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0006_overdue_loans'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookloan',
+            name='due_reminder_sent_at',
+            field=models.DateTimeField(blank=True, default=None, help_text='The date and time when the due date reminder was sent, see `bookaloo.books.reminders`.', null=True),
+        ),
+    ]
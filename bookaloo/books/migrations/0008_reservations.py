@@ -0,0 +1,31 @@
+# Generated by Django 5.1.8 on 2026-10-18 15:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0007_due_reminders'),
+        ('visitors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('waiting', 'Waiting'), ('ready', 'Ready for pickup'), ('fulfilled', 'Fulfilled'), ('cancelled', 'Cancelled')], default='waiting', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='The date and time when the visitor joined the queue.')),
+                ('allocated_at', models.DateTimeField(blank=True, default=None, help_text='The date and time when the copy was held for the visitor.', null=True)),
+                ('book', models.ForeignKey(help_text='The reserved book, in any of its editions.', on_delete=django.db.models.deletion.PROTECT, related_name='reservations', to='books.book')),
+                ('book_copy', models.ForeignKey(blank=True, default=None, help_text='The copy held for the visitor, once returned.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='reservations', to='books.bookcopy')),
+                ('visitor', models.ForeignKey(help_text='The visitor waiting for the book.', on_delete=django.db.models.deletion.PROTECT, related_name='reservations', to='visitors.visitor')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('status', 'waiting')), fields=['book', 'created_at', 'id'], name='reservation_queue_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ['waiting', 'ready'])), fields=('book', 'visitor'), name='unique_active_reservation_per_visitor'), models.UniqueConstraint(condition=models.Q(('status', 'ready')), fields=('book_copy',), name='unique_ready_reservation_per_book_copy')],
+            },
+        ),
+    ]
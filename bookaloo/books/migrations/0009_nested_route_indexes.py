@@ -0,0 +1,37 @@
+# Generated by Django 5.1.8 on 2026-10-18 15:26
+
+import django.db.models.deletion
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('books', '0008_reservations'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='bookcopy',
+            index=models.Index(fields=['book_edition', 'identifier'], name='bookcopy_edition_ident_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='bookedition',
+            index=models.Index(fields=['book', 'isbn'], name='bookedition_book_isbn_idx'),
+        ),
+        # NOTE: The foreign key indexes are dropped once the composite
+        #       indexes, which start with the same column, are built
+        migrations.AlterField(
+            model_name='bookcopy',
+            name='book_edition',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='copies', to='books.bookedition'),
+        ),
+        migrations.AlterField(
+            model_name='bookedition',
+            name='book',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='editions', to='books.book'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.1.8 on 2026-10-18 15:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0009_nested_route_indexes'),
+    ]
+
+    operations = [
+        # NOTE: The free-text `publisher` column is left in place for the code
+        #       still running during the deploy, under the `publisher_name`
+        #       field; new editions leave it empty
+        migrations.AlterField(
+            model_name='bookedition',
+            name='publisher',
+            field=models.CharField(db_column='publisher', max_length=255),
+        ),
+        migrations.RenameField(
+            model_name='bookedition',
+            old_name='publisher',
+            new_name='publisher_name',
+        ),
+        migrations.AlterField(
+            model_name='bookedition',
+            name='publisher_name',
+            field=models.CharField(db_column='publisher', max_length=255, null=True),
+        ),
+        # NOTE: The foreign key constraint is validated by `0012`, without
+        #       blocking the writes to the editions in the meantime
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    [
+                        'ALTER TABLE "books_bookedition" ADD COLUMN "publisher_ref" bigint NULL',
+                        'ALTER TABLE "books_bookedition" ADD CONSTRAINT "bookedition_publisher_ref_fk" '
+                        'FOREIGN KEY ("publisher_ref") REFERENCES "books_publisher" ("id") '
+                        'DEFERRABLE INITIALLY DEFERRED NOT VALID',
+                    ],
+                    'ALTER TABLE "books_bookedition" DROP COLUMN "publisher_ref"',
+                ),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='bookedition',
+                    name='publisher',
+                    field=models.ForeignKey(db_column='publisher_ref', db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='editions', to='books.publisher'),
+                ),
+            ],
+        ),
+    ]
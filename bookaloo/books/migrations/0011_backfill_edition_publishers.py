@@ -0,0 +1,60 @@
+# Generated by Django 5.1.8 on 2026-10-18 15:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models, transaction
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 5000
+
+
+def backfill(apps, schema_editor):
+    """
+    Sets the publishers of the editions from their names, one transaction
+    per batch, inserting the missing publishers.
+
+    A frozen copy of `bookaloo.books.publishers`, without the cache bumps.
+    """
+    BookEdition = apps.get_model('books', 'BookEdition')
+    Publisher = apps.get_model('books', 'Publisher')
+    last_id = 0
+    while True:
+        edition_ids = list(
+            BookEdition.objects.filter(pk__gt=last_id, publisher__isnull=True)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:BATCH_SIZE]
+        )
+        if not edition_ids:
+            return
+        last_id = edition_ids[-1]
+        with transaction.atomic():
+            editions = BookEdition.objects.filter(pk__in=edition_ids, publisher__isnull=True)
+            names = set(editions.values_list('publisher_name', flat=True))
+            existing = set(Publisher.objects.filter(name__in=names).values_list('name', flat=True))
+            Publisher.objects.bulk_create(
+                [Publisher(name=name) for name in sorted(names - existing)]
+            )
+            editions.update(
+                publisher_id=Subquery(
+                    Publisher.objects.filter(name=OuterRef('publisher_name'))
+                    .order_by('pk')
+                    .values('pk')[:1]
+                )
+            )
+
+
+class Migration(migrations.Migration):
+
+    # NOTE: Every batch of the backfill is committed on its own
+    atomic = False
+
+    dependencies = [
+        ('books', '0010_edition_publisher_fk'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='bookedition',
+            index=models.Index(fields=['publisher', 'isbn'], name='bookedition_publisher_isbn_idx'),
+        ),
+    ]
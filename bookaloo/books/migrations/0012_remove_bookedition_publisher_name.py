@@ -0,0 +1,69 @@
+# Generated by Django 5.1.8 on 2026-10-18 15:40
+
+from importlib import import_module
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# NOTE: Backfills the editions created by the previous deployment since `0011`
+backfill = import_module('bookaloo.books.migrations.0011_backfill_edition_publishers').backfill
+
+
+class Migration(migrations.Migration):
+
+    # NOTE: Every step takes and releases its own locks
+    atomic = False
+
+    dependencies = [
+        ('books', '0011_backfill_edition_publishers'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        # NOTE: Validating the constraints doesn't block the writes, and lets
+        #       `SET NOT NULL` skip the scan of the table
+        migrations.RunSQL(
+            'ALTER TABLE "books_bookedition" ADD CONSTRAINT "bookedition_publisher_ref_not_null" '
+            'CHECK ("publisher_ref" IS NOT NULL) NOT VALID',
+            'ALTER TABLE "books_bookedition" DROP CONSTRAINT "bookedition_publisher_ref_not_null"',
+        ),
+        migrations.RunSQL(
+            'ALTER TABLE "books_bookedition" VALIDATE CONSTRAINT "bookedition_publisher_ref_not_null"',
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            'ALTER TABLE "books_bookedition" VALIDATE CONSTRAINT "bookedition_publisher_ref_fk"',
+            migrations.RunSQL.noop,
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'ALTER TABLE "books_bookedition" ALTER COLUMN "publisher_ref" SET NOT NULL',
+                    'ALTER TABLE "books_bookedition" ALTER COLUMN "publisher_ref" DROP NOT NULL',
+                ),
+                migrations.RunSQL(
+                    'ALTER TABLE "books_bookedition" DROP CONSTRAINT "bookedition_publisher_ref_not_null"',
+                    'ALTER TABLE "books_bookedition" ADD CONSTRAINT "bookedition_publisher_ref_not_null" '
+                    'CHECK ("publisher_ref" IS NOT NULL) NOT VALID',
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='bookedition',
+                    name='publisher',
+                    field=models.ForeignKey(db_column='publisher_ref', db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='editions', to='books.publisher'),
+                ),
+            ],
+        ),
+        # NOTE: The free-text column is only dropped from the models; the
+        #       database column goes in a later release, once no deployment
+        #       writes it anymore
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveField(
+                    model_name='bookedition',
+                    name='publisher_name',
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.8 on 2026-10-18 15:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0012_remove_bookedition_publisher_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CopyAvailability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('copies_count_total', models.PositiveIntegerField(default=0, editable=False, help_text='Number of physical copies.')),
+                ('copies_count_available', models.PositiveIntegerField(default=0, editable=False, help_text='Number of copies currently available for borrowing.')),
+                ('condition', models.CharField(choices=[('Very Good', 'Very Good'), ('Good', 'Good'), ('Acceptable', 'Acceptable'), ('Poor', 'Poor')], max_length=20)),
+                ('book', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='books.book')),
+                ('book_edition', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='availability', to='books.bookedition')),
+            ],
+            options={
+                'verbose_name_plural': 'copy availability',
+                'indexes': [models.Index(fields=['book', 'condition'], name='copyavailability_book_idx')],
+                'constraints': [models.UniqueConstraint(fields=('book_edition', 'condition'), name='unique_copy_availability_per_condition')],
+            },
+        ),
+        migrations.RunSQL(
+            """
+            INSERT INTO books_copyavailability
+                (book_id, book_edition_id, condition,
+                 copies_count_total, copies_count_available)
+            SELECT edition.book_id, book_copy.book_edition_id, book_copy.condition,
+                   COUNT(*), COUNT(*) FILTER (WHERE book_copy.is_available)
+            FROM books_bookcopy book_copy
+            JOIN books_bookedition edition ON edition.id = book_copy.book_edition_id
+            GROUP BY edition.book_id, book_copy.book_edition_id, book_copy.condition
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
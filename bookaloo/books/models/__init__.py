@@ -3,4 +3,6 @@ from bookaloo.books.models.book import Book
 from bookaloo.books.models.book_copy import BookCopy
 from bookaloo.books.models.book_edition import BookEdition
 from bookaloo.books.models.book_loan import BookLoan
+from bookaloo.books.models.copy_availability import CopyAvailability
 from bookaloo.books.models.publisher import Publisher
+from bookaloo.books.models.reservation import Reservation
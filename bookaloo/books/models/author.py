@@ -1,7 +1,12 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
+from bookaloo.books.models.search_document import SearchDocumentModel
 
-class Author(models.Model):
+
+class Author(SearchDocumentModel):
     full_name = models.CharField(max_length=480)
     birth_year = models.IntegerField(null=True, blank=True)
     description = models.TextField(
@@ -10,5 +15,18 @@ class Author(models.Model):
         default="",
     )
 
+    search_document_fields = ("full_name",)
+
+    class Meta:
+        indexes = [
+            # Supports keyset pagination, see `bookaloo.views.KeysetPagination`
+            models.Index(fields=["full_name", "id"], name="author_full_name_id_idx"),
+            # Serves case-insensitive substring search (`icontains`)
+            GinIndex(
+                OpClass(Upper("full_name"), name="gin_trgm_ops"),
+                name="author_full_name_trgm_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.full_name
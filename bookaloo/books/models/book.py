@@ -1,7 +1,12 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
+from bookaloo.books.models.copy_counters import CopyCountersModel
+from bookaloo.books.models.search_document import SearchDocumentModel
 
-class Book(models.Model):
+
+class Book(SearchDocumentModel, CopyCountersModel):
     """
     Represents a single book, as a literary work;
     regardless of its physical or digital copies.
@@ -14,5 +19,16 @@ class Book(models.Model):
         related_name="books",
     )
 
+    # NOTE: Maintained by `bookaloo.books.search`
+    search_vector = SearchVectorField(null=True, editable=False)
+    search_document_fields = ("title", "author_id")
+
+    class Meta:
+        indexes = [
+            # Supports keyset pagination, see `bookaloo.views.KeysetPagination`
+            models.Index(fields=["title", "id"], name="book_title_id_idx"),
+            GinIndex(fields=["search_vector"], name="book_search_vector_idx"),
+        ]
+
     def __str__(self):
         return f'"{self.title}" by {self.author}'
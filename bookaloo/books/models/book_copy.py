@@ -1,10 +1,14 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
 from bookaloo.books.enums import BookCondition
+from bookaloo.books.models.search_document import SearchDocumentModel
 
 
-class BookCopy(models.Model):
+class BookCopy(SearchDocumentModel):
     """
     Represents a physical copy of a book.
     This includes details like the condition of
@@ -20,6 +24,8 @@ class BookCopy(models.Model):
         to="books.BookEdition",
         on_delete=models.PROTECT,
         related_name="copies",
+        # NOTE: Covered by `bookcopy_edition_ident_idx`
+        db_index=False,
     )
     condition = models.CharField(
         max_length=20,
@@ -44,5 +50,109 @@ class BookCopy(models.Model):
         ),
     )
 
+    # NOTE: Maintained by `bookaloo.books.search`
+    search_vector = SearchVectorField(null=True, editable=False)
+    search_document_fields = ("identifier", "book_edition_id")
+
+    class Meta:
+        indexes = [
+            # Serves the copies of an edition, see `BookCopyViewSet`
+            models.Index(
+                fields=["book_edition", "identifier"],
+                name="bookcopy_edition_ident_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="bookcopy_search_vector_idx"),
+        ]
+
     def __str__(self):
         return f"{self.book_edition.book.title} - Condition: {self.condition}"
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the copy and keeps the copy counters (and availability)
+        of its edition and book in sync.
+        """
+        from bookaloo.books.counters import copy_counters_delta
+        from bookaloo.books.counters import merge_copy_counters_deltas
+        from bookaloo.books.counters import update_copy_counters
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not {
+            "book_edition",
+            "book_edition_id",
+            "condition",
+            "is_available",
+        }.intersection(update_fields):
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            previous = self._get_counted_state()
+            super().save(*args, **kwargs)
+            if previous is not None and (
+                previous["book_edition_id"] == self.book_edition_id
+                and previous["condition"] == self.condition
+                and previous["is_available"] == self.is_available
+            ):
+                return None
+            deltas = [
+                copy_counters_delta(
+                    book_id=self.book_edition.book_id,
+                    book_edition_id=self.book_edition_id,
+                    condition=self.condition,
+                    is_available=self.is_available,
+                ),
+            ]
+            if previous is not None:
+                deltas.append(
+                    copy_counters_delta(
+                        book_id=previous["book_edition__book_id"],
+                        book_edition_id=previous["book_edition_id"],
+                        condition=previous["condition"],
+                        is_available=previous["is_available"],
+                        sign=-1,
+                    ),
+                )
+            update_copy_counters(merge_copy_counters_deltas(*deltas))
+        return None
+
+    def delete(self, *args, **kwargs):
+        """
+        Deletes the copy and keeps the copy counters
+        of its edition and book in sync.
+        """
+        from bookaloo.books.counters import copy_counters_delta
+        from bookaloo.books.counters import update_copy_counters
+
+        with transaction.atomic():
+            previous = self._get_counted_state()
+            result = super().delete(*args, **kwargs)
+            if previous is not None:
+                update_copy_counters(
+                    copy_counters_delta(
+                        book_id=previous["book_edition__book_id"],
+                        book_edition_id=previous["book_edition_id"],
+                        condition=previous["condition"],
+                        is_available=previous["is_available"],
+                        sign=-1,
+                    ),
+                )
+        return result
+
+    def _get_counted_state(self):
+        """
+        Returns the currently stored state of the copy that is reflected
+        in the denormalized copy counters, locking the row.
+        """
+        if self._state.adding or self.pk is None:
+            return None
+        return (
+            BookCopy.objects.select_for_update(of=("self",))
+            .filter(pk=self.pk)
+            .values(
+                "book_edition__book_id",
+                "book_edition_id",
+                "condition",
+                "is_available",
+            )
+            .first()
+        )
@@ -1,7 +1,13 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db import transaction
 
+from bookaloo.books.models.copy_counters import CopyCountersModel
+from bookaloo.books.models.search_document import SearchDocumentModel
 
-class BookEdition(models.Model):
+
+class BookEdition(SearchDocumentModel, CopyCountersModel):
     """
     Represents a specific edition of a book.
     This includes details like the publisher, publication date, and ISBN.
@@ -11,10 +17,70 @@ class BookEdition(models.Model):
         to="books.Book",
         on_delete=models.PROTECT,
         related_name="editions",
+        # NOTE: Covered by `bookedition_book_isbn_idx`
+        db_index=False,
+    )
+    publisher = models.ForeignKey(
+        to="books.Publisher",
+        on_delete=models.PROTECT,
+        related_name="editions",
+        # NOTE: Next to the former free-text `publisher` column,
+        #       see `bookaloo.books.publishers`
+        db_column="publisher_ref",
+        # NOTE: Covered by `bookedition_publisher_isbn_idx`
+        db_index=False,
     )
-    publisher = models.CharField(max_length=255)
     publication_date = models.DateField()
     isbn = models.CharField(max_length=13, unique=True)
 
+    # NOTE: Maintained by `bookaloo.books.search`
+    search_vector = SearchVectorField(null=True, editable=False)
+    search_document_fields = ("isbn", "publisher_id", "book_id")
+
+    class Meta:
+        indexes = [
+            # Serves the editions of a book, see `BookEditionViewSet`
+            models.Index(fields=["book", "isbn"], name="bookedition_book_isbn_idx"),
+            # Serves the editions of a publisher, see `PublisherEditionViewSet`
+            models.Index(
+                fields=["publisher", "isbn"],
+                name="bookedition_publisher_isbn_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="bookedition_search_vector_idx"),
+        ]
+
     def __str__(self):
         return f"{self.book.title} - ISBN {self.isbn}"
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the edition; when it is moved to another book,
+        its copies are moved between the books' counters.
+        """
+        from bookaloo.books.counters import update_copy_counters
+        from bookaloo.books.models.copy_availability import CopyAvailability
+
+        if self._state.adding or self.pk is None:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            previous = (
+                BookEdition.objects.select_for_update()
+                .filter(pk=self.pk)
+                .values("book_id", "copies_count_total", "copies_count_available")
+                .first()
+            )
+            super().save(*args, **kwargs)
+            if previous is not None and previous["book_id"] != self.book_id:
+                total = previous["copies_count_total"]
+                available = previous["copies_count_available"]
+                update_copy_counters(
+                    {
+                        (previous["book_id"], None, None): (-total, -available),
+                        (self.book_id, None, None): (total, available),
+                    },
+                )
+                CopyAvailability.objects.filter(book_edition=self).update(
+                    book_id=self.book_id,
+                )
+        return None
@@ -37,6 +37,24 @@ class BookLoan(models.Model):
         help_text=_("The date and time when the book was returned."),
         default=None,
     )
+    overdue_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        default=None,
+        help_text=_(
+            "The date and time when the loan was found overdue, "
+            "see `bookaloo.books.overdue`."
+        ),
+    )
+    due_reminder_sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        default=None,
+        help_text=_(
+            "The date and time when the due date reminder was sent, "
+            "see `bookaloo.books.reminders`."
+        ),
+    )
 
     class Meta:
         constraints = [
@@ -47,6 +65,17 @@ class BookLoan(models.Model):
                 name="unique_active_loan_per_book_copy",
             ),
         ]
+        indexes = [
+            # Supports keyset pagination, see `bookaloo.views.KeysetPagination`
+            models.Index(fields=["loan_date", "id"], name="bookloan_loan_date_id_idx"),
+            # Supports finding overdue loans, see `bookaloo.books.overdue`;
+            # only covers the open loans, a fraction of the loan history
+            models.Index(
+                fields=["due_date", "id"],
+                condition=Q(return_date__isnull=True),
+                name="bookloan_open_due_date_id_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Loan of {self.book_copy} to {self.visitor} on {self.loan_date}"
@@ -0,0 +1,52 @@
+from django.db import models
+
+from bookaloo.books.enums import BookCondition
+from bookaloo.books.models.copy_counters import CopyCountersModel
+
+
+class CopyAvailability(CopyCountersModel):
+    """
+    Represents the copies of a book edition in a given condition:
+    how many there are, and how many of them are available.
+
+    NOTE: Derived from `BookCopy` rows and maintained along with the copy
+          counters (see `bookaloo.books.counters`), so that availability
+          summaries don't have to scan the copies.
+    """
+
+    # NOTE: Denormalized from the edition, to sum up a book's rows
+    book = models.ForeignKey(
+        to="books.Book",
+        on_delete=models.CASCADE,
+        related_name="+",
+        db_index=False,
+    )
+    book_edition = models.ForeignKey(
+        to="books.BookEdition",
+        on_delete=models.CASCADE,
+        related_name="availability",
+        db_index=False,
+    )
+    condition = models.CharField(
+        max_length=20,
+        choices=BookCondition.choices,
+    )
+
+    class Meta:
+        verbose_name_plural = "copy availability"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["book_edition", "condition"],
+                name="unique_copy_availability_per_condition",
+            ),
+        ]
+        indexes = [
+            # Serves the summaries of a book, see `BookViewSet.availability`
+            models.Index(
+                fields=["book", "condition"],
+                name="copyavailability_book_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.book_edition} - Condition: {self.condition}"
@@ -0,0 +1,36 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class CopyCountersModel(models.Model):
+    """
+    Adds denormalized copy counters, kept in sync by `bookaloo.books.counters`.
+
+    The counters are only ever changed with relative UPDATEs, so regular
+    saves of an existing object leave them out to avoid overwriting
+    concurrent changes with stale in-memory values.
+    """
+
+    copies_count_total = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text=_("Number of physical copies."),
+    )
+    copies_count_available = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text=_("Number of copies currently available for borrowing."),
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.fields
+                if not field.primary_key
+                and field.name not in {"copies_count_total", "copies_count_available"}
+            ]
+        super().save(*args, **kwargs)
@@ -1,7 +1,12 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
+from bookaloo.books.models.search_document import SearchDocumentModel
 
-class Publisher(models.Model):
+
+class Publisher(SearchDocumentModel):
     """
     Represents a publisher of books.
     This includes details like the name and address of the publisher.
@@ -14,5 +19,23 @@ class Publisher(models.Model):
         default="",
     )
 
+    search_document_fields = ("name",)
+
+    class Meta:
+        indexes = [
+            # Supports keyset pagination, see `bookaloo.views.KeysetPagination`
+            models.Index(fields=["name", "id"], name="publisher_name_id_idx"),
+            # Serves case-insensitive substring search (`icontains`)
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="publisher_name_trgm_idx",
+            ),
+            # Serves case-insensitive substring search (`icontains`)
+            GinIndex(
+                OpClass(Upper("address"), name="gin_trgm_ops"),
+                name="publisher_address_trgm_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.name
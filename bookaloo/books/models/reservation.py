@@ -0,0 +1,81 @@
+from django.db import models
+from django.db.models import Q
+from django.db.models import UniqueConstraint
+from django.utils.translation import gettext_lazy as _
+
+from bookaloo.books.enums import ReservationStatus
+from bookaloo.visitors.models import Visitor
+
+
+class Reservation(models.Model):
+    """
+    Represents a visitor's place in the queue of a book,
+    whose copies are all lent out; see `bookaloo.books.reservations`.
+    """
+
+    book = models.ForeignKey(
+        to="books.Book",
+        on_delete=models.PROTECT,
+        related_name="reservations",
+        help_text=_("The reserved book, in any of its editions."),
+    )
+    visitor = models.ForeignKey(
+        to=Visitor,
+        on_delete=models.PROTECT,
+        related_name="reservations",
+        help_text=_("The visitor waiting for the book."),
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=ReservationStatus.choices,
+        default=ReservationStatus.WAITING,
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text=_("The date and time when the visitor joined the queue."),
+    )
+    book_copy = models.ForeignKey(
+        to="books.BookCopy",
+        on_delete=models.PROTECT,
+        related_name="reservations",
+        null=True,
+        blank=True,
+        default=None,
+        help_text=_("The copy held for the visitor, once returned."),
+    )
+    allocated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        default=None,
+        help_text=_("The date and time when the copy was held for the visitor."),
+    )
+
+    class Meta:
+        constraints = [
+            # A visitor can only queue once for a book
+            UniqueConstraint(
+                fields=["book", "visitor"],
+                condition=Q(
+                    status__in=[ReservationStatus.WAITING, ReservationStatus.READY],
+                ),
+                name="unique_active_reservation_per_visitor",
+            ),
+            # A copy can only be held for one visitor at a time
+            UniqueConstraint(
+                fields=["book_copy"],
+                condition=Q(status=ReservationStatus.READY),
+                name="unique_ready_reservation_per_book_copy",
+            ),
+        ]
+        indexes = [
+            # Supports finding the head of the queue and the positions in it,
+            # see `bookaloo.books.reservations`
+            models.Index(
+                fields=["book", "created_at", "id"],
+                condition=Q(status=ReservationStatus.WAITING),
+                name="reservation_queue_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Reservation of {self.book} by {self.visitor} on {self.created_at}"
@@ -0,0 +1,56 @@
+from django.db import models
+
+
+class SearchDocumentModel(models.Model):
+    """
+    Remembers the loaded values of the `search_document_fields` (attribute
+    names) the search documents are built from, see `bookaloo.books.search`,
+    so that saves only refresh the documents when one of them changed.
+    """
+
+    search_document_fields: tuple[str, ...] = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # NOTE: After the `post_save` receivers compared the values
+        self.remember_search_document()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_search_document()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.remember_search_document()
+
+    def remember_search_document(self):
+        # NOTE: Deferred fields are left out, so as not to load them
+        self._search_document_values = {
+            name: vars(self)[name]
+            for name in self.search_document_fields
+            if name in vars(self)
+        }
+
+    def has_search_document_changed(self, update_fields=None):
+        """
+        Tells whether the saved fields changed any of the values the search
+        documents are built from. Values that weren't loaded count as changed.
+        """
+        loaded = getattr(self, "_search_document_values", {})
+        fields = self.search_document_fields
+        if update_fields is not None:
+            updated = {
+                field.attname
+                for field in self._meta.fields
+                if {field.name, field.attname}.intersection(update_fields)
+            }
+            fields = tuple(name for name in fields if name in updated)
+        return any(
+            name not in loaded or vars(self).get(name) != loaded[name]
+            for name in fields
+        )
@@ -0,0 +1,100 @@
+"""
+Finding overdue loans and notifying their visitors.
+
+`scan_overdue_loans` (see `bookaloo.books.tasks`, scheduled with Celery beat)
+walks the open loans past their due date in keyset batches over
+`(due_date, id)`, which the partial `bookloan_open_due_date_id_idx` index
+covers: returned loans, the bulk of the loan history, are never read.
+Each batch is flagged with `overdue_at`, so that the following scans skip it,
+and its visitors are notified in chunks of loans, by separate tasks.
+"""
+
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.core.mail import get_connection
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils.translation import gettext as _
+
+from bookaloo.books.models import BookLoan
+
+if TYPE_CHECKING:
+    from bookaloo.visitors.models import Visitor
+
+OVERDUE_BATCH_SIZE = 1000
+OVERDUE_NOTICE_CHUNK_SIZE = 100
+
+
+def get_overdue_loans(until):
+    """
+    Returns the open loans due before `until` that haven't been flagged yet.
+    """
+    return BookLoan.objects.filter(
+        return_date__isnull=True,
+        overdue_at__isnull=True,
+        due_date__lt=until,
+    )
+
+
+def iter_overdue_loan_batches(until, batch_size=OVERDUE_BATCH_SIZE):
+    """
+    Yields the `(id, visitor_id)` pairs of the overdue loans, in batches
+    ordered by `(due_date, id)`.
+    """
+    queryset = get_overdue_loans(until).order_by("due_date", "id")
+    seek = Q()
+    while True:
+        rows = list(
+            queryset.filter(seek).values_list("id", "visitor_id", "due_date")[
+                :batch_size
+            ],
+        )
+        if not rows:
+            return
+        yield [(loan_id, visitor_id) for loan_id, visitor_id, _due_date in rows]
+        last_id, _visitor_id, last_due_date = rows[-1]
+        seek = Q(due_date__gte=last_due_date) & (
+            Q(due_date__gt=last_due_date) | Q(id__gt=last_id)
+        )
+
+
+def mark_loans_overdue(loan_ids, overdue_at):
+    return BookLoan.objects.filter(
+        id__in=loan_ids,
+        return_date__isnull=True,
+        overdue_at__isnull=True,
+    ).update(overdue_at=overdue_at)
+
+
+def send_overdue_notices(loan_ids):
+    """
+    Sends one notice per visitor, for their loans among `loan_ids`
+    still open, over a single connection. Returns the number of sent emails.
+    """
+    loans = (
+        BookLoan.objects.filter(id__in=loan_ids, return_date__isnull=True)
+        .select_related("visitor", "book_copy__book_edition__book")
+        .order_by("visitor_id", "due_date")
+    )
+    loans_per_visitor: dict[Visitor, list[BookLoan]] = {}
+    for loan in loans:
+        loans_per_visitor.setdefault(loan.visitor, []).append(loan)
+
+    messages = [
+        EmailMessage(
+            subject=_("Overdue books"),
+            body=render_to_string(
+                "books/emails/overdue_notice.txt",
+                {"visitor": visitor, "loans": visitor_loans},
+            ),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[visitor.email],
+        )
+        for visitor, visitor_loans in loans_per_visitor.items()
+        if visitor.email
+    ]
+    if not messages:
+        return 0
+    return get_connection().send_messages(messages) or 0
@@ -0,0 +1,104 @@
+"""
+Backfill of the editions' publishers from their former free-text column.
+
+`BookEdition.publisher` used to hold the publisher's name, in the `publisher`
+column. The migration to a foreign key is done without breaking the code
+still running during the deploy:
+
+1. `0010_edition_publisher_fk` keeps the text column as is, only making it
+   nullable, as the `publisher_name` field, and adds the nullable
+   `publisher` foreign key in a new `publisher_ref` column, with a
+   constraint left to validate;
+2. `0011_backfill_edition_publishers` sets the foreign keys in batches of
+   editions, each committed on its own, then builds the
+   `(publisher_ref, isbn)` index concurrently;
+3. `0012_remove_bookedition_publisher_name` backfills the editions created
+   in the meantime, validates the constraints, and makes the foreign key
+   required without scanning the table under an exclusive lock. The text
+   column is only removed from the models; it is dropped from the database
+   in a later release.
+
+Names are deduplicated in bulk: the names of a batch missing from
+`Publisher` are inserted with a single query, and every edition gets the
+oldest publisher of its name, looked up through the `(name, id)` index.
+
+On large tables, the backfill can be run ahead of the last migrations with
+the `backfill_edition_publishers` command, once `0010` is applied; it can be
+interrupted and resumed, and the migrations then only handle the rest.
+The migrations run a frozen copy of the backfill, without the cache bumps.
+"""
+
+from django.db import transaction
+from django.db.models import OuterRef
+from django.db.models import Subquery
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def iter_edition_id_batches(edition_model, batch_size):
+    """
+    Yields the ids of the editions without a publisher, in batches.
+    """
+    last_id = 0
+    while True:
+        edition_ids = list(
+            edition_model.objects.filter(pk__gt=last_id, publisher__isnull=True)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size],
+        )
+        if not edition_ids:
+            return
+        yield edition_ids
+        last_id = edition_ids[-1]
+
+
+def backfill_publisher_batch(edition_model, publisher_model, edition_ids):
+    """
+    Sets the publishers of the editions from their names, inserting the
+    missing publishers. Returns the number of updated editions.
+    """
+    editions = edition_model.objects.filter(pk__in=edition_ids, publisher__isnull=True)
+    names = set(editions.values_list("publisher_name", flat=True))
+    existing = set(
+        publisher_model.objects.filter(name__in=names).values_list("name", flat=True),
+    )
+    publisher_model.objects.bulk_create(
+        [publisher_model(name=name) for name in sorted(names - existing)],
+    )
+    return editions.update(
+        publisher_id=Subquery(
+            publisher_model.objects.filter(name=OuterRef("publisher_name"))
+            .order_by("pk")
+            .values("pk")[:1],
+        ),
+    )
+
+
+def backfill_edition_publishers(apps, batch_size=BACKFILL_BATCH_SIZE, progress=None):
+    """
+    Backfills the publishers of all the editions, one transaction per batch.
+
+    `apps` is the app registry of the migration state between `0010` and
+    `0012`, whose editions have both `publisher_name` and `publisher`.
+    `progress` is called with the number of editions updated so far after
+    every batch. Returns the number of updated editions.
+    """
+    from bookaloo.books.cache import EDITIONS
+    from bookaloo.books.cache import PUBLISHERS
+    from bookaloo.books.cache import bump_cache_generations
+
+    edition_model = apps.get_model("books", "BookEdition")
+    publisher_model = apps.get_model("books", "Publisher")
+    updated = 0
+    for edition_ids in iter_edition_id_batches(edition_model, batch_size):
+        with transaction.atomic():
+            updated += backfill_publisher_batch(
+                edition_model,
+                publisher_model,
+                edition_ids,
+            )
+            # NOTE: Cached editions still carry the publishers' names
+            bump_cache_generations(EDITIONS, PUBLISHERS)
+        if progress is not None:
+            progress(updated)
+    return updated
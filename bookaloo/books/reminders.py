@@ -0,0 +1,164 @@
+"""
+Reminders of the loans coming due, grouped into one email per visitor.
+
+`schedule_due_reminders` (see `bookaloo.books.tasks`, scheduled with Celery
+beat) splits the visitors with loans due within `days` into id ranges, and
+enqueues a `send_due_reminders` task per range, so that workers can send
+them in parallel. Each task takes the visitors of its range in chunks:
+
+- their loans are locked (`SKIP LOCKED`, so that overlapping runs don't
+  wait on each other) and the emails are rendered for the whole chunk;
+- the chunk is sent in a single call: with `DUE_REMINDER_ESP_TEMPLATE` set,
+  as one Anymail batch message to the ESP's template (one API request for
+  the chunk, with the per-visitor data as `merge_data`); otherwise as
+  rendered emails over a single connection, which ESP backends send one API
+  request at a time, hence the template being required in production;
+- the loans are marked with `due_reminder_sent_at` in the same transaction,
+  so that reruns skip them. A failed send rolls the marks back.
+"""
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from anymail.message import AnymailMessage
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.core.mail import get_connection
+from django.db import transaction
+from django.db.models import Max
+from django.db.models import Min
+from django.template.loader import get_template
+from django.utils.formats import date_format
+from django.utils.timezone import now
+from django.utils.translation import gettext as _
+
+from bookaloo.books.models import BookLoan
+
+if TYPE_CHECKING:
+    from bookaloo.visitors.models import Visitor
+
+DUE_REMINDER_DAYS = 2
+# NOTE: Postmark's batch API takes up to 500 messages
+DUE_REMINDER_CHUNK_SIZE = 500
+DUE_REMINDER_SHARDS = 4
+
+
+def get_due_loans(days, at=None):
+    """
+    Returns the open loans due within `days`, without a reminder yet.
+    """
+    at = at or now()
+    return BookLoan.objects.filter(
+        return_date__isnull=True,
+        due_reminder_sent_at__isnull=True,
+        due_date__gte=at,
+        due_date__lt=at + timedelta(days=days),
+    )
+
+
+def get_visitor_ranges(days, shards=DUE_REMINDER_SHARDS):
+    """
+    Splits the ids of the visitors with due loans into `[start, stop)` ranges.
+    """
+    bounds = get_due_loans(days).aggregate(
+        start=Min("visitor_id"),
+        stop=Max("visitor_id"),
+    )
+    if bounds["start"] is None:
+        return []
+    start, stop = bounds["start"], bounds["stop"] + 1
+    step = -(-(stop - start) // shards)
+    return [(lower, min(lower + step, stop)) for lower in range(start, stop, step)]
+
+
+def get_reminder_context(visitor, loans):
+    return {
+        "name": visitor.full_name,
+        "loans": [
+            {
+                "title": loan.book_copy.book_edition.book.title,
+                "identifier": loan.book_copy.identifier,
+                "due_date": date_format(loan.due_date, "DATE_FORMAT"),
+            }
+            for loan in loans
+        ],
+    }
+
+
+def build_reminder_messages(contexts):
+    """
+    Builds the messages of a chunk, from the contexts per email address.
+    """
+    if settings.DUE_REMINDER_ESP_TEMPLATE:
+        # See https://anymail.dev/en/stable/sending/templates/
+        return [
+            AnymailMessage(
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[*contexts],
+                template_id=settings.DUE_REMINDER_ESP_TEMPLATE,
+                merge_data=contexts,
+            ),
+        ]
+    template = get_template("books/emails/due_reminder.txt")
+    return [
+        EmailMessage(
+            subject=_("Books due soon"),
+            body=template.render(context),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[email],
+        )
+        for email, context in contexts.items()
+    ]
+
+
+def remind_visitors(
+    start,
+    stop,
+    days=DUE_REMINDER_DAYS,
+    chunk_size=DUE_REMINDER_CHUNK_SIZE,
+):
+    """
+    Sends the reminders to the visitors in the `[start, stop)` id range.
+    Returns the number of reminded loans.
+    """
+    reminded = 0
+    while True:
+        with transaction.atomic():
+            loans = get_due_loans(days).filter(
+                visitor_id__gte=start,
+                visitor_id__lt=stop,
+            )
+            visitor_ids = list(
+                loans.order_by("visitor_id")
+                .values_list("visitor_id", flat=True)
+                .distinct()[:chunk_size],
+            )
+            if not visitor_ids:
+                return reminded
+            start = visitor_ids[-1] + 1
+            loans = list(
+                loans.filter(visitor_id__in=visitor_ids)
+                .select_related("visitor", "book_copy__book_edition__book")
+                .select_for_update(skip_locked=True, of=("self",))
+                .order_by("visitor_id", "due_date", "id"),
+            )
+            reminded += send_reminders_chunk(loans)
+
+
+def send_reminders_chunk(loans):
+    # NOTE: Grouped by address, visitors sharing one get a single email
+    loans_per_email: dict[str, list[BookLoan]] = {}
+    visitors: dict[str, Visitor] = {}
+    for loan in loans:
+        if loan.visitor.email:
+            loans_per_email.setdefault(loan.visitor.email, []).append(loan)
+            visitors.setdefault(loan.visitor.email, loan.visitor)
+    contexts = {
+        email: get_reminder_context(visitors[email], email_loans)
+        for email, email_loans in loans_per_email.items()
+    }
+    if contexts:
+        get_connection().send_messages(build_reminder_messages(contexts))
+    return BookLoan.objects.filter(id__in=[loan.id for loan in loans]).update(
+        due_reminder_sent_at=now(),
+    )
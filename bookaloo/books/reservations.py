@@ -0,0 +1,212 @@
+"""
+Reservation queues of the books whose copies are all lent out.
+
+Visitors queue for a book, in any of its editions, in `(created_at, id)`
+order. The waiting reservations are covered by the partial
+`reservation_queue_idx` index, so that the head of a queue is a single
+index probe, however long the reservation history is.
+
+When a copy is returned, `allocate_returned_copies` holds it for the head of its
+book's queue, locked with `SKIP LOCKED`: concurrent returns of copies of
+the same book take the successive heads instead of waiting on each other.
+The reservation becomes ready, and the copy stays unavailable (in the copy
+counters, too) until its visitor checks it out, see
+`bookaloo.books.circulation.checkout`, or the reservation is cancelled.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Count
+from django.db.models import Exists
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
+from django.db.models.functions import Coalesce
+from django.utils.timezone import now
+
+from bookaloo.books.enums import ReservationStatus
+from bookaloo.books.models import BookLoan
+from bookaloo.books.models import Reservation
+
+ACTIVE_RESERVATION_CONSTRAINT = "unique_active_reservation_per_visitor"
+
+
+def get_reserved_for():
+    """
+    Returns the expression of the visitor id a copy is held for, if any.
+    """
+    return Subquery(
+        Reservation.objects.filter(
+            book_copy=OuterRef("pk"),
+            status=ReservationStatus.READY,
+        ).values("visitor_id")[:1],
+    )
+
+
+def get_queue_head(book_edition_id):
+    """
+    Fetches and locks the first waiting reservation of the edition's book,
+    skipping the ones locked by concurrent allocations.
+    """
+    return (
+        Reservation.objects.select_for_update(skip_locked=True, of=("self",))
+        .filter(
+            book__editions=book_edition_id,
+            status=ReservationStatus.WAITING,
+        )
+        .order_by("created_at", "id")
+        .first()
+    )
+
+
+def has_waiting_reservations(book_edition):
+    """
+    Returns the expression telling whether the book of the edition
+    referenced by `book_edition` has a queue.
+    """
+    return Exists(
+        Reservation.objects.filter(
+            book__editions=OuterRef(book_edition),
+            status=ReservationStatus.WAITING,
+        ),
+    )
+
+
+def hold_copy(book_copy):
+    """
+    Holds the copy for the head of its book's queue, if any,
+    and returns the reservation.
+    """
+    reservation = get_queue_head(book_copy.book_edition_id)
+    if reservation is None:
+        return None
+    reservation.status = ReservationStatus.READY
+    reservation.book_copy = book_copy
+    reservation.allocated_at = now()
+    reservation.save(update_fields=["status", "book_copy", "allocated_at"])
+    return reservation
+
+
+def allocate_returned_copies(book_loans):
+    """
+    Holds the copies of the closed loans for the heads of their books' queues.
+
+    Loans annotated with `has_waiting_reservations` (see the function of that
+    name) are skipped without a query when nobody waits for their book.
+    Returns the ids of the held copies.
+    """
+    return {
+        book_loan.book_copy_id
+        for book_loan in book_loans
+        if getattr(book_loan, "has_waiting_reservations", True)
+        and hold_copy(book_loan.book_copy) is not None
+    }
+
+
+def fulfil_reservations(book_copies, visitor):
+    """
+    Closes the reservations of the copies held for the visitor (annotated
+    with `reserved_for_id`, see `get_reserved_for`), as they are checked out.
+    Returns the ids of the held copies.
+    """
+    held = [
+        book_copy
+        for book_copy in book_copies
+        if getattr(book_copy, "reserved_for_id", None) is not None
+    ]
+    if not held:
+        return set()
+    Reservation.objects.filter(
+        book_copy__in=held,
+        visitor=visitor,
+        status=ReservationStatus.READY,
+    ).update(status=ReservationStatus.FULFILLED)
+    for book_copy in held:
+        book_copy.reserved_for_id = None
+    return {book_copy.pk for book_copy in held}
+
+
+def cancel_reservation(reservation):
+    """
+    Cancels the reservation; a copy held for it goes to the next visitor
+    in the queue, or back on the shelf.
+    """
+    book_copy = (
+        reservation.book_copy if reservation.status == ReservationStatus.READY else None
+    )
+    reservation.status = ReservationStatus.CANCELLED
+    reservation.save(update_fields=["status"])
+    if book_copy is not None and hold_copy(book_copy) is None:
+        book_copy.is_available = True
+        book_copy.save(update_fields=["is_available"])
+
+
+def annotate_queue_positions(queryset):
+    """
+    Annotates the number of waiting reservations ahead in the book's queue
+    (`ahead_count`), counted over the queue index; see `get_position`.
+    """
+    ahead = (
+        Reservation.objects.filter(
+            book=OuterRef("book"),
+            status=ReservationStatus.WAITING,
+        )
+        .filter(
+            Q(created_at__lt=OuterRef("created_at"))
+            | Q(created_at=OuterRef("created_at"), id__lt=OuterRef("id")),
+        )
+        .order_by()
+        .values("book")
+    )
+    return queryset.annotate(
+        ahead_count=Coalesce(
+            Subquery(ahead.annotate(count=Count("pk")).values("count")),
+            0,
+        ),
+    )
+
+
+def get_position(reservation):
+    if reservation.status != ReservationStatus.WAITING:
+        return None
+    return reservation.ahead_count + 1
+
+
+def set_estimated_available_dates(reservations):
+    """
+    Sets the `estimated_available_at` of the waiting reservations, with one
+    query for all their books.
+
+    The visitor at position `p` of a book with `n` copies lent out is assumed
+    to get the copy returned `p`-th, going by the due dates, each copy being
+    then lent out again for the default loan period in queue order.
+    """
+    from bookaloo.books.circulation import DEFAULT_LOAN_PERIOD
+
+    waiting = [
+        reservation
+        for reservation in reservations
+        if reservation.status == ReservationStatus.WAITING
+    ]
+    due_dates = defaultdict(list)
+    if waiting:
+        for book_id, due_date in (
+            BookLoan.objects.filter(
+                book_copy__book_edition__book__in={r.book_id for r in waiting},
+                return_date__isnull=True,
+            )
+            .order_by("due_date")
+            .values_list("book_copy__book_edition__book", "due_date")
+        ):
+            due_dates[book_id].append(due_date)
+
+    current_time = now()
+    for reservation in reservations:
+        reservation.estimated_available_at = None
+        book_due_dates = due_dates.get(reservation.book_id)
+        if reservation.status != ReservationStatus.WAITING or not book_due_dates:
+            continue
+        rounds, index = divmod(reservation.ahead_count, len(book_due_dates))
+        reservation.estimated_available_at = (
+            max(book_due_dates[index], current_time) + rounds * DEFAULT_LOAN_PERIOD
+        )
@@ -0,0 +1,143 @@
+"""
+Full-text search documents of the catalog models.
+
+`Book`, `BookEdition` and `BookCopy` keep a weighted `search_vector` built from
+their own columns and the columns of their related objects (titles, author and
+publisher names, ISBNs and copy identifiers). The vectors are GIN-indexed and
+queried by `bookaloo.books.filters.SearchVectorFilter`.
+
+Vectors are refreshed with set-based UPDATEs from the `post_save` receivers in
+`bookaloo.books.signals`, when a save changes one of the models'
+`search_document_fields`; code writing with `QuerySet.update()` or
+`bulk_create()` must call `refresh_search_vectors` itself.
+"""
+
+import re
+
+from django.contrib.postgres.search import SearchQuery
+from django.contrib.postgres.search import SearchVector
+from django.db.models import F
+from django.db.models import Func
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import Value
+
+from bookaloo.books.models import Author
+from bookaloo.books.models import Book
+from bookaloo.books.models import BookCopy
+from bookaloo.books.models import BookEdition
+from bookaloo.books.models import Publisher
+
+SEARCH_CONFIG = "simple"
+
+
+def _words(expression):
+    """
+    Splits the text into plain alphanumeric words, so that
+    e.g. "J.R.R." is indexed as "j r r" rather than a single token.
+    """
+    return Func(
+        expression,
+        Value(r"[^[:alnum:]]+"),
+        Value(" "),
+        Value("g"),
+        function="REGEXP_REPLACE",
+    )
+
+
+def _compact(expression):
+    """
+    Strips separators, so that "12-345-678" is also indexed as "12345678".
+    """
+    return Func(
+        expression,
+        Value(r"[^[:alnum:]]+"),
+        Value(""),
+        Value("g"),
+        function="REGEXP_REPLACE",
+    )
+
+
+def _vector(*expressions, weight):
+    return SearchVector(*expressions, config=SEARCH_CONFIG, weight=weight)
+
+
+def get_search_document(model):
+    """
+    Returns the expression computing the search vector of `model` rows.
+    """
+    if model is Book:
+        author_name = Subquery(
+            Author.objects.filter(pk=OuterRef("author_id")).values("full_name"),
+        )
+        return _vector(_words(F("title")), weight="A") + _vector(
+            _words(author_name),
+            weight="B",
+        )
+    if model is BookEdition:
+        book = Book.objects.filter(pk=OuterRef("book_id"))
+        publisher_name = Subquery(
+            Publisher.objects.filter(pk=OuterRef("publisher_id")).values("name"),
+        )
+        return (
+            _vector(_words(F("isbn")), _compact(F("isbn")), weight="A")
+            + _vector(_words(Subquery(book.values("title"))), weight="B")
+            + _vector(_words(Subquery(book.values("author__full_name"))), weight="C")
+            + _vector(_words(publisher_name), weight="D")
+        )
+    if model is BookCopy:
+        edition = BookEdition.objects.filter(pk=OuterRef("book_edition_id"))
+        isbn = Subquery(edition.values("isbn"))
+        return (
+            _vector(
+                _words(F("identifier")),
+                _compact(F("identifier")),
+                _words(isbn),
+                _compact(isbn),
+                weight="A",
+            )
+            + _vector(_words(Subquery(edition.values("book__title"))), weight="B")
+            + _vector(
+                _words(Subquery(edition.values("book__author__full_name"))),
+                weight="C",
+            )
+            + _vector(
+                _words(Subquery(edition.values("publisher__name"))),
+                weight="D",
+            )
+        )
+    msg = f"{model.__name__} has no search document."
+    raise ValueError(msg)
+
+
+def refresh_search_vectors(queryset):
+    """
+    Recomputes the search vectors of all objects in `queryset` with one UPDATE.
+    """
+    return queryset.update(search_vector=get_search_document(queryset.model))
+
+
+def build_search_query(search_terms):
+    """
+    Builds a prefix-matching query requiring every search term.
+
+    Each term is split into words the same way the documents are; a term
+    made of several words also matches its compact form, so that an ISBN
+    typed with or without dashes finds the same edition.
+    """
+    term_queries = []
+    for term in search_terms:
+        words = re.findall(r"[^\W_]+", term.lower())
+        if not words:
+            continue
+        term_query = " & ".join(f"{word}:*" for word in words)
+        if len(words) > 1:
+            term_query = f"({term_query}) | {''.join(words)}:*"
+        term_queries.append(f"({term_query})")
+    if not term_queries:
+        return None
+    return SearchQuery(
+        " & ".join(term_queries),
+        config=SEARCH_CONFIG,
+        search_type="raw",
+    )
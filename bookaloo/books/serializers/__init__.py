@@ -1,7 +1,16 @@
 from .author_serializer import AuthorSerializer
 from .book_copy_serializer import BookCopySerializer
 from .book_edition_serializer import BookEditionSerializer
+from .book_loan_batch_serializer import BookLoanBatchItemSerializer
+from .book_loan_batch_serializer import BookLoanBatchResultSerializer
+from .book_loan_batch_serializer import BookLoanBatchSerializer
+from .book_loan_export_serializer import BookLoanExportQuerySerializer
 from .book_loan_serializer import BookLoanSerializer
+from .book_return_batch_serializer import BookReturnBatchResultSerializer
+from .book_return_batch_serializer import BookReturnBatchSerializer
 from .book_return_serializer import BookReturnSerializer
 from .book_serializer import BookSerializer
+from .copy_availability_serializer import BookAvailabilitySerializer
+from .copy_availability_serializer import EditionAvailabilitySerializer
 from .publisher_serializer import PublisherSerializer
+from .reservation_serializer import ReservationSerializer
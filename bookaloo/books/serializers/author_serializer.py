@@ -1,9 +1,10 @@
 from rest_framework import serializers
 
 from bookaloo.books.models import Author
+from bookaloo.books.serializers.fieldsets import SparseFieldsetMixin
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Author
         fields = "__all__"
@@ -1,13 +1,16 @@
 from rest_framework import serializers
 
 from bookaloo.books.models import BookCopy
+from bookaloo.books.serializers.fieldsets import SparseFieldsetMixin
 
 
-class BookCopySerializer(serializers.ModelSerializer):
+class BookCopySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = BookCopy
-        fields = "__all__"
+        exclude = ["search_vector"]
         read_only_fields = [
             "id",
             "is_available",
+            # NOTE: Taken from the URL, see `BookCopyViewSet`
+            "book_edition",
         ]
@@ -1,9 +1,22 @@
 from rest_framework import serializers
 
 from bookaloo.books.models import BookEdition
+from bookaloo.books.serializers.book_serializer import BookCopiesInlineSerializer
+from bookaloo.books.serializers.fieldsets import SparseFieldsetMixin
 
 
-class BookEditionSerializer(serializers.ModelSerializer):
+class BookEditionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    copies_count = BookCopiesInlineSerializer(
+        source="*",
+        read_only=True,
+    )
+
     class Meta:
         model = BookEdition
-        fields = "__all__"
+        exclude = [
+            "copies_count_total",
+            "copies_count_available",
+            "search_vector",
+        ]
+        # NOTE: Taken from the URL, see `BookEditionViewSet`
+        read_only_fields = ["book"]
@@ -0,0 +1,70 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from bookaloo.books.enums import BatchItemStatus
+from bookaloo.books.enums import BatchMode
+from bookaloo.books.serializers.book_loan_serializer import BookLoanSerializer
+from bookaloo.visitors.models import Visitor
+
+
+class BookLoanBatchSerializer(serializers.Serializer):
+    visitor_identifier = serializers.CharField(write_only=True)
+    book_copy_identifiers = serializers.ListField(
+        child=serializers.CharField(),
+        min_length=1,
+        max_length=100,
+        write_only=True,
+        help_text=_("Identifiers of the book copies being borrowed."),
+    )
+    due_date = serializers.DateTimeField(
+        required=False,
+        allow_null=True,
+        write_only=True,
+    )
+    mode = serializers.ChoiceField(
+        choices=BatchMode.choices,
+        default=BatchMode.ATOMIC,
+        write_only=True,
+        help_text=_(
+            "With `atomic`, no book copy is lent out unless all of them can be; "
+            "with `best_effort`, the available ones are lent out anyway."
+        ),
+    )
+
+    def validate_due_date(self, value):
+        return BookLoanSerializer().validate_due_date(value)
+
+    def validate_visitor_identifier(self, value):
+        try:
+            visitor = Visitor.objects.get(identifier=value)
+        except Visitor.DoesNotExist as e:
+            msg = serializers.SlugRelatedField.default_error_messages[
+                "does_not_exist"
+            ].format(slug_name="identifier", value=value)
+            raise serializers.ValidationError(msg) from e
+        if not visitor.is_active:
+            msg = _("Visitor with identifier=%s is not active.") % visitor.identifier
+            raise serializers.ValidationError(msg)
+        return visitor
+
+
+class BookLoanBatchItemSerializer(serializers.Serializer):
+    detail_messages = {
+        BatchItemStatus.NOT_FOUND: _("Book copy does not exist."),
+        BatchItemStatus.NOT_AVAILABLE: _("Book copy is not available."),
+        BatchItemStatus.DUPLICATE: _("Book copy is listed more than once."),
+        BatchItemStatus.SKIPPED: _("Not lent out, as other book copies failed."),
+    }
+
+    book_copy_identifier = serializers.CharField()
+    status = serializers.ChoiceField(choices=BatchItemStatus.choices)
+    detail = serializers.SerializerMethodField()
+    book_loan = BookLoanSerializer(allow_null=True)
+
+    def get_detail(self, obj) -> str | None:
+        message = self.detail_messages.get(obj["status"])
+        return None if message is None else str(message)
+
+
+class BookLoanBatchResultSerializer(serializers.Serializer):
+    results = BookLoanBatchItemSerializer(many=True)
@@ -0,0 +1,10 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+
+class BookLoanExportQuerySerializer(serializers.Serializer):
+    since_id = serializers.IntegerField(
+        required=False,
+        min_value=0,
+        help_text=_("Only export the loans with a greater id."),
+    )
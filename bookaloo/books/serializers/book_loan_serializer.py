@@ -4,9 +4,14 @@ from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from bookaloo.books.circulation import BookCopyNotAvailable
+from bookaloo.books.circulation import checkout
+from bookaloo.books.circulation import get_book_copy_for_checkout
+from bookaloo.books.circulation import is_available_for
 from bookaloo.books.models import Author
 from bookaloo.books.models import BookCopy
 from bookaloo.books.models import BookLoan
+from bookaloo.books.serializers.fieldsets import SparseFieldsetMixin
 from bookaloo.visitors.models import Visitor
 
 
@@ -47,19 +52,9 @@ class BookLoanBookSerializer(serializers.ModelSerializer):
         ]
 
 
-class BookLoanSerializer(serializers.ModelSerializer):
-    book_copy_identifier = serializers.SlugRelatedField(
-        source="book_copy",
-        slug_field="identifier",
-        queryset=BookCopy.objects.all(),
-        write_only=True,
-    )
-    visitor_identifier = serializers.SlugRelatedField(
-        source="visitor",
-        slug_field="identifier",
-        queryset=Visitor.objects.all(),
-        write_only=True,
-    )
+class BookLoanSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    book_copy_identifier = serializers.CharField(write_only=True)
+    visitor_identifier = serializers.CharField(write_only=True)
     due_date = serializers.DateTimeField(
         required=False,
         allow_null=True,
@@ -84,28 +79,55 @@ class BookLoanSerializer(serializers.ModelSerializer):
         return value
 
     def validate(self, attrs):
+        book_copy_identifier = attrs.pop("book_copy_identifier")
+        visitor_identifier = attrs.pop("visitor_identifier")
+        book_copy, visitor = get_book_copy_for_checkout(
+            book_copy_identifier,
+            visitor_identifier,
+        )
+        errors = {}
+        if book_copy is None:
+            errors["book_copy_identifier"] = [
+                self.get_does_not_exist_message(book_copy_identifier),
+            ]
+        if visitor is None:
+            errors["visitor_identifier"] = [
+                self.get_does_not_exist_message(visitor_identifier),
+            ]
+        if errors:
+            raise serializers.ValidationError(errors)
         # Ensure that the visitor is active
-        if not attrs["visitor"].is_active:
-            identifier = attrs["visitor"].identifier
-            msg = _("Visitor with identifier=%s is not active.") % identifier
+        if not visitor.is_active:
+            msg = _("Visitor with identifier=%s is not active.") % visitor.identifier
             raise serializers.ValidationError({"visitor_identifier": [msg]})
-        # Ensure that the book copy is available
-        # NOTE: In case of data discrepancy, we also check for
-        #       any current loans for the book copy
-        book_copy = attrs["book_copy"]
-        active_loans_qs = BookLoan.objects.filter(
-            book_copy=book_copy,
-            return_date__isnull=True,
-        )
-        if not book_copy.is_available or active_loans_qs.exists():
-            msg = (
-                _("Book copy with identifier=%s is not available.")
-                % book_copy.identifier
-            )
-            raise serializers.ValidationError({"book_copy_identifier": [msg]})
-
+        # Ensure that the book copy is available (or held for the visitor)
+        # NOTE: Active loans of copies marked as available by mistake
+        #       are caught by a database constraint in `create`
+        if not is_available_for(book_copy, visitor):
+            raise self.get_not_available_error(book_copy)
+
+        attrs["book_copy"] = book_copy
+        attrs["visitor"] = visitor
         return attrs
 
+    def create(self, validated_data):
+        """
+        Checks the book copy out; see `bookaloo.books.circulation.checkout`.
+        """
+        try:
+            return checkout(**validated_data)
+        except BookCopyNotAvailable as e:
+            raise self.get_not_available_error(validated_data["book_copy"]) from e
+
+    def get_does_not_exist_message(self, value):
+        return serializers.SlugRelatedField.default_error_messages[
+            "does_not_exist"
+        ].format(slug_name="identifier", value=value)
+
+    def get_not_available_error(self, book_copy):
+        msg = _("Book copy with identifier=%s is not available.") % book_copy.identifier
+        return serializers.ValidationError({"book_copy_identifier": [msg]})
+
     class Meta:
         model = BookLoan
         fields = [
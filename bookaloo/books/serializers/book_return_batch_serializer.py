@@ -0,0 +1,36 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from bookaloo.books.enums import BatchItemStatus
+from bookaloo.books.enums import BookCondition
+
+
+class BookReturnBatchItemSerializer(serializers.Serializer):
+    book_copy_identifier = serializers.CharField(
+        help_text=_("Identifier of the book being returned."),
+    )
+    book_copy_condition = serializers.ChoiceField(
+        choices=BookCondition.choices,
+        required=False,
+        allow_null=True,
+        help_text=_("Condition of the book while being returned."),
+    )
+
+
+class BookReturnBatchSerializer(serializers.Serializer):
+    items: serializers.ListSerializer = serializers.ListSerializer(
+        child=BookReturnBatchItemSerializer(),
+        allow_empty=False,
+        max_length=500,
+        write_only=True,
+    )
+
+
+class BookReturnBatchItemResultSerializer(serializers.Serializer):
+    book_copy_identifier = serializers.CharField()
+    status = serializers.ChoiceField(choices=BatchItemStatus.choices)
+    book_loan_id = serializers.IntegerField(source="book_loan.pk", allow_null=True)
+
+
+class BookReturnBatchResultSerializer(serializers.Serializer):
+    results = BookReturnBatchItemResultSerializer(many=True)
@@ -5,6 +5,10 @@ from rest_framework import serializers
 from bookaloo.books.enums import BookCondition
 from bookaloo.books.models import BookCopy
 from bookaloo.books.models import BookLoan
+from bookaloo.books.reservations import allocate_returned_copies
+from bookaloo.books.reservations import has_waiting_reservations
+from bookaloo.metrics import RETURN
+from bookaloo.metrics import record_loan_operations
 
 
 class BookReturnSerializer(serializers.ModelSerializer):
@@ -26,9 +30,20 @@ class BookReturnSerializer(serializers.ModelSerializer):
     def to_internal_value(self, data):
         internal_value = super().to_internal_value(data)
         try:
-            book_loan = BookLoan.objects.get(
-                book_copy=internal_value["book_copy"],
-                return_date__isnull=True,
+            # NOTE: Locked, so that a repeated return of the copy waits for
+            #       this one, and doesn't hold the copy a second time
+            book_loan = (
+                BookLoan.objects.select_for_update(of=("self", "book_copy"))
+                .select_related("book_copy")
+                .annotate(
+                    has_waiting_reservations=has_waiting_reservations(
+                        "book_copy__book_edition",
+                    ),
+                )
+                .get(
+                    book_copy=internal_value["book_copy"],
+                    return_date__isnull=True,
+                )
             )
         except BookLoan.DoesNotExist as e:
             msg = _("That book copy has already been returned.")
@@ -40,7 +55,6 @@ class BookReturnSerializer(serializers.ModelSerializer):
         book_loan = self.validated_data["book_loan"]
         book_copy = book_loan.book_copy
         book_loan.return_date = now()
-        book_copy.is_available = True
         book_copy.condition = (
             self.validated_data.get(
                 "book_copy_condition",
@@ -48,8 +62,12 @@ class BookReturnSerializer(serializers.ModelSerializer):
             )
             or book_copy.condition
         )
-        book_loan.save()
-        book_copy.save()
+        book_loan.save(update_fields=["return_date"])
+        # NOTE: Copies of reserved books are held for the next visitor,
+        #       see `bookaloo.books.reservations`
+        book_copy.is_available = not allocate_returned_copies([book_loan])
+        book_copy.save(update_fields=["is_available", "condition"])
+        record_loan_operations(RETURN)
 
     class Meta:
         model = BookLoan
@@ -2,14 +2,19 @@ from rest_framework import serializers
 
 from bookaloo.books.models import Book
 from bookaloo.books.serializers.author_serializer import AuthorSerializer
+from bookaloo.books.serializers.fieldsets import SparseFieldsetMixin
 
 
 class BookCopiesInlineSerializer(serializers.Serializer):
+    """
+    Reads the denormalized copy counters of a book or a book edition.
+    """
+
     total = serializers.IntegerField(source="copies_count_total")
     available = serializers.IntegerField(source="copies_count_available")
 
 
-class BookSerializer(serializers.ModelSerializer):
+class BookSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     author = AuthorSerializer(read_only=True)
     copies_count = BookCopiesInlineSerializer(
         source="*",
@@ -18,4 +23,8 @@ class BookSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Book
-        fields = "__all__"
+        exclude = [
+            "copies_count_total",
+            "copies_count_available",
+            "search_vector",
+        ]
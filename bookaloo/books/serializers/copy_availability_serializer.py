@@ -0,0 +1,32 @@
+from rest_framework import serializers
+
+from bookaloo.books.enums import BookCondition
+
+
+class ConditionAvailabilitySerializer(serializers.Serializer):
+    condition = serializers.ChoiceField(choices=BookCondition.choices)
+    total = serializers.IntegerField()
+    available = serializers.IntegerField()
+
+
+class EditionAvailabilitySerializer(serializers.Serializer):
+    """
+    Serializes availability summaries, see `bookaloo.books.availability`.
+    """
+
+    book_edition = serializers.IntegerField()
+    total = serializers.IntegerField()
+    available = serializers.IntegerField()
+    conditions = ConditionAvailabilitySerializer(many=True)
+
+
+class BookAvailabilitySerializer(serializers.Serializer):
+    """
+    Serializes availability summaries, see `bookaloo.books.availability`.
+    """
+
+    book = serializers.IntegerField()
+    total = serializers.IntegerField()
+    available = serializers.IntegerField()
+    conditions = ConditionAvailabilitySerializer(many=True)
+    editions = EditionAvailabilitySerializer(many=True)
@@ -0,0 +1,69 @@
+from typing import TYPE_CHECKING
+
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+if TYPE_CHECKING:
+
+    class _Serializer(serializers.Serializer): ...
+else:
+    _Serializer = object
+
+FIELDS_QUERY_PARAM = "fields"
+EXCLUDE_QUERY_PARAM = "exclude"
+
+
+def parse_field_names(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def get_sparse_fieldset(request):
+    """
+    Returns the `(fields, exclude)` field names requested with
+    the `?fields=a,b` and `?exclude=c` query parameters.
+
+    `fields` is `None` if all fields are requested. Both are ignored
+    for unsafe methods, as their serializers validate the input, too.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None, set()
+    fields = request.query_params.get(FIELDS_QUERY_PARAM)
+    exclude = request.query_params.get(EXCLUDE_QUERY_PARAM, "")
+    return (
+        parse_field_names(fields) if fields is not None else None,
+        parse_field_names(exclude),
+    )
+
+
+def is_field_requested(request, field_name):
+    fields, exclude = get_sparse_fieldset(request)
+    if fields is not None and field_name not in fields:
+        return False
+    return field_name not in exclude
+
+
+class SparseFieldsetMixin(_Serializer):
+    """
+    Lets clients narrow down the top-level fields of the response
+    with the `?fields=` and `?exclude=` query parameters.
+
+    Unknown field names are ignored. Nested serializers always
+    render all of their fields.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.is_root():
+            return fields
+        request = self.context.get("request")
+        return {
+            name: field
+            for name, field in fields.items()
+            if is_field_requested(request, name)
+        }
+
+    def is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 
 from bookaloo.books.models import Publisher
+from bookaloo.books.serializers.fieldsets import SparseFieldsetMixin
 
 
-class PublisherSerializer(serializers.ModelSerializer):
+class PublisherSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Publisher
         fields = "__all__"
@@ -0,0 +1,86 @@
+from django.db import IntegrityError
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from bookaloo.books.circulation import is_constraint_violation
+from bookaloo.books.models import Book
+from bookaloo.books.models import Reservation
+from bookaloo.books.reservations import ACTIVE_RESERVATION_CONSTRAINT
+from bookaloo.books.reservations import get_position
+from bookaloo.visitors.models import Visitor
+
+
+class ReservationSerializer(serializers.ModelSerializer):
+    book_id = serializers.PrimaryKeyRelatedField(
+        source="book",
+        queryset=Book.objects.all(),
+        help_text=_("Id of the reserved book."),
+    )
+    visitor_identifier = serializers.SlugRelatedField(
+        source="visitor",
+        slug_field="identifier",
+        queryset=Visitor.objects.all(),
+        help_text=_("Identifier of the visitor reserving the book."),
+    )
+    book_copy_identifier = serializers.CharField(
+        source="book_copy.identifier",
+        read_only=True,
+        allow_null=True,
+        help_text=_("Identifier of the copy held for the visitor, once ready."),
+    )
+    position = serializers.SerializerMethodField(
+        help_text=_("Position in the book's queue, while waiting."),
+    )
+    estimated_available_at = serializers.DateTimeField(
+        read_only=True,
+        allow_null=True,
+        help_text=_(
+            "Estimated date and time when a copy will be held for the visitor, "
+            "while waiting; based on the due dates of the book's loans."
+        ),
+    )
+
+    def get_position(self, obj) -> int | None:
+        return get_position(obj)
+
+    def validate(self, attrs):
+        book = attrs["book"]
+        visitor = attrs["visitor"]
+        if not visitor.is_active:
+            msg = _("Visitor with identifier=%s is not active.") % visitor.identifier
+            raise serializers.ValidationError({"visitor_identifier": [msg]})
+        if book.copies_count_available:
+            msg = _("Book with id=%s has available copies.") % book.pk
+            raise serializers.ValidationError({"book_id": [msg]})
+        return attrs
+
+    def create(self, validated_data):
+        """
+        Adds the visitor to the end of the book's queue; relies on
+        the `unique_active_reservation_per_visitor` constraint to reject
+        visitors already in it.
+        """
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError as e:
+            if not is_constraint_violation(e, ACTIVE_RESERVATION_CONSTRAINT):
+                raise
+            msg = _("The visitor has already reserved this book.")
+            raise serializers.ValidationError({"book_id": [msg]}) from e
+
+    class Meta:
+        model = Reservation
+        fields = [
+            "id",
+            "book_id",
+            "visitor_identifier",
+            "status",
+            "created_at",
+            "book_copy_identifier",
+            "allocated_at",
+            "position",
+            "estimated_available_at",
+        ]
+        read_only_fields = ["status", "created_at", "allocated_at"]
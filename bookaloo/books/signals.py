@@ -0,0 +1,63 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from bookaloo.books.cache import MODEL_RESOURCES
+from bookaloo.books.cache import bump_cache_generations
+from bookaloo.books.models import Author
+from bookaloo.books.models import Book
+from bookaloo.books.models import BookCopy
+from bookaloo.books.models import BookEdition
+from bookaloo.books.models import Publisher
+from bookaloo.books.search import refresh_search_vectors
+
+
+@receiver(post_save, sender=Author)
+def refresh_author_search_vectors(sender, instance, update_fields, **kwargs):
+    if kwargs["created"] or not instance.has_search_document_changed(update_fields):
+        return
+    refresh_search_vectors(Book.objects.filter(author=instance))
+    refresh_search_vectors(BookEdition.objects.filter(book__author=instance))
+    refresh_search_vectors(BookCopy.objects.filter(book_edition__book__author=instance))
+
+
+@receiver(post_save, sender=Publisher)
+def refresh_publisher_search_vectors(sender, instance, update_fields, **kwargs):
+    if kwargs["created"] or not instance.has_search_document_changed(update_fields):
+        return
+    refresh_search_vectors(BookEdition.objects.filter(publisher=instance))
+    refresh_search_vectors(BookCopy.objects.filter(book_edition__publisher=instance))
+
+
+@receiver(post_save, sender=Book)
+def refresh_book_search_vectors(sender, instance, created, update_fields, **kwargs):
+    if not created and not instance.has_search_document_changed(update_fields):
+        return
+    refresh_search_vectors(Book.objects.filter(pk=instance.pk))
+    if not created:
+        refresh_search_vectors(BookEdition.objects.filter(book=instance))
+        refresh_search_vectors(BookCopy.objects.filter(book_edition__book=instance))
+
+
+@receiver(post_save, sender=BookEdition)
+def refresh_edition_search_vectors(sender, instance, created, update_fields, **kwargs):
+    if not created and not instance.has_search_document_changed(update_fields):
+        return
+    refresh_search_vectors(BookEdition.objects.filter(pk=instance.pk))
+    if not created:
+        refresh_search_vectors(BookCopy.objects.filter(book_edition=instance))
+
+
+@receiver(post_save, sender=BookCopy)
+def refresh_copy_search_vectors(sender, instance, created, update_fields, **kwargs):
+    if not created and not instance.has_search_document_changed(update_fields):
+        return
+    refresh_search_vectors(BookCopy.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_model_cache_generation(sender, **kwargs):
+    resource = MODEL_RESOURCES.get(sender)
+    if resource is not None:
+        bump_cache_generations(resource)
@@ -0,0 +1,62 @@
+from functools import partial
+from itertools import batched
+
+from django.db import transaction
+from django.utils.timezone import now
+
+from bookaloo.books.overdue import OVERDUE_BATCH_SIZE
+from bookaloo.books.overdue import OVERDUE_NOTICE_CHUNK_SIZE
+from bookaloo.books.overdue import iter_overdue_loan_batches
+from bookaloo.books.overdue import mark_loans_overdue
+from bookaloo.books.overdue import send_overdue_notices
+from bookaloo.books.reminders import DUE_REMINDER_DAYS
+from bookaloo.books.reminders import DUE_REMINDER_SHARDS
+from bookaloo.books.reminders import get_visitor_ranges
+from bookaloo.books.reminders import remind_visitors
+from config import celery_app
+
+
+@celery_app.task()
+def scan_overdue_loans(
+    batch_size=OVERDUE_BATCH_SIZE,
+    chunk_size=OVERDUE_NOTICE_CHUNK_SIZE,
+):
+    """
+    Flags the loans that became overdue and enqueues their notices.
+    Returns the number of flagged loans.
+    """
+    overdue_at = now()
+    flagged = 0
+    for batch in iter_overdue_loan_batches(overdue_at, batch_size):
+        # NOTE: Ordered by visitor, so that their loans share a notice
+        loan_ids = [
+            loan_id for loan_id, _visitor_id in sorted(batch, key=lambda row: row[1])
+        ]
+        with transaction.atomic():
+            flagged += mark_loans_overdue(loan_ids, overdue_at)
+            for chunk in batched(loan_ids, chunk_size):
+                transaction.on_commit(
+                    partial(notify_overdue_loans.delay, list(chunk)),
+                )
+    return flagged
+
+
+@celery_app.task()
+def notify_overdue_loans(loan_ids):
+    return send_overdue_notices(loan_ids)
+
+
+@celery_app.task()
+def schedule_due_reminders(days=DUE_REMINDER_DAYS, shards=DUE_REMINDER_SHARDS):
+    """
+    Enqueues a reminders task per range of visitor ids.
+    """
+    ranges = get_visitor_ranges(days, shards)
+    for start, stop in ranges:
+        send_due_reminders.delay(start, stop, days)
+    return len(ranges)
+
+
+@celery_app.task()
+def send_due_reminders(start, stop, days=DUE_REMINDER_DAYS):
+    return remind_visitors(start, stop, days)
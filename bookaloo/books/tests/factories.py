@@ -65,3 +65,11 @@ class BookLoanFactory(DjangoModelFactory):
 
     class Meta:
         model = models.BookLoan
+
+
+class ReservationFactory(DjangoModelFactory):
+    book = SubFactory(BookFactory)
+    visitor = SubFactory("bookaloo.visitors.tests.factories.VisitorFactory")
+
+    class Meta:
+        model = models.Reservation
@@ -0,0 +1,158 @@
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.sync import iscoroutinefunction
+from django.test import AsyncClient
+from django.urls import resolve
+from django.urls import reverse_lazy
+from rest_framework import status
+
+from bookaloo.books.benchmarks import reload_urls
+from bookaloo.books.tests.factories import AuthorFactory
+from bookaloo.books.tests.factories import BookFactory
+from bookaloo.books.tests.factories import BookLoanFactory
+
+
+@pytest.fixture
+def async_views():
+    # NOTE: Views are made async when the URLs are loaded
+    reload_urls(async_views=True)
+    yield
+    reload_urls(async_views=False)
+
+
+@pytest.fixture
+def async_client(async_views):
+    client = AsyncClient()
+
+    def request(method, *args, **kwargs):
+        return async_to_sync(getattr(client, method))(*args, **kwargs)
+
+    return request
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+    books_url = reverse_lazy("books:books-list")
+
+    @pytest.mark.parametrize(
+        ("url", "is_async"),
+        [
+            ("/books/", True),
+            ("/books/authors/1/", True),
+            ("/books/1/editions/2/copies/", True),
+            ("/books/loans", True),
+            ("/books/loans/batch", False),
+        ],
+    )
+    def test__resolved_views(self, async_views, url, is_async):
+        # WHEN
+        resolved = resolve(url)
+
+        # THEN
+        assert iscoroutinefunction(resolved.func) == is_async
+
+    def test__list(self, anonymous_client, async_client, django_assert_num_queries):
+        # GIVEN
+        BookFactory.create_batch(3)
+        expected = anonymous_client.get(self.books_url).json()
+
+        # WHEN
+        with django_assert_num_queries(2):
+            response = async_client("get", self.books_url)
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == expected
+
+    def test__list__keyset_pagination(self, async_client):
+        # GIVEN
+        books = sorted(BookFactory.create_batch(3), key=lambda book: book.title)
+
+        # WHEN
+        first_page = async_client(
+            "get",
+            self.books_url,
+            {"pagination": "cursor", "page_size": 2},
+        ).json()
+        second_page = async_client("get", first_page["next"]).json()
+
+        # THEN
+        titles = [book["title"] for book in first_page["results"]]
+        titles += [book["title"] for book in second_page["results"]]
+        assert titles == [book.title for book in books]
+        assert second_page["next"] is None
+
+    def test__retrieve(self, async_client):
+        # GIVEN
+        book = BookFactory()
+
+        # WHEN
+        response = async_client("get", f"{self.books_url}{book.pk}/")
+        missing_response = async_client("get", f"{self.books_url}{book.pk + 1}/")
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["title"] == book.title
+        assert missing_response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test__cached(self, settings, async_client):
+        # GIVEN
+        settings.API_CACHE_ENABLED = True
+        settings.API_CONDITIONAL_GET_ENABLED = True
+        BookFactory()
+
+        # WHEN
+        first_response = async_client("get", self.books_url)
+        second_response = async_client("get", self.books_url)
+        not_modified_response = async_client(
+            "get",
+            self.books_url,
+            headers={"If-None-Match": first_response["ETag"]},
+        )
+
+        # THEN
+        assert first_response["X-Cache"] == "MISS"
+        assert second_response["X-Cache"] == "HIT"
+        assert second_response.json() == first_response.json()
+        assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test__loans_list(self, async_client):
+        # GIVEN
+        book_loans = BookLoanFactory.create_batch(2)
+
+        # WHEN
+        response = async_client("get", reverse_lazy("books:book-loans"))
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert {loan["id"] for loan in response.json()["results"]} == {
+            book_loan.pk for book_loan in book_loans
+        }
+
+    def test__writes_stay_sync(self, async_client):
+        # GIVEN
+        author = AuthorFactory()
+
+        # WHEN
+        response = async_client(
+            "patch",
+            reverse_lazy("books:authors-detail", args=[author.pk]),
+            data={"full_name": "J.R.R. Tolkien"},
+            content_type="application/json",
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        author.refresh_from_db()
+        assert author.full_name == "J.R.R. Tolkien"
+
+    def test__server_timing(self, settings, async_views):
+        # GIVEN
+        settings.SERVER_TIMING_SAMPLE_RATE = 1.0
+        BookFactory()
+
+        # WHEN
+        response = async_to_sync(AsyncClient().get)(self.books_url)
+
+        # THEN
+        assert 'desc="2 queries"' in response["Server-Timing"]
@@ -0,0 +1,107 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from bookaloo.books.benchmarks import BENCHMARK_SCENARIOS
+from bookaloo.books.benchmarks import find_regressions
+from bookaloo.books.benchmarks import run_benchmarks
+from bookaloo.books.benchmarks import run_concurrency_benchmark
+
+BASELINE = {
+    "small": {
+        "books-list": {"queries": 4, "p50_ms": 8.0, "p95_ms": 20.0, "bytes": 1000},
+    },
+}
+
+
+@pytest.mark.django_db
+def test__run_benchmarks(client):
+    # GIVEN
+    call_command(
+        "generate_dataset",
+        "--books=20",
+        "--authors=5",
+        "--publishers=2",
+        "--visitors=5",
+        "--copies-per-edition=2",
+        "--loans-per-copy=2",
+        "--workers=1",
+        stdout=StringIO(),
+    )
+
+    # WHEN
+    results = run_benchmarks(client, iterations=2)
+
+    # THEN
+    assert list(results) == [name for name, *_rest in BENCHMARK_SCENARIOS]
+    assert results["books-list"]["queries"] == 2  # noqa: PLR2004
+    assert all(result["bytes"] > 0 for result in results.values())
+    assert all(0 < result["p50_ms"] <= result["p95_ms"] for result in results.values())
+
+
+# NOTE: Requests are served in threads of their own,
+#       which only see committed data
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("interface", ["wsgi", "asgi"])
+def test__run_concurrency_benchmark(settings, interface):
+    # GIVEN
+    settings.ALLOWED_HOSTS = ["testserver"]
+    call_command(
+        "generate_dataset",
+        "--books=5",
+        "--authors=2",
+        "--publishers=1",
+        "--visitors=2",
+        "--workers=1",
+        stdout=StringIO(),
+    )
+
+    # WHEN
+    result = run_concurrency_benchmark(
+        interface,
+        concurrency=4,
+        workers=2,
+        requests=20,
+        stall_ms=1,
+    )
+
+    # THEN
+    assert result["errors"] == 0
+    assert result["requests_per_second"] > 0
+    assert 0 < result["p50_ms"] <= result["p95_ms"]
+    assert settings.ASYNC_VIEWS is False
+
+
+@pytest.mark.parametrize(
+    ("result", "regression"),
+    [
+        ({"queries": 4, "p50_ms": 9.0, "p95_ms": 29.0, "bytes": 1090}, None),
+        ({"queries": 5, "p50_ms": 8.0, "p95_ms": 20.0, "bytes": 1000}, "5 queries"),
+        ({"queries": 4, "p50_ms": 8.0, "p95_ms": 31.0, "bytes": 1000}, "p95 of 31.0"),
+        ({"queries": 4, "p50_ms": 8.0, "p95_ms": 20.0, "bytes": 1200}, "1200 bytes"),
+    ],
+)
+def test__find_regressions(result, regression):
+    # WHEN
+    regressions = find_regressions(BASELINE, {"small": {"books-list": result}})
+
+    # THEN
+    if regression is None:
+        assert regressions == []
+    else:
+        assert len(regressions) == 1
+        assert regressions[0].startswith(f"small/books-list: {regression}")
+
+
+def test__find_regressions_latency_floor():
+    # GIVEN
+    baseline = {"small": {"books-list": {**BASELINE["small"]["books-list"]}}}
+    baseline["small"]["books-list"]["p95_ms"] = 2.0
+    result = {"queries": 4, "p50_ms": 3.0, "p95_ms": 6.5, "bytes": 1000}
+
+    # WHEN
+    regressions = find_regressions(baseline, {"small": {"books-list": result}})
+
+    # THEN
+    assert regressions == []
@@ -0,0 +1,208 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse_lazy
+from freezegun import freeze_time
+from rest_framework import status
+
+from bookaloo.books.cache import BOOKS
+from bookaloo.books.tests.factories import AuthorFactory
+from bookaloo.books.tests.factories import BookCopyFactory
+from bookaloo.visitors.tests.factories import VisitorFactory
+
+
+@pytest.fixture(autouse=True)
+def _api_cache(settings):
+    settings.API_CACHE_ENABLED = True
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestCachedResponseMixin:
+    books_url = reverse_lazy("books:books-list")
+    authors_url = reverse_lazy("books:authors-list")
+
+    def test__hit_and_miss(self, anonymous_client, django_assert_num_queries):
+        # GIVEN
+        AuthorFactory.create_batch(2)
+
+        # WHEN
+        first_response = anonymous_client.get(self.authors_url)
+        with django_assert_num_queries(0):
+            second_response = anonymous_client.get(self.authors_url)
+        other_response = anonymous_client.get(self.authors_url, data={"page": 1})
+
+        # THEN
+        assert first_response["X-Cache"] == "MISS"
+        assert second_response["X-Cache"] == "HIT"
+        assert other_response["X-Cache"] == "MISS"
+        assert second_response.json() == first_response.json()
+
+    def test__disabled(self, anonymous_client, settings):
+        # GIVEN
+        settings.API_CACHE_ENABLED = False
+
+        # WHEN
+        anonymous_client.get(self.authors_url)
+        response = anonymous_client.get(self.authors_url)
+
+        # THEN
+        assert "X-Cache" not in response
+
+    def test__invalidated_by_related_write(
+        self,
+        anonymous_client,
+        django_capture_on_commit_callbacks,
+    ):
+        # GIVEN
+        author = AuthorFactory(full_name="Stanislaw Lem")
+        BookCopyFactory(book_edition__book__author=author)
+        anonymous_client.get(self.books_url)
+
+        # WHEN
+        with django_capture_on_commit_callbacks(execute=True):
+            author.full_name = "Stanisław Lem"
+            author.save()
+        response = anonymous_client.get(self.books_url)
+
+        # THEN
+        assert response["X-Cache"] == "MISS"
+        assert response.json()["results"][0]["author"]["full_name"] == ("Stanisław Lem")
+
+    @pytest.mark.parametrize(
+        argnames=("viewname", "data_key"),
+        argvalues=[
+            pytest.param("books:book-loans", "book_copy_identifier", id="loan"),
+            pytest.param(
+                "books:book-loans-batch",
+                "book_copy_identifiers",
+                id="batch_loan",
+            ),
+        ],
+    )
+    def test__invalidated_by_loan(
+        self,
+        anonymous_client,
+        django_capture_on_commit_callbacks,
+        viewname,
+        data_key,
+    ):
+        # GIVEN
+        book_copy = BookCopyFactory()
+        identifier = book_copy.identifier
+        anonymous_client.get(self.books_url)
+
+        # WHEN
+        with django_capture_on_commit_callbacks(execute=True):
+            response = anonymous_client.post(
+                reverse_lazy(viewname),
+                data={
+                    "visitor_identifier": VisitorFactory().identifier,
+                    data_key: [identifier] if data_key.endswith("s") else identifier,
+                },
+                format="json",
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+        response = anonymous_client.get(self.books_url)
+
+        # THEN
+        assert response["X-Cache"] == "MISS"
+        assert response.json()["results"][0]["copies_count"] == {
+            "total": 1,
+            "available": 0,
+        }
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    url = reverse_lazy("books:books-list")
+
+    @pytest.fixture(autouse=True)
+    def _conditional_get(self, settings):
+        settings.API_CACHE_ENABLED = False
+        settings.API_CONDITIONAL_GET_ENABLED = True
+
+    def test__if_none_match(self, anonymous_client, django_assert_num_queries):
+        # GIVEN
+        BookCopyFactory()
+        response = anonymous_client.get(self.url)
+        etag = response["ETag"]
+
+        # WHEN
+        with django_assert_num_queries(0):
+            not_modified = anonymous_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        other_page = anonymous_client.get(
+            self.url,
+            data={"page": 1},
+            HTTP_IF_NONE_MATCH=etag,
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not_modified["ETag"] == etag
+        assert other_page.status_code == status.HTTP_200_OK
+        assert other_page["ETag"] != etag
+
+    def test__if_modified_since(self, anonymous_client):
+        # GIVEN
+        with freeze_time("2026-03-02 10:00:00.250") as frozen_time:
+            anonymous_client.get(self.url)
+            frozen_time.tick(2)
+            last_modified = anonymous_client.get(self.url)["Last-Modified"]
+
+            # WHEN
+            response = anonymous_client.get(
+                self.url,
+                HTTP_IF_MODIFIED_SINCE=last_modified,
+            )
+
+        # THEN
+        assert last_modified == "Mon, 02 Mar 2026 10:00:01 GMT"
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test__no_last_modified_within_the_second_of_a_write(
+        self,
+        anonymous_client,
+        django_capture_on_commit_callbacks,
+    ):
+        # GIVEN
+        book_copy = BookCopyFactory()
+        with freeze_time("2026-03-02 10:00:00.250") as frozen_time:
+            response = anonymous_client.get(self.url)
+
+            # WHEN
+            with django_capture_on_commit_callbacks(execute=True):
+                book_copy.is_available = False
+                book_copy.save()
+            frozen_time.tick(0.5)
+            after_write = anonymous_client.get(
+                self.url,
+                HTTP_IF_MODIFIED_SINCE="Mon, 02 Mar 2026 10:00:01 GMT",
+            )
+
+        # THEN
+        assert "Last-Modified" not in response
+        assert after_write.status_code == status.HTTP_200_OK
+        assert "Last-Modified" not in after_write
+        assert after_write["ETag"] != response["ETag"]
+
+    def test__changed_after_write(
+        self,
+        anonymous_client,
+        django_capture_on_commit_callbacks,
+    ):
+        # GIVEN
+        book_copy = BookCopyFactory()
+        etag = anonymous_client.get(self.url)["ETag"]
+
+        # WHEN
+        with django_capture_on_commit_callbacks(execute=True):
+            book_copy.is_available = False
+            book_copy.save()
+        response = anonymous_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
@@ -0,0 +1,272 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError
+from django.core.management import call_command
+from django.urls import reverse_lazy
+from rest_framework import status
+
+from bookaloo.books.counters import find_copy_availability_drift
+from bookaloo.books.enums import BookCondition
+from bookaloo.books.models import Book
+from bookaloo.books.models import BookEdition
+from bookaloo.books.models import CopyAvailability
+from bookaloo.books.tests.factories import BookCopyFactory
+from bookaloo.books.tests.factories import BookEditionFactory
+from bookaloo.books.tests.factories import BookFactory
+from bookaloo.visitors.tests.factories import VisitorFactory
+
+
+def get_counters(obj):
+    obj.refresh_from_db()
+    return obj.copies_count_total, obj.copies_count_available
+
+
+def get_availability(edition):
+    return {
+        (row.book_id, row.condition): (
+            row.copies_count_total,
+            row.copies_count_available,
+        )
+        for row in CopyAvailability.objects.filter(book_edition=edition)
+    }
+
+
+@pytest.mark.django_db
+class TestCopyCounters:
+    def test__copy_create_and_delete(self):
+        # GIVEN
+        edition = BookEditionFactory()
+        book = edition.book
+
+        # WHEN
+        copy = BookCopyFactory(book_edition=edition)
+        BookCopyFactory(book_edition=edition, is_available=False)
+
+        # THEN
+        assert get_counters(edition) == (2, 1)
+        assert get_counters(book) == (2, 1)
+
+        # WHEN
+        copy.delete()
+
+        # THEN
+        assert get_counters(edition) == (1, 0)
+        assert get_counters(book) == (1, 0)
+
+    def test__copy_move(self):
+        # GIVEN
+        source_edition = BookEditionFactory()
+        target_edition = BookEditionFactory()
+        copy = BookCopyFactory(book_edition=source_edition)
+
+        # WHEN
+        copy.book_edition = target_edition
+        copy.save()
+
+        # THEN
+        assert get_counters(source_edition) == (0, 0)
+        assert get_counters(source_edition.book) == (0, 0)
+        assert get_counters(target_edition) == (1, 1)
+        assert get_counters(target_edition.book) == (1, 1)
+
+    def test__edition_move(self):
+        # GIVEN
+        edition = BookEditionFactory()
+        source_book = edition.book
+        target_book = BookFactory()
+        BookCopyFactory.create_batch(2, book_edition=edition)
+
+        # WHEN
+        edition.refresh_from_db()
+        edition.book = target_book
+        edition.save()
+
+        # THEN
+        assert get_counters(edition) == (2, 2)
+        assert get_counters(source_book) == (0, 0)
+        assert get_counters(target_book) == (2, 2)
+
+    def test__stale_instance_save_keeps_counters(self):
+        # GIVEN
+        book = BookFactory()
+        stale_book = Book.objects.get(pk=book.pk)
+        BookCopyFactory(book_edition__book=book)
+
+        # WHEN
+        stale_book.title = "New title"
+        stale_book.save()
+
+        # THEN
+        assert get_counters(book) == (1, 1)
+
+    def test__loan_and_return(self, anonymous_client):
+        # GIVEN
+        copy = BookCopyFactory()
+        edition = copy.book_edition
+
+        # WHEN
+        response = anonymous_client.post(
+            reverse_lazy("books:book-loans"),
+            data={
+                "book_copy_identifier": copy.identifier,
+                "visitor_identifier": VisitorFactory().identifier,
+            },
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_201_CREATED
+        assert get_counters(edition) == (1, 0)
+        assert get_counters(edition.book) == (1, 0)
+
+        # WHEN
+        response = anonymous_client.post(
+            reverse_lazy("books:book-returns"),
+            data={"book_copy_identifier": copy.identifier},
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert get_counters(edition) == (1, 1)
+        assert get_counters(edition.book) == (1, 1)
+
+    def test__availability__copy_create_move_and_delete(self):
+        # GIVEN
+        edition = BookEditionFactory()
+        target_edition = BookEditionFactory()
+        book = edition.book
+
+        # WHEN
+        copy = BookCopyFactory(book_edition=edition, condition=BookCondition.GOOD)
+        BookCopyFactory(
+            book_edition=edition,
+            condition=BookCondition.POOR,
+            is_available=False,
+        )
+
+        # THEN
+        assert get_availability(edition) == {
+            (book.pk, BookCondition.GOOD): (1, 1),
+            (book.pk, BookCondition.POOR): (1, 0),
+        }
+
+        # WHEN
+        copy.book_edition = target_edition
+        copy.save()
+
+        # THEN
+        assert get_availability(edition)[book.pk, BookCondition.GOOD] == (0, 0)
+        assert get_availability(target_edition) == {
+            (target_edition.book_id, BookCondition.GOOD): (1, 1),
+        }
+
+        # WHEN
+        copy.delete()
+
+        # THEN
+        assert get_availability(target_edition) == {
+            (target_edition.book_id, BookCondition.GOOD): (0, 0),
+        }
+        assert find_copy_availability_drift(Book.objects.values("pk")) == {}
+
+    def test__availability__edition_move(self):
+        # GIVEN
+        edition = BookEditionFactory()
+        target_book = BookFactory()
+        BookCopyFactory.create_batch(2, book_edition=edition)
+
+        # WHEN
+        edition.refresh_from_db()
+        edition.book = target_book
+        edition.save()
+
+        # THEN
+        assert get_availability(edition) == {
+            (target_book.pk, BookCondition.VERY_GOOD): (2, 2),
+        }
+
+    def test__availability__loan_and_return_with_condition(self, anonymous_client):
+        # GIVEN
+        copy = BookCopyFactory(condition=BookCondition.GOOD)
+        edition = copy.book_edition
+
+        # WHEN
+        anonymous_client.post(
+            reverse_lazy("books:book-loans"),
+            data={
+                "book_copy_identifier": copy.identifier,
+                "visitor_identifier": VisitorFactory().identifier,
+            },
+        )
+
+        # THEN
+        assert get_availability(edition) == {
+            (edition.book_id, BookCondition.GOOD): (1, 0),
+        }
+
+        # WHEN
+        response = anonymous_client.post(
+            reverse_lazy("books:book-returns"),
+            data={
+                "book_copy_identifier": copy.identifier,
+                "book_copy_condition": BookCondition.POOR,
+            },
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert get_availability(edition) == {
+            (edition.book_id, BookCondition.GOOD): (0, 0),
+            (edition.book_id, BookCondition.POOR): (1, 1),
+        }
+
+
+@pytest.mark.django_db
+class TestRebuildCopyCountersCommand:
+    def test__check__in_sync(self):
+        # GIVEN
+        BookCopyFactory.create_batch(2)
+        out = StringIO()
+
+        # WHEN
+        call_command("rebuild_copy_counters", "--check", stdout=out)
+
+        # THEN
+        assert "in sync" in out.getvalue()
+
+    def test__check__drift_and_rebuild(self):
+        # GIVEN
+        copy = BookCopyFactory()
+        BookCopyFactory(book_edition=copy.book_edition, is_available=False)
+        BookEdition.objects.update(copies_count_total=10)
+        Book.objects.update(copies_count_available=0)
+
+        # WHEN / THEN
+        with pytest.raises(CommandError):
+            call_command("rebuild_copy_counters", "--check", stdout=StringIO())
+
+        # WHEN
+        call_command("rebuild_copy_counters", "--batch-size=1", stdout=StringIO())
+
+        # THEN
+        assert get_counters(copy.book_edition) == (2, 1)
+        assert get_counters(copy.book_edition.book) == (2, 1)
+        call_command("rebuild_copy_counters", "--check", stdout=StringIO())
+
+    def test__check__availability_drift_and_rebuild(self):
+        # GIVEN
+        copy = BookCopyFactory(condition=BookCondition.GOOD)
+        CopyAvailability.objects.update(copies_count_available=0)
+
+        # WHEN / THEN
+        with pytest.raises(CommandError):
+            call_command("rebuild_copy_counters", "--check", stdout=StringIO())
+
+        # WHEN
+        call_command("rebuild_copy_counters", stdout=StringIO())
+
+        # THEN
+        assert get_availability(copy.book_edition) == {
+            (copy.book_edition.book_id, BookCondition.GOOD): (1, 1),
+        }
+        call_command("rebuild_copy_counters", "--check", stdout=StringIO())
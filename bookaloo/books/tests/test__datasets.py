@@ -0,0 +1,117 @@
+from io import StringIO
+from itertools import pairwise
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from bookaloo.books.counters import find_copy_availability_drift
+from bookaloo.books.counters import find_copy_counters_drift
+from bookaloo.books.datasets import DATASET_MODELS
+from bookaloo.books.datasets import get_identifier
+from bookaloo.books.models import Book
+from bookaloo.books.models import BookCopy
+from bookaloo.books.models import BookEdition
+from bookaloo.books.models import BookLoan
+from bookaloo.books.tests.factories import AuthorFactory
+from bookaloo.visitors.models import Visitor
+
+DATASET_OPTIONS = [
+    "--publishers=3",
+    "--authors=5",
+    "--books=12",
+    "--editions-per-book=2",
+    "--copies-per-edition=2",
+    "--visitors=7",
+    "--loans-per-copy=3",
+    "--active-loan-ratio=0.5",
+    "--until=2025-01-01",
+    "--workers=1",
+]
+
+
+def generate_dataset(*args):
+    out = StringIO()
+    call_command("generate_dataset", *DATASET_OPTIONS, *args, stdout=out)
+    return out.getvalue()
+
+
+def get_loans():
+    return list(
+        BookLoan.objects.order_by("pk").values_list(
+            "pk",
+            "visitor__identifier",
+            "book_copy__identifier",
+            "loan_date",
+            "return_date",
+        ),
+    )
+
+
+def test__get_identifier():
+    assert get_identifier(1) == "000001"
+    assert get_identifier(36) == "000010"
+    assert get_identifier(36**6 - 1) == "ZZZZZZ"
+
+
+@pytest.mark.django_db
+class TestGenerateDatasetCommand:
+    def test__sizes(self):
+        # WHEN
+        output = generate_dataset()
+
+        # THEN
+        assert "Book: 12\nBookEdition: 24\nBookCopy: 48\n" in output
+        assert "BookLoan: 144\n" in output
+        assert Visitor.objects.count() == 7  # noqa: PLR2004
+        assert BookLoan.objects.count() == 144  # noqa: PLR2004
+        active = BookLoan.objects.filter(return_date=None)
+        assert active.exists()
+        assert BookCopy.objects.filter(is_available=False).count() == active.count()
+        assert not find_copy_counters_drift(Book.objects.all()).exists()
+        assert not find_copy_counters_drift(BookEdition.objects.all()).exists()
+        assert not find_copy_availability_drift(Book.objects.values("pk"))
+        assert not Book.objects.filter(search_vector=None).exists()
+        assert not BookCopy.objects.filter(search_vector=None).exists()
+
+    def test__loan_history_is_consistent(self):
+        # WHEN
+        generate_dataset()
+
+        # THEN
+        for book_copy in BookCopy.objects.prefetch_related("loans"):
+            loans = sorted(book_copy.loans.all(), key=lambda loan: loan.pk)
+            for previous, loan in pairwise(loans):
+                assert previous.return_date is not None
+                assert previous.return_date <= loan.loan_date
+
+    def test__is_deterministic(self):
+        # GIVEN
+        generate_dataset()
+        loans = get_loans()
+        for model in reversed(DATASET_MODELS):
+            model._default_manager.all().delete()  # noqa: SLF001
+
+        # WHEN
+        generate_dataset()
+
+        # THEN
+        assert get_loans() == loans
+
+    def test__sequences_are_reset(self):
+        # GIVEN
+        generate_dataset()
+
+        # WHEN
+        book = Book.objects.create(title="New", author_id=1)
+
+        # THEN
+        assert book.pk == 13  # noqa: PLR2004
+
+    def test__refuses_non_empty_database(self):
+        # GIVEN
+        AuthorFactory()
+
+        # WHEN / THEN
+        with pytest.raises(CommandError, match="isn't empty"):
+            generate_dataset()
@@ -0,0 +1,73 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from bookaloo.books.exports import get_loan_export_queryset
+from bookaloo.books.exports import iter_loan_rows
+from bookaloo.books.tests.factories import BookLoanFactory
+
+
+@pytest.mark.django_db
+class TestExportLoansCommand:
+    def test__ndjson(self):
+        # GIVEN
+        book_loans = BookLoanFactory.create_batch(3)
+        out = StringIO()
+        err = StringIO()
+
+        # WHEN
+        call_command(
+            "export_loans",
+            f"--since-id={book_loans[0].pk}",
+            "--chunk-size=1",
+            stdout=out,
+            stderr=err,
+        )
+
+        # THEN
+        ids = [json.loads(line)["id"] for line in out.getvalue().splitlines()]
+        assert ids == [book_loan.pk for book_loan in book_loans[1:]]
+        assert f"Exported 2 loans (last id: {book_loans[-1].pk})" in err.getvalue()
+
+    def test__csv_file(self, tmp_path):
+        # GIVEN
+        book_loan = BookLoanFactory()
+        output = tmp_path / "loans.csv"
+
+        # WHEN
+        call_command(
+            "export_loans",
+            "--format=csv",
+            f"--output={output}",
+            stderr=StringIO(),
+        )
+
+        # THEN
+        header, row = output.read_text().splitlines()
+        assert header.startswith("id,visitor_identifier,book_copy_identifier")
+        assert row.startswith(f"{book_loan.pk},{book_loan.visitor.identifier},")
+
+
+@pytest.mark.django_db
+def test__keyset_batches_without_server_side_cursors(
+    monkeypatch,
+    django_assert_num_queries,
+):
+    # GIVEN
+    monkeypatch.setitem(
+        connection.settings_dict,
+        "DISABLE_SERVER_SIDE_CURSORS",
+        value=True,
+    )
+    book_loans = BookLoanFactory.create_batch(5)
+
+    # WHEN
+    # One query per batch, the last one being incomplete
+    with django_assert_num_queries(3):
+        rows = list(iter_loan_rows(get_loan_export_queryset(), chunk_size=2))
+
+    # THEN
+    assert [row[0] for row in rows] == [book_loan.pk for book_loan in book_loans]
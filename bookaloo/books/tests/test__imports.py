@@ -0,0 +1,191 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from bookaloo.books.enums import BookCondition
+from bookaloo.books.models import Author
+from bookaloo.books.models import Book
+from bookaloo.books.models import BookCopy
+from bookaloo.books.models import BookEdition
+from bookaloo.books.models import Publisher
+from bookaloo.books.tests.factories import BookCopyFactory
+
+CSV_HEADER = (
+    "author,author_birth_year,title,publisher,publication_date,isbn,"
+    "copy_identifier,copy_condition\n"
+)
+
+
+@pytest.fixture
+def catalog_csv(tmp_path):
+    path = tmp_path / "catalog.csv"
+    path.write_text(
+        CSV_HEADER
+        + "Jane Austen,1775,Emma,Penguin,2003-05-01,9780141439587,EMMA01,\n"
+        + "Jane Austen,1775,Emma,Penguin,2003-05-01,9780141439587,EMMA02,Poor\n"
+        + "Jane Austen,1775,Emma,Oxford,2008-01-10,9780199535521,EMMA03,Good\n"
+        + "Jane Austen,1775,Persuasion,Penguin,2003-04-29,9780141439686,,\n"
+        + "Leo Tolstoy,1828,War and Peace,Vintage,2008-12-02,9781400079988,WAP001,\n",
+    )
+    return path
+
+
+def import_catalog(*args):
+    out = StringIO()
+    call_command("import_catalog", *args, stdout=out, stderr=StringIO())
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestImportCatalogCommand:
+    def test__csv(self, catalog_csv):
+        # WHEN
+        output = import_catalog(str(catalog_csv), "--batch-size=2")
+
+        # THEN
+        assert "2 authors, 3 books, 4 editions and 4 copies" in output
+        assert not catalog_csv.with_name("catalog.csv.checkpoint").exists()
+        emma = Book.objects.get(title="Emma")
+        assert emma.author.full_name == "Jane Austen"
+        assert emma.author.birth_year == 1775  # noqa: PLR2004
+        assert emma.copies_count_total == 3  # noqa: PLR2004
+        assert emma.copies_count_available == 3  # noqa: PLR2004
+        assert set(Publisher.objects.values_list("name", flat=True)) == {
+            "Penguin",
+            "Oxford",
+            "Vintage",
+        }
+        edition = BookEdition.objects.get(isbn="9780141439587")
+        assert edition.publisher.name == "Penguin"
+        assert edition.copies_count_total == 2  # noqa: PLR2004
+        assert BookCopy.objects.get(identifier="EMMA01").condition == (
+            BookCondition.VERY_GOOD
+        )
+        assert BookCopy.objects.get(identifier="EMMA02").condition == (
+            BookCondition.POOR
+        )
+        assert not Book.objects.filter(search_vector=None).exists()
+        assert not BookEdition.objects.filter(search_vector=None).exists()
+        assert not BookCopy.objects.filter(search_vector=None).exists()
+
+    def test__jsonl_reuses_existing_rows(self, tmp_path):
+        # GIVEN
+        book_copy = BookCopyFactory()
+        book_edition = book_copy.book_edition
+        book = book_edition.book
+        path = tmp_path / "catalog.jsonl"
+        path.write_text(
+            json.dumps(
+                {
+                    "author": book.author.full_name,
+                    "author_birth_year": book.author.birth_year,
+                    "title": book.title,
+                    "publisher": "Penguin",
+                    "publication_date": "2001-01-01",
+                    "isbn": book_edition.isbn,
+                    "copy_identifier": book_copy.identifier,
+                },
+            )
+            + "\n"
+            + json.dumps(
+                {
+                    "author": book.author.full_name,
+                    "author_birth_year": book.author.birth_year,
+                    "title": book.title,
+                    "publisher": "Penguin",
+                    "publication_date": "2001-01-01",
+                    "isbn": book_edition.isbn,
+                    "copy_identifier": "NEW001",
+                },
+            )
+            + "\n",
+        )
+
+        # WHEN
+        output = import_catalog(str(path))
+
+        # THEN
+        assert "0 authors, 0 books, 0 editions and 1 copies" in output
+        assert "1 existing copies" in output
+        assert Author.objects.count() == 1
+        book.refresh_from_db()
+        assert book.copies_count_total == 2  # noqa: PLR2004
+
+    def test__importing_twice_creates_no_duplicates(self, catalog_csv):
+        # GIVEN
+        import_catalog(str(catalog_csv))
+
+        # WHEN
+        output = import_catalog(str(catalog_csv))
+
+        # THEN
+        assert "0 authors, 0 books, 0 editions and 0 copies" in output
+        assert Book.objects.count() == 3  # noqa: PLR2004
+        assert BookCopy.objects.count() == 4  # noqa: PLR2004
+        assert Publisher.objects.count() == 3  # noqa: PLR2004
+
+    def test__resumes_from_checkpoint(self, catalog_csv):
+        # GIVEN
+        checkpoint = catalog_csv.with_name("catalog.csv.checkpoint")
+        checkpoint.write_text(
+            json.dumps(
+                {
+                    "source": str(catalog_csv.resolve()),
+                    "records": 4,
+                    "stats": {"records": 4},
+                },
+            ),
+        )
+
+        # WHEN
+        output = import_catalog(str(catalog_csv))
+
+        # THEN
+        assert "Resuming after 4 records" in output
+        assert list(Book.objects.values_list("title", flat=True)) == ["War and Peace"]
+        assert not checkpoint.exists()
+
+    def test__restart_ignores_checkpoint(self, catalog_csv):
+        # GIVEN
+        checkpoint = catalog_csv.with_name("catalog.csv.checkpoint")
+        checkpoint.write_text(
+            json.dumps(
+                {"source": str(catalog_csv.resolve()), "records": 4, "stats": {}},
+            ),
+        )
+
+        # WHEN
+        import_catalog(str(catalog_csv), "--restart")
+
+        # THEN
+        assert Book.objects.count() == 3  # noqa: PLR2004
+
+    def test__skips_invalid_records(self, tmp_path):
+        # GIVEN
+        path = tmp_path / "catalog.jsonl"
+        path.write_text(
+            "not json\n"
+            + json.dumps({"author": "Jane Austen", "title": "Emma"})
+            + "\n"
+            + json.dumps(
+                {
+                    "author": "Jane Austen",
+                    "title": "Emma",
+                    "publisher": "Penguin",
+                    "publication_date": "2003-05-01",
+                    "isbn": "9780141439587",
+                    "copy_identifier": "EMMA01",
+                    "copy_condition": "shredded",
+                },
+            )
+            + "\n",
+        )
+
+        # WHEN
+        output = import_catalog(str(path))
+
+        # THEN
+        assert "Skipped 3 invalid records" in output
+        assert not Book.objects.exists()
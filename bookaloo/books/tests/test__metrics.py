@@ -0,0 +1,142 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse_lazy
+from prometheus_client import REGISTRY
+
+from bookaloo.books.cache import BOOKS
+from bookaloo.books.circulation import checkout
+from bookaloo.books.circulation import get_default_due_date
+from bookaloo.books.tests.factories import BookCopyFactory
+from bookaloo.books.tests.factories import BookFactory
+from bookaloo.visitors.tests.factories import VisitorFactory
+
+
+def get_sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    books_url = reverse_lazy("books:books-list")
+    metrics_url = reverse_lazy("metrics")
+
+    def test__api_cache_metrics(self, settings, anonymous_client):
+        # GIVEN
+        settings.API_CACHE_ENABLED = True
+        cache.clear()
+        hits_before = get_sample(
+            "bookaloo_api_cache_requests_total",
+            resource=BOOKS,
+            outcome="hit",
+        )
+        misses_before = get_sample(
+            "bookaloo_api_cache_requests_total",
+            resource=BOOKS,
+            outcome="miss",
+        )
+
+        # WHEN
+        anonymous_client.get(self.books_url)
+        anonymous_client.get(self.books_url)
+        anonymous_client.get(self.books_url, data={"page": 1})
+
+        # THEN
+        hits = get_sample(
+            "bookaloo_api_cache_requests_total",
+            resource=BOOKS,
+            outcome="hit",
+        )
+        misses = get_sample(
+            "bookaloo_api_cache_requests_total",
+            resource=BOOKS,
+            outcome="miss",
+        )
+        assert hits - hits_before == 1
+        assert misses - misses_before == 2  # noqa: PLR2004
+        cache.clear()
+
+    def test__request_metrics(self, settings, anonymous_client):
+        # GIVEN
+        settings.METRICS_ENABLED = True
+        BookFactory.create_batch(2)
+        labels = {"view": "books:books-list", "method": "GET"}
+        requests_before = get_sample(
+            "bookaloo_http_requests_total",
+            status="200",
+            **labels,
+        )
+        queries_before = get_sample(
+            "bookaloo_db_queries_total",
+            view="books:books-list",
+        )
+
+        # WHEN
+        anonymous_client.get(self.books_url)
+        response = anonymous_client.get(self.metrics_url)
+
+        # THEN
+        assert response.status_code == 200  # noqa: PLR2004
+        assert b"bookaloo_http_requests_total" in response.content
+        assert (
+            get_sample("bookaloo_http_requests_total", status="200", **labels)
+            == requests_before + 1
+        )
+        assert (
+            get_sample("bookaloo_db_queries_total", view="books:books-list")
+            == queries_before + 2
+        )
+        assert get_sample("bookaloo_http_request_duration_seconds_count", **labels)
+
+    @pytest.mark.parametrize(
+        argnames=("authorization", "expected_status"),
+        argvalues=[
+            pytest.param("Bearer s3cret", 200, id="valid"),
+            pytest.param("Bearer other", 401, id="invalid"),
+            pytest.param("Basic s3cret", 401, id="other_scheme"),
+            pytest.param(None, 401, id="missing"),
+        ],
+    )
+    def test__token(self, settings, anonymous_client, authorization, expected_status):
+        # GIVEN
+        settings.METRICS_ENABLED = True
+        settings.METRICS_TOKEN = "s3cret"  # noqa: S105
+        headers = {"Authorization": authorization} if authorization else {}
+
+        # WHEN
+        response = anonymous_client.get(self.metrics_url, headers=headers)
+
+        # THEN
+        assert response.status_code == expected_status
+        if expected_status == 401:  # noqa: PLR2004
+            assert response["WWW-Authenticate"] == 'Bearer realm="metrics"'
+            assert b"bookaloo_" not in response.content
+
+    def test__disabled(self, settings, anonymous_client):
+        # GIVEN
+        settings.METRICS_ENABLED = False
+
+        # WHEN
+        response = anonymous_client.get(self.metrics_url)
+
+        # THEN
+        assert response.status_code == 404  # noqa: PLR2004
+
+    def test__loan_operations(self, django_capture_on_commit_callbacks):
+        # GIVEN
+        book_copy = BookCopyFactory()
+        visitor = VisitorFactory()
+        before = get_sample("bookaloo_loan_operations_total", operation="checkout")
+
+        # WHEN
+        with django_capture_on_commit_callbacks(execute=True):
+            checkout(
+                book_copy=book_copy,
+                visitor=visitor,
+                due_date=get_default_due_date(),
+            )
+
+        # THEN
+        assert (
+            get_sample("bookaloo_loan_operations_total", operation="checkout")
+            == before + 1
+        )
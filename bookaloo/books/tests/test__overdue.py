@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.utils.timezone import now
+
+from bookaloo.books.overdue import iter_overdue_loan_batches
+from bookaloo.books.tasks import scan_overdue_loans
+from bookaloo.books.tests.factories import BookLoanFactory
+from bookaloo.visitors.tests.factories import VisitorFactory
+from config import celery_app
+
+
+@pytest.fixture
+def _eager_tasks(monkeypatch):
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+
+
+@pytest.mark.django_db
+def test__iter_overdue_loan_batches():
+    # GIVEN
+    due_date = now() - timedelta(days=1)
+    loans = BookLoanFactory.create_batch(5, due_date=due_date)
+    BookLoanFactory(due_date=now() + timedelta(days=1))
+    BookLoanFactory(due_date=due_date, return_date=now())
+
+    # WHEN
+    batches = list(iter_overdue_loan_batches(now(), batch_size=2))
+
+    # THEN
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [loan_id for batch in batches for loan_id, _ in batch] == [
+        loan.id for loan in loans
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("_eager_tasks")
+def test__scan_overdue_loans(django_capture_on_commit_callbacks):
+    # GIVEN
+    visitor = VisitorFactory()
+    overdue_loans = [
+        BookLoanFactory(visitor=visitor, due_date=now() - timedelta(days=days))
+        for days in (1, 2)
+    ]
+    other_loan = BookLoanFactory(due_date=now() - timedelta(days=3))
+    BookLoanFactory(visitor=visitor, due_date=now() + timedelta(days=1))
+
+    # WHEN
+    with django_capture_on_commit_callbacks(execute=True):
+        flagged = scan_overdue_loans()
+    with django_capture_on_commit_callbacks(execute=True):
+        flagged_again = scan_overdue_loans()
+
+    # THEN
+    assert flagged == 3  # noqa: PLR2004
+    assert flagged_again == 0
+    for loan in [*overdue_loans, other_loan]:
+        loan.refresh_from_db()
+        assert loan.overdue_at is not None
+    recipients = sorted(message.to[0] for message in mail.outbox)
+    assert recipients == sorted([visitor.email, other_loan.visitor.email])
+    (notice,) = [message for message in mail.outbox if message.to == [visitor.email]]
+    for loan in overdue_loans:
+        assert loan.book_copy.identifier in notice.body
@@ -0,0 +1,130 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+from bookaloo.books.models import BookEdition
+from bookaloo.books.publishers import backfill_edition_publishers
+
+BEFORE_BACKFILL = [("books", "0010_edition_publisher_fk")]
+AFTER_BACKFILL = [("books", "0011_backfill_edition_publishers")]
+
+
+@pytest.fixture
+def unmigrated_apps():
+    """
+    Migrates the database back to the state before the backfill,
+    returning its app registry, and migrates it forward afterwards.
+    """
+    executor = MigrationExecutor(connection)
+    latest = executor.loader.graph.leaf_nodes()
+    executor.migrate(BEFORE_BACKFILL)
+    executor.loader.build_graph()
+    yield executor.loader.project_state(BEFORE_BACKFILL).apps
+    executor.loader.build_graph()
+    executor.migrate(latest)
+
+
+def create_editions(apps, publisher_names):
+    author = apps.get_model("books", "Author").objects.create(full_name="Author")
+    book = apps.get_model("books", "Book").objects.create(title="Book", author=author)
+    edition_model = apps.get_model("books", "BookEdition")
+    return [
+        edition_model.objects.create(
+            book=book,
+            publisher_name=name,
+            publication_date=datetime.date(2000, 1, 1),
+            isbn=f"978{i:010d}",
+        )
+        for i, name in enumerate(publisher_names)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test__backfill_edition_publishers(unmigrated_apps):
+    # GIVEN
+    publisher_model = unmigrated_apps.get_model("books", "Publisher")
+    penguin = publisher_model.objects.create(name="Penguin")
+    publisher_model.objects.create(name="Penguin")
+    editions = create_editions(
+        unmigrated_apps,
+        ["Penguin", "Vintage", "Oxford", "Vintage", "Penguin"],
+    )
+    progress: list[int] = []
+
+    # WHEN
+    updated = backfill_edition_publishers(
+        unmigrated_apps,
+        batch_size=2,
+        progress=progress.append,
+    )
+
+    # THEN
+    assert updated == len(editions)
+    assert progress == [2, 4, 5]
+    edition_model = unmigrated_apps.get_model("books", "BookEdition")
+    assert list(
+        edition_model.objects.order_by("pk").values_list("publisher__name", flat=True),
+    ) == [
+        "Penguin",
+        "Vintage",
+        "Oxford",
+        "Vintage",
+        "Penguin",
+    ]
+    # The oldest of the publishers sharing a name is used
+    assert set(
+        edition_model.objects.filter(publisher_name="Penguin").values_list(
+            "publisher",
+            flat=True,
+        ),
+    ) == {penguin.pk}
+    assert publisher_model.objects.filter(name="Vintage").count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test__backfill_edition_publishers__command(unmigrated_apps, capsys):
+    # GIVEN
+    create_editions(unmigrated_apps, ["Penguin", "Vintage"])
+
+    # WHEN
+    call_command("backfill_edition_publishers", "--batch-size=1")
+    call_command("backfill_edition_publishers")
+
+    # THEN
+    output = capsys.readouterr().out
+    assert "Backfilled the publishers of 2 editions." in output
+    assert "Backfilled the publishers of 0 editions." in output
+    assert not (
+        unmigrated_apps.get_model("books", "BookEdition")
+        .objects.filter(publisher=None)
+        .exists()
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test__backfill_edition_publishers__migrations(unmigrated_apps):
+    # GIVEN
+    create_editions(unmigrated_apps, ["Penguin", "Vintage"])
+    executor = MigrationExecutor(connection)
+    executor.migrate(AFTER_BACKFILL)
+    executor.loader.build_graph()
+    apps = executor.loader.project_state(AFTER_BACKFILL).apps
+    # An edition written by the previous release after the backfill
+    apps.get_model("books", "BookEdition").objects.create(
+        book_id=apps.get_model("books", "Book").objects.get().pk,
+        publisher_name="Oxford",
+        publication_date=datetime.date(2000, 1, 1),
+        isbn="9781234567890",
+    )
+
+    # WHEN
+    executor.loader.build_graph()
+    executor.migrate(executor.loader.graph.leaf_nodes())
+
+    # THEN
+    assert list(
+        BookEdition.objects.order_by("pk").values_list("publisher__name", flat=True),
+    ) == ["Penguin", "Vintage", "Oxford"]
@@ -0,0 +1,121 @@
+import json
+from datetime import timedelta
+
+import pytest
+import requests
+from anymail.message import AnymailMessage
+from django.core import mail
+from django.utils.formats import date_format
+from django.utils.timezone import now
+
+from bookaloo.books.reminders import get_visitor_ranges
+from bookaloo.books.reminders import remind_visitors
+from bookaloo.books.tasks import schedule_due_reminders
+from bookaloo.books.tests.factories import BookLoanFactory
+from bookaloo.visitors.tests.factories import VisitorFactory
+from config import celery_app
+
+
+@pytest.mark.django_db
+class TestDueReminders:
+    def test__one_email_per_visitor(self, django_assert_num_queries):
+        # GIVEN
+        visitor = VisitorFactory()
+        due_loans = BookLoanFactory.create_batch(
+            2,
+            visitor=visitor,
+            due_date=now() + timedelta(days=1),
+        )
+        other_loan = BookLoanFactory(due_date=now() + timedelta(hours=1))
+        BookLoanFactory(visitor=visitor, due_date=now() + timedelta(days=10))
+        BookLoanFactory(visitor=visitor, due_date=now() - timedelta(days=1))
+
+        # WHEN
+        # Visitors, loans and their update within a savepoint per chunk,
+        # and the last empty chunk
+        with django_assert_num_queries(13):
+            reminded = remind_visitors(0, other_loan.visitor_id + 1, chunk_size=1)
+        reminded_again = remind_visitors(0, other_loan.visitor_id + 1)
+
+        # THEN
+        assert reminded == 3  # noqa: PLR2004
+        assert reminded_again == 0
+        assert [message.to for message in mail.outbox] == [
+            [visitor.email],
+            [other_loan.visitor.email],
+        ]
+        for loan in due_loans:
+            assert loan.book_copy.identifier in mail.outbox[0].body
+
+    def test__esp_batch(self, settings):
+        # GIVEN
+        settings.DUE_REMINDER_ESP_TEMPLATE = "due-reminder"
+        loans = BookLoanFactory.create_batch(2, due_date=now() + timedelta(days=1))
+
+        # WHEN
+        remind_visitors(0, loans[-1].visitor_id + 1)
+
+        # THEN
+        (message,) = mail.outbox
+        assert isinstance(message, AnymailMessage)
+        assert message.template_id == "due-reminder"
+        assert message.to == [loan.visitor.email for loan in loans]
+        assert message.merge_data[loans[0].visitor.email]["loans"] == [
+            {
+                "title": loans[0].book_copy.book_edition.book.title,
+                "identifier": loans[0].book_copy.identifier,
+                "due_date": date_format(loans[0].due_date, "DATE_FORMAT"),
+            },
+        ]
+
+    def test__postmark__one_request_per_chunk(self, settings, monkeypatch):
+        # GIVEN
+        settings.EMAIL_BACKEND = "anymail.backends.postmark.EmailBackend"
+        settings.ANYMAIL = {"POSTMARK_SERVER_TOKEN": "test"}
+        settings.DUE_REMINDER_ESP_TEMPLATE = "due-reminder"
+        loans = BookLoanFactory.create_batch(3, due_date=now() + timedelta(days=1))
+        sent = []
+
+        def request(session, method, url, **kwargs):
+            messages = json.loads(kwargs["data"])["Messages"]
+            sent.append((url, [message["To"] for message in messages]))
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps(  # noqa: SLF001
+                [
+                    {"ErrorCode": 0, "Message": "OK", "MessageID": "1", "To": to}
+                    for to in sent[-1][1]
+                ],
+            ).encode()
+            return response
+
+        monkeypatch.setattr(requests.Session, "request", request)
+
+        # WHEN
+        reminded = remind_visitors(0, loans[-1].visitor_id + 1, chunk_size=2)
+
+        # THEN
+        assert reminded == 3  # noqa: PLR2004
+        url = "https://api.postmarkapp.com/email/batchWithTemplates"
+        assert sent == [
+            (url, [loans[0].visitor.email, loans[1].visitor.email]),
+            (url, [loans[2].visitor.email]),
+        ]
+
+    def test__schedule(self, monkeypatch):
+        # GIVEN
+        monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+        loans = [BookLoanFactory(due_date=now() + timedelta(days=1)) for _ in range(3)]
+        visitor_ids = [loan.visitor_id for loan in loans]
+
+        # WHEN
+        ranges = get_visitor_ranges(days=2, shards=2)
+        shards = schedule_due_reminders(shards=2)
+
+        # THEN
+        assert ranges == [
+            (visitor_ids[0], visitor_ids[0] + 2),
+            (visitor_ids[0] + 2, visitor_ids[-1] + 1),
+        ]
+        assert shards == 2  # noqa: PLR2004
+        assert len(mail.outbox) == 3  # noqa: PLR2004
@@ -0,0 +1,116 @@
+import datetime
+import uuid
+from decimal import Decimal
+from io import BytesIO
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from bookaloo.books.serializers import BookLoanSerializer
+from bookaloo.books.tests.factories import BookLoanFactory
+from bookaloo.parsers import ORJSONParser
+from bookaloo.renderers import ORJSONRenderer
+
+
+class TestORJSONRenderer:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            pytest.param(
+                datetime.datetime(2020, 1, 1, 12, 30, tzinfo=datetime.UTC),
+                id="aware_datetime",
+            ),
+            pytest.param(
+                datetime.datetime(2020, 1, 1, 12, 30, 15, 123456),  # noqa: DTZ001
+                id="naive_datetime",
+            ),
+            pytest.param(datetime.date(2020, 1, 1), id="date"),
+            pytest.param(datetime.time(12, 30, 15, 123456), id="time"),
+            pytest.param(datetime.timedelta(days=1), id="timedelta"),
+            pytest.param(Decimal("12.50"), id="decimal"),
+            pytest.param(_("Very Good"), id="lazy_string"),
+            pytest.param(uuid.UUID(int=1), id="uuid"),
+            pytest.param("Zażółć \u2028 gęślą \u2029 jaźń", id="unicode"),
+            pytest.param({1: [1.5, None, True]}, id="non_str_keys"),
+            pytest.param(2**70, id="big_int"),
+            pytest.param(None, id="none"),
+        ],
+    )
+    def test__same_output_as_json_renderer(self, data):
+        # WHEN / THEN
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test__indent(self):
+        # GIVEN
+        data = {"results": [{"id": 1}]}
+
+        # WHEN
+        output = ORJSONRenderer().render(
+            data,
+            accepted_media_type="application/json; indent=4",
+        )
+
+        # THEN
+        assert output == JSONRenderer().render(
+            data,
+            accepted_media_type="application/json; indent=4",
+        )
+
+    def test__non_finite_floats(self):
+        # GIVEN
+        data = {"value": float("nan")}
+
+        # WHEN
+        output = ORJSONRenderer().render(data)
+
+        # THEN
+        assert output == b'{"value":null}'
+        with pytest.raises(ValueError, match="Out of range float values"):
+            JSONRenderer().render(data)
+
+    @pytest.mark.django_db
+    def test__loans(self):
+        # GIVEN
+        data = BookLoanSerializer(BookLoanFactory.create_batch(2), many=True).data
+
+        # WHEN / THEN
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+class TestORJSONParser:
+    @pytest.mark.parametrize(
+        "content",
+        [
+            pytest.param(b'{"a": [1, 2.5, "\\u2028"], "b": null}', id="valid"),
+            pytest.param('{"a": "zażółć"}'.encode(), id="unicode"),
+        ],
+    )
+    def test__same_output_as_json_parser(self, content):
+        # WHEN / THEN
+        assert ORJSONParser().parse(BytesIO(content)) == JSONParser().parse(
+            BytesIO(content),
+        )
+
+    @pytest.mark.parametrize("content", [b"{", b'{"a": NaN}'])
+    def test__invalid(self, content):
+        # WHEN / THEN
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(BytesIO(content))
+
+
+@pytest.mark.django_db
+def test__benchmark_json_renderers_command():
+    # GIVEN
+    BookLoanFactory()
+    out = StringIO()
+
+    # WHEN
+    call_command("benchmark_json_renderers", "--rows=10", "--repeat=2", stdout=out)
+
+    # THEN
+    assert "faster" in out.getvalue()
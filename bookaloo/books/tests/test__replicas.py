@@ -0,0 +1,91 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+from django.urls import reverse_lazy
+
+from bookaloo import replicas
+from bookaloo.books.models import Book
+from bookaloo.books.tests.factories import AuthorFactory
+from bookaloo.replicas import STICKY_COOKIE
+from bookaloo.replicas import ReplicaRouter
+from bookaloo.replicas import get_read_database
+from bookaloo.replicas import get_replica_lag
+from bookaloo.replicas import read_from
+
+
+@pytest.fixture
+def replica_lags(settings, monkeypatch):
+    settings.DATABASE_REPLICAS = ["replica1", "replica2"]
+    settings.DATABASE_REPLICA_MAX_LAG = 5.0
+    lags = {"replica1": 0.0, "replica2": 0.0}
+    monkeypatch.setattr(replicas, "get_replica_lag", lags.__getitem__)
+    return lags
+
+
+def test__router():
+    # GIVEN
+    router = ReplicaRouter()
+
+    # WHEN
+    with read_from("replica1"):
+        catalog_database = router.db_for_read(Book)
+        users_database = router.db_for_read(get_user_model())
+        write_database = router.db_for_write(Book)
+
+    # THEN
+    assert catalog_database == "replica1"
+    assert users_database is None
+    assert write_database == "default"
+    assert router.db_for_read(Book) is None
+
+
+@pytest.mark.parametrize(
+    ("lags", "cookies", "expected_database"),
+    [
+        ({"replica1": 10.0, "replica2": 0.5}, {}, "replica2"),
+        ({"replica1": 10.0, "replica2": float("inf")}, {}, None),
+        ({"replica1": 0.0, "replica2": 0.0}, {STICKY_COOKIE: "1"}, None),
+    ],
+)
+def test__get_read_database(replica_lags, lags, cookies, expected_database):
+    # GIVEN
+    replica_lags.update(lags)
+    request = RequestFactory().get("/books/")
+    request.COOKIES.update(cookies)
+
+    # WHEN
+    database = get_read_database(request)
+
+    # THEN
+    assert database == expected_database
+
+
+@pytest.mark.django_db
+def test__get_replica_lag(django_assert_num_queries):
+    # GIVEN
+    replicas._replica_lags.clear()  # noqa: SLF001
+
+    # WHEN
+    with django_assert_num_queries(1):
+        lags = [get_replica_lag("default") for _ in range(2)]
+
+    # THEN
+    # Not in recovery, i.e. not a replica
+    assert lags == [0.0, 0.0]
+
+
+@pytest.mark.django_db
+def test__sticky_after_write(settings, anonymous_client):
+    # GIVEN
+    settings.DATABASE_REPLICAS = ["replica1"]
+    author = AuthorFactory()
+
+    # WHEN
+    response = anonymous_client.patch(
+        reverse_lazy("books:authors-detail", args=[author.pk]),
+        data={"full_name": "J.R.R. Tolkien"},
+    )
+
+    # THEN
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.cookies[STICKY_COOKIE]["max-age"] == 5  # noqa: PLR2004
@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from bookaloo.books.filters import SearchVectorFilter
+from bookaloo.books.models import Author
+from bookaloo.books.models import BookCopy
+from bookaloo.books.models import BookEdition
+from bookaloo.books.tests.factories import BookCopyFactory
+
+
+def search(queryset, term):
+    request = Request(APIRequestFactory().get("/", data={"search": term}))
+    return SearchVectorFilter().filter_queryset(request, queryset, view=None)
+
+
+@pytest.mark.django_db
+class TestSearchVectorFilter:
+    @pytest.fixture
+    def book_copy(self):
+        BookCopyFactory()
+        return BookCopyFactory(
+            identifier="A1B2C3",
+            book_edition__isbn="978-83-123456",
+            book_edition__book__title="Solaris",
+            book_edition__book__author__full_name="Stanislaw Lem",
+        )
+
+    @pytest.mark.parametrize(
+        "term",
+        [
+            pytest.param("978-83-1234", id="isbn_prefix_with_dashes"),
+            pytest.param("978831234", id="isbn_prefix_compact"),
+            pytest.param("a1b2", id="identifier_prefix"),
+            pytest.param("Lem Solaris", id="author_and_title"),
+        ],
+    )
+    def test__copies(self, book_copy, term):
+        # WHEN
+        results = search(BookCopy.objects.all(), term)
+
+        # THEN
+        assert list(results) == [book_copy]
+
+    def test__editions__refreshed_on_book_change(self, book_copy):
+        # GIVEN
+        book = book_copy.book_edition.book
+
+        # WHEN
+        book.title = "Fiasco"
+        book.save()
+
+        # THEN
+        assert list(search(BookEdition.objects.all(), "fiasco")) == [
+            book_copy.book_edition,
+        ]
+        assert list(search(BookCopy.objects.all(), "fiasco")) == [book_copy]
+        assert not search(BookCopy.objects.all(), "solaris").exists()
+
+    def test__copies__refreshed_on_publisher_rename(self, book_copy):
+        # GIVEN
+        publisher = book_copy.book_edition.publisher
+
+        # WHEN
+        publisher.name = "Wydawnictwo Literackie"
+        publisher.save()
+
+        # THEN
+        assert list(search(BookEdition.objects.all(), "wydawnictwo")) == [
+            book_copy.book_edition,
+        ]
+        assert list(search(BookCopy.objects.all(), "wydawnictwo")) == [book_copy]
+
+    @pytest.mark.parametrize(
+        "update_fields",
+        [
+            pytest.param(None, id="all_fields"),
+            pytest.param(["full_name", "birth_year"], id="unchanged_document_field"),
+        ],
+    )
+    def test__not_refreshed_on_other_changes(self, book_copy, update_fields):
+        # GIVEN
+        author = Author.objects.get(pk=book_copy.book_edition.book.author_id)
+
+        # WHEN
+        author.birth_year = 1921
+        with CaptureQueriesContext(connection) as queries:
+            author.save(update_fields=update_fields)
+
+        # THEN
+        assert not [
+            query["sql"] for query in queries if "search_vector" in query["sql"]
+        ]
+        assert list(search(BookCopy.objects.all(), "lem")) == [book_copy]
@@ -0,0 +1,97 @@
+import logging
+
+import pytest
+from django.urls import reverse_lazy
+from rest_framework.serializers import BaseSerializer
+
+from bookaloo.books.tests.factories import BookFactory
+from bookaloo.timing import RequestTiming
+from bookaloo.timing import get_query_fingerprint
+from bookaloo.timing import install_serializer_timing
+from bookaloo.timing import uninstall_serializer_timing
+
+
+@pytest.fixture
+def _serializer_timing():
+    install_serializer_timing()
+    yield
+    uninstall_serializer_timing()
+
+
+@pytest.mark.django_db
+class TestServerTimingMiddleware:
+    books_url = reverse_lazy("books:books-list")
+
+    @pytest.mark.usefixtures("_serializer_timing")
+    def test__reports_timing(self, settings, anonymous_client, caplog):
+        # GIVEN
+        settings.SERVER_TIMING_SAMPLE_RATE = 1.0
+        BookFactory.create_batch(2)
+
+        # WHEN
+        with caplog.at_level(logging.INFO, logger="bookaloo.timing"):
+            response = anonymous_client.get(self.books_url)
+
+        # THEN
+        entries = [
+            entry.split(";")[0] for entry in response["Server-Timing"].split(", ")
+        ]
+        assert entries == ["db", "serialize", "render", "app", "total"]
+        assert 'desc="2 queries"' in response["Server-Timing"]
+        (record,) = caplog.records
+        payload = record.server_timing
+        assert payload["path"] == self.books_url
+        assert payload["status"] == 200  # noqa: PLR2004
+        assert payload["queries"] == 2  # noqa: PLR2004
+        assert payload["serialize_ms"] > 0
+        assert payload["render_ms"] > 0
+        assert payload["total_ms"] >= payload["db_ms"] + payload["render_ms"]
+        assert payload["repeated_queries"] == []
+
+    def test__disabled(self, settings, anonymous_client):
+        # GIVEN
+        settings.SERVER_TIMING_SAMPLE_RATE = 0
+
+        # WHEN
+        response = anonymous_client.get(self.books_url)
+
+        # THEN
+        assert "Server-Timing" not in response
+        assert not hasattr(vars(BaseSerializer)["data"].fget, "is_timed")
+
+
+def test__install_serializer_timing():
+    # GIVEN
+    original = vars(BaseSerializer)["data"]
+
+    # WHEN
+    install_serializer_timing()
+    install_serializer_timing()
+    timed = vars(BaseSerializer)["data"]
+    uninstall_serializer_timing()
+
+    # THEN
+    assert timed.fget.is_timed
+    assert timed.fget.__wrapped__ is original.fget
+    assert vars(BaseSerializer)["data"].fget is original.fget
+
+
+def test__duplicate_queries():
+    # GIVEN
+    timing = RequestTiming()
+
+    def execute(sql, params, many, context):
+        return None
+
+    # WHEN
+    for sql, params in [
+        ('SELECT * FROM "books_book" WHERE "id" IN (%s, %s)', [1, 2]),
+        ('SELECT * FROM "books_book" WHERE "id" IN (%s)', [3]),
+        ('SELECT * FROM "books_author" WHERE "id" = %s', [1]),
+    ]:
+        timing.execute_wrapper(execute, sql, params, many=False, context={})
+
+    # THEN
+    fingerprint = get_query_fingerprint('SELECT * FROM "books_book" WHERE "id" IN (%s)')
+    assert timing.query_count == 3  # noqa: PLR2004
+    assert timing.get_repeated_queries() == {fingerprint: 2}
@@ -0,0 +1,169 @@
+import pytest
+from django.urls import resolve
+from django.urls import reverse_lazy
+from freezegun import freeze_time
+from rest_framework import status
+
+from bookaloo.books.models import BookLoan
+from bookaloo.books.tests.factories import BookCopyFactory
+from bookaloo.books.tests.factories import BookLoanFactory
+from bookaloo.books.views import BookLoanBatchView
+from bookaloo.visitors.tests.factories import VisitorFactory
+
+
+@pytest.mark.django_db
+class TestBookLoanBatchView:
+    viewname = "books:book-loans-batch"
+    url = reverse_lazy(viewname)
+
+    def test__url(self):
+        # WHEN / THEN
+        assert self.url == "/books/loans/batch"
+
+    def test__resolved_view_cls(self):
+        # WHEN
+        resolved = resolve(self.url)
+
+        # THEN
+        assert resolved.func.cls == BookLoanBatchView  # type: ignore[attr-defined]
+
+    def test__required_params(self, anonymous_client):
+        # WHEN
+        response = anonymous_client.post(self.url, data={}, format="json")
+
+        # THEN
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {
+            "visitor_identifier": ["This field is required."],
+            "book_copy_identifiers": ["This field is required."],
+        }
+
+    def test__visitor_not_active(self, anonymous_client):
+        # GIVEN
+        visitor = VisitorFactory(is_active=False)
+
+        # WHEN
+        response = anonymous_client.post(
+            self.url,
+            data={
+                "visitor_identifier": visitor.identifier,
+                "book_copy_identifiers": [BookCopyFactory().identifier],
+            },
+            format="json",
+        )
+
+        # THEN
+        expected_msg = f"Visitor with identifier={visitor.identifier} is not active."
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"visitor_identifier": [expected_msg]}
+
+    @freeze_time("2020-01-01")
+    def test__success(self, anonymous_client):
+        # GIVEN
+        book_copies = BookCopyFactory.create_batch(2)
+        visitor = VisitorFactory()
+
+        # WHEN
+        response = anonymous_client.post(
+            self.url,
+            data={
+                "visitor_identifier": visitor.identifier,
+                "book_copy_identifiers": [copy.identifier for copy in book_copies],
+            },
+            format="json",
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_201_CREATED
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == ["loaned", "loaned"]
+        for book_copy, result in zip(book_copies, results, strict=True):
+            book_copy.refresh_from_db()
+            book_loan = book_copy.loans.get()
+            assert book_copy.is_available is False
+            assert book_loan.visitor == visitor
+            assert result["book_copy_identifier"] == book_copy.identifier
+            assert result["detail"] is None
+            assert result["book_loan"]["id"] == book_loan.pk
+            assert result["book_loan"]["due_date"] == "2020-01-15T00:00:00Z"
+            assert result["book_loan"]["visitor"]["identifier"] == visitor.identifier
+
+    @pytest.mark.parametrize(
+        argnames=("mode", "expected_status_code", "expected_statuses"),
+        argvalues=[
+            pytest.param(
+                "atomic",
+                status.HTTP_400_BAD_REQUEST,
+                ["skipped", "not_available", "not_available", "not_found", "duplicate"],
+                id="atomic",
+            ),
+            pytest.param(
+                "best_effort",
+                status.HTTP_201_CREATED,
+                ["loaned", "not_available", "not_available", "not_found", "duplicate"],
+                id="best_effort",
+            ),
+        ],
+    )
+    def test__partial_failure(
+        self,
+        anonymous_client,
+        mode,
+        expected_status_code,
+        expected_statuses,
+    ):
+        # GIVEN
+        available_copy = BookCopyFactory()
+        unavailable_copy = BookCopyFactory(is_available=False)
+        loaned_copy = BookCopyFactory(is_available=True)
+        BookLoanFactory(book_copy=loaned_copy, return_date=None)
+
+        # WHEN
+        response = anonymous_client.post(
+            self.url,
+            data={
+                "visitor_identifier": VisitorFactory().identifier,
+                "book_copy_identifiers": [
+                    available_copy.identifier,
+                    unavailable_copy.identifier,
+                    loaned_copy.identifier,
+                    "123456",
+                    available_copy.identifier,
+                ],
+                "mode": mode,
+            },
+            format="json",
+        )
+
+        # THEN
+        assert response.status_code == expected_status_code
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == expected_statuses
+        assert available_copy.loans.exists() is (mode == "best_effort")
+
+    @pytest.mark.parametrize("num_copies", [1, 10])
+    def test__num_queries(
+        self,
+        anonymous_client,
+        num_copies,
+        django_assert_num_queries,
+    ):
+        # GIVEN
+        book_copies = BookCopyFactory.create_batch(num_copies)
+        visitor = VisitorFactory()
+
+        # WHEN / THEN
+        # SAVEPOINT and RELEASE of the request transaction, the visitor SELECT,
+        # the locking SELECT of the copies, the loans INSERT, the `is_available`
+        # UPDATE and the counters UPDATEs of the editions and the books
+        with django_assert_num_queries(9):
+            response = anonymous_client.post(
+                self.url,
+                data={
+                    "visitor_identifier": visitor.identifier,
+                    "book_copy_identifiers": [copy.identifier for copy in book_copies],
+                },
+                format="json",
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert BookLoan.objects.count() == num_copies
@@ -0,0 +1,158 @@
+import asyncio
+import csv
+import io
+import json
+import warnings
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.core.signals import request_finished
+from django.core.signals import request_started
+from django.db import close_old_connections
+from django.urls import resolve
+from django.urls import reverse_lazy
+from freezegun import freeze_time
+from rest_framework import status
+
+from bookaloo.books.tests.factories import BookLoanFactory
+from bookaloo.books.views import BookLoanExportView
+
+
+@pytest.fixture
+def book_loans():
+    with freeze_time("2020-01-01"):
+        return BookLoanFactory.create_batch(3)
+
+
+def get_expected_row(book_loan):
+    return {
+        "id": book_loan.pk,
+        "visitor_identifier": book_loan.visitor.identifier,
+        "book_copy_identifier": book_loan.book_copy.identifier,
+        "isbn": book_loan.book_copy.book_edition.isbn,
+        "book_id": book_loan.book_copy.book_edition.book_id,
+        "loan_date": "2020-01-01T00:00:00Z",
+        "due_date": "2020-01-15T00:00:00Z",
+        "return_date": None,
+    }
+
+
+@pytest.mark.django_db
+class TestBookLoanExportView:
+    viewname = "books:book-loans-export"
+    url = reverse_lazy(viewname)
+
+    def test__url(self):
+        # WHEN / THEN
+        assert self.url == "/books/loans/export"
+
+    def test__resolved_view_cls(self):
+        # WHEN
+        resolved = resolve(self.url)
+
+        # THEN
+        assert resolved.func.cls == BookLoanExportView  # type: ignore[attr-defined]
+
+    def test__ndjson(self, anonymous_client, book_loans):
+        # WHEN
+        response = anonymous_client.get(self.url)
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line) for line in lines] == [
+            get_expected_row(book_loan) for book_loan in book_loans
+        ]
+
+    def test__csv(self, anonymous_client, book_loans):
+        # WHEN
+        response = anonymous_client.get(self.url, data={"format": "csv"})
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/csv; charset=utf-8"
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert rows == [
+            {
+                key: "" if value is None else str(value)
+                for key, value in get_expected_row(book_loan).items()
+            }
+            for book_loan in book_loans
+        ]
+
+    def test__since_id(self, anonymous_client, book_loans):
+        # WHEN
+        response = anonymous_client.get(
+            self.url,
+            data={"since_id": book_loans[0].pk},
+        )
+
+        # THEN
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [
+            book_loan.pk for book_loan in book_loans[1:]
+        ]
+
+    def test__invalid_since_id(self, anonymous_client):
+        # WHEN
+        response = anonymous_client.get(self.url, data={"since_id": "invalid"})
+
+        # THEN
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert json.loads(response.content) == {
+            "since_id": ["A valid integer is required."],
+        }
+
+    def test__asgi__streamed_in_chunks(self, book_loans, monkeypatch):
+        # GIVEN
+        monkeypatch.setattr(BookLoanExportView, "chunk_size", 1)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": str(self.url),
+            "query_string": b"",
+            "headers": [(b"host", b"testserver")],
+        }
+        requests = [{"type": "http.request", "body": b"", "more_body": False}]
+        messages = []
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            # NOTE: The client stays connected until the response is sent
+            return await asyncio.Future()
+
+        async def send(message):
+            messages.append(message)
+
+        # WHEN
+        # NOTE: Like the test client, keeps the test's transaction open
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                async_to_sync(ASGIHandler())(scope, receive, send)
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+
+        # THEN
+        # NOTE: Django warns when it consumes a sync iterator whole
+        assert [str(warning.message) for warning in caught] == []
+        assert messages[0]["status"] == status.HTTP_200_OK
+        bodies = [
+            message["body"]
+            for message in messages
+            if message["type"] == "http.response.body" and message.get("body")
+        ]
+        assert [json.loads(body) for body in bodies] == [
+            get_expected_row(book_loan) for book_loan in book_loans
+        ]
@@ -4,9 +4,12 @@ from django.urls import reverse_lazy
 from freezegun import freeze_time
 from rest_framework import status
 
+from bookaloo.books.circulation import CHECKOUT_VISITOR_FIELDS
+from bookaloo.books.circulation import get_book_copy_for_checkout
 from bookaloo.books.tests.factories import BookCopyFactory
 from bookaloo.books.tests.factories import BookLoanFactory
 from bookaloo.books.views import BookLoanView
+from bookaloo.visitors.models import Visitor
 from bookaloo.visitors.tests.factories import VisitorFactory
 
 
@@ -274,3 +277,124 @@ class TestBookLoanView:
         with django_assert_num_queries(expected_num_queries):
             response = anonymous_client.get(self.url)
         assert response.status_code == status.HTTP_200_OK
+
+    def test__list__cursor_pagination(self, anonymous_client):
+        # GIVEN
+        with freeze_time("2020-01-01"):
+            older_loans = BookLoanFactory.create_batch(3)
+        with freeze_time("2020-01-02"):
+            newer_loans = BookLoanFactory.create_batch(2)
+        expected_ids = [
+            *sorted((loan.pk for loan in newer_loans), reverse=True),
+            *sorted((loan.pk for loan in older_loans), reverse=True),
+        ]
+
+        # WHEN
+        ids = []
+        url = f"{self.url}?pagination=cursor&page_size=2"
+        pages = []
+        while url:
+            response = anonymous_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            pages.append(response.json())
+            ids += [loan["id"] for loan in pages[-1]["results"]]
+            url = pages[-1]["next"]
+
+        # THEN
+        assert ids == expected_ids
+        assert "count" not in pages[0]
+        assert pages[0]["previous"] is None
+        previous_page = anonymous_client.get(pages[-1]["previous"]).json()
+        assert previous_page["results"] == pages[-2]["results"]
+
+    def test__list__invalid_cursor(self, anonymous_client):
+        # WHEN
+        response = anonymous_client.get(self.url, data={"cursor": "invalid"})
+
+        # THEN
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize("num_loans", [1, 5])
+    def test__list__cursor_pagination__num_queries(
+        self,
+        anonymous_client,
+        num_loans,
+        django_assert_num_queries,
+    ):
+        # GIVEN
+        BookLoanFactory.create_batch(num_loans)
+
+        # WHEN / THEN
+        # No COUNT(*) query, compared to the page number pagination
+        with django_assert_num_queries(3):
+            response = anonymous_client.get(self.url, data={"pagination": "cursor"})
+        assert response.status_code == status.HTTP_200_OK
+
+    def test__create__num_queries(self, anonymous_client, django_assert_num_queries):
+        # GIVEN
+        book_copy = BookCopyFactory()
+        visitor = VisitorFactory()
+
+        # WHEN / THEN
+        # SAVEPOINT and RELEASE of the request transaction, the locking SELECT,
+        # SAVEPOINT, INSERT and RELEASE of the loan, the `is_available` UPDATE
+        # and the counters UPDATEs of the edition and the book
+        with django_assert_num_queries(10):
+            response = anonymous_client.post(
+                self.url,
+                data={
+                    "book_copy_identifier": book_copy.identifier,
+                    "visitor_identifier": visitor.identifier,
+                },
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test__list__sparse_fieldset(self, anonymous_client, django_assert_num_queries):
+        # GIVEN
+        book_loan = BookLoanFactory()
+
+        # WHEN
+        with django_assert_num_queries(4) as captured:
+            response = anonymous_client.get(
+                self.url,
+                data={"fields": "id,due_date,visitor"},
+            )
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"] == [
+            {
+                "id": book_loan.pk,
+                "due_date": book_loan.due_date.isoformat().replace("+00:00", "Z"),
+                "visitor": {
+                    "identifier": book_loan.visitor.identifier,
+                    "full_name": book_loan.visitor.full_name,
+                    "email": book_loan.visitor.email,
+                    "phone_number": book_loan.visitor.phone_number,
+                },
+            },
+        ]
+        # SAVEPOINT, COUNT, SELECT and RELEASE
+        select_sql = captured.captured_queries[2]["sql"]
+        assert "visitors_visitor" in select_sql
+        assert "books_bookcopy" not in select_sql
+
+
+@pytest.mark.django_db
+def test__get_book_copy_for_checkout__visitor_values():
+    # GIVEN
+    book_copy = BookCopyFactory()
+    visitor = VisitorFactory()
+
+    # WHEN
+    _, checkout_visitor = get_book_copy_for_checkout(
+        book_copy.identifier,
+        visitor.identifier,
+    )
+
+    # THEN
+    loaded_visitor = Visitor.objects.get(pk=visitor.pk)
+    for name in CHECKOUT_VISITOR_FIELDS:
+        value = getattr(checkout_visitor, name)
+        assert value == getattr(loaded_visitor, name), name
+        assert type(value) is type(getattr(loaded_visitor, name)), name
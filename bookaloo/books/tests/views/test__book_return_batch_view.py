@@ -0,0 +1,134 @@
+import pytest
+from django.urls import resolve
+from django.urls import reverse_lazy
+from django.utils.timezone import now
+from freezegun import freeze_time
+from rest_framework import status
+
+from bookaloo.books.enums import BookCondition
+from bookaloo.books.tests.factories import BookCopyFactory
+from bookaloo.books.tests.factories import BookLoanFactory
+from bookaloo.books.views import BookReturnBatchView
+
+
+@pytest.mark.django_db
+class TestBookReturnBatchView:
+    viewname = "books:book-returns-batch"
+    url = reverse_lazy(viewname)
+
+    def test__url(self):
+        # WHEN / THEN
+        assert self.url == "/books/returns/batch"
+
+    def test__resolved_view_cls(self):
+        # WHEN
+        resolved = resolve(self.url)
+
+        # THEN
+        assert resolved.func.cls == BookReturnBatchView  # type: ignore[attr-defined]
+
+    def test__required_params(self, anonymous_client):
+        # WHEN
+        response = anonymous_client.post(self.url, data={}, format="json")
+
+        # THEN
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"items": ["This field is required."]}
+
+    @freeze_time("2020-01-10")
+    def test__success(self, anonymous_client):
+        # GIVEN
+        loaned_copy = BookCopyFactory(is_available=False)
+        damaged_copy = BookCopyFactory(is_available=False)
+        returned_copy = BookCopyFactory()
+        book_loans = [
+            BookLoanFactory(book_copy=loaned_copy, return_date=None),
+            BookLoanFactory(book_copy=damaged_copy, return_date=None),
+        ]
+        BookLoanFactory(book_copy=returned_copy, return_date=now())
+
+        # WHEN
+        response = anonymous_client.post(
+            self.url,
+            data={
+                "items": [
+                    {"book_copy_identifier": loaned_copy.identifier},
+                    {
+                        "book_copy_identifier": damaged_copy.identifier,
+                        "book_copy_condition": BookCondition.POOR,
+                    },
+                    {"book_copy_identifier": returned_copy.identifier},
+                    {"book_copy_identifier": "123456"},
+                    {"book_copy_identifier": loaned_copy.identifier},
+                ],
+            },
+            format="json",
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "results": [
+                {
+                    "book_copy_identifier": loaned_copy.identifier,
+                    "status": "returned",
+                    "book_loan_id": book_loans[0].pk,
+                },
+                {
+                    "book_copy_identifier": damaged_copy.identifier,
+                    "status": "returned",
+                    "book_loan_id": book_loans[1].pk,
+                },
+                {
+                    "book_copy_identifier": returned_copy.identifier,
+                    "status": "not_loaned",
+                    "book_loan_id": None,
+                },
+                {
+                    "book_copy_identifier": "123456",
+                    "status": "not_found",
+                    "book_loan_id": None,
+                },
+                {
+                    "book_copy_identifier": loaned_copy.identifier,
+                    "status": "duplicate",
+                    "book_loan_id": None,
+                },
+            ],
+        }
+        for book_loan in book_loans:
+            book_loan.refresh_from_db()
+            book_loan.book_copy.refresh_from_db()
+            assert book_loan.return_date == now()
+            assert book_loan.book_copy.is_available is True
+        assert book_loans[0].book_copy.condition == BookCondition.VERY_GOOD
+        assert book_loans[1].book_copy.condition == BookCondition.POOR
+
+    @pytest.mark.parametrize("num_copies", [1, 10])
+    def test__num_queries(
+        self,
+        anonymous_client,
+        num_copies,
+        django_assert_num_queries,
+    ):
+        # GIVEN
+        book_copies = BookCopyFactory.create_batch(num_copies, is_available=False)
+        for book_copy in book_copies:
+            BookLoanFactory(book_copy=book_copy, return_date=None)
+
+        # WHEN / THEN
+        # SAVEPOINT and RELEASE of the request transaction, the locking SELECT
+        # of the loans, the loans and copies UPDATEs and the counters UPDATEs
+        # of the editions and the books
+        with django_assert_num_queries(8):
+            response = anonymous_client.post(
+                self.url,
+                data={
+                    "items": [
+                        {"book_copy_identifier": book_copy.identifier}
+                        for book_copy in book_copies
+                    ],
+                },
+                format="json",
+            )
+        assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,277 @@
+import threading
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.urls import resolve
+from django.urls import reverse
+from django.urls import reverse_lazy
+from django.utils.timezone import now
+from freezegun import freeze_time
+from rest_framework import status
+
+from bookaloo.books.enums import ReservationStatus
+from bookaloo.books.models import Reservation
+from bookaloo.books.serializers import book_return_serializer
+from bookaloo.books.tests.factories import BookCopyFactory
+from bookaloo.books.tests.factories import BookLoanFactory
+from bookaloo.books.tests.factories import ReservationFactory
+from bookaloo.books.views import ReservationView
+from bookaloo.visitors.tests.factories import VisitorFactory
+
+
+@pytest.fixture
+def lent_out_copy():
+    book_copy = BookCopyFactory(is_available=False)
+    BookLoanFactory(book_copy=book_copy, due_date=now() + timedelta(days=3))
+    return book_copy
+
+
+@pytest.mark.django_db
+class TestReservationView:
+    url = reverse_lazy("books:reservations")
+    loans_url = reverse_lazy("books:book-loans")
+    returns_url = reverse_lazy("books:book-returns")
+    returns_batch_url = reverse_lazy("books:book-returns-batch")
+
+    def test__url(self):
+        # WHEN / THEN
+        assert self.url == "/books/reservations"
+
+    def test__resolved_view_cls(self):
+        # WHEN
+        resolved = resolve(self.url)
+
+        # THEN
+        assert resolved.func.cls == ReservationView  # type: ignore[attr-defined]
+
+    @freeze_time("2020-01-01")
+    def test__create__queue(self, anonymous_client):
+        # GIVEN
+        book_copy = BookCopyFactory(is_available=False)
+        BookLoanFactory(book_copy=book_copy, due_date=now() + timedelta(days=3))
+        book = book_copy.book_edition.book
+        visitors = VisitorFactory.create_batch(2)
+
+        # WHEN
+        responses = [
+            anonymous_client.post(
+                self.url,
+                data={"book_id": book.pk, "visitor_identifier": visitor.identifier},
+            )
+            for visitor in visitors
+        ]
+
+        # THEN
+        assert [response.status_code for response in responses] == [
+            status.HTTP_201_CREATED,
+            status.HTTP_201_CREATED,
+        ]
+        first, second = (response.json() for response in responses)
+        assert first["status"] == ReservationStatus.WAITING
+        assert first["book_copy_identifier"] is None
+        assert [first["position"], second["position"]] == [1, 2]
+        assert first["estimated_available_at"] == "2020-01-04T00:00:00Z"
+        # The copy is lent out again for the default loan period
+        assert second["estimated_available_at"] == "2020-01-18T00:00:00Z"
+
+    def test__create__available_copies(self, anonymous_client):
+        # GIVEN
+        book_copy = BookCopyFactory()
+        visitor = VisitorFactory()
+
+        # WHEN
+        response = anonymous_client.post(
+            self.url,
+            data={
+                "book_id": book_copy.book_edition.book_id,
+                "visitor_identifier": visitor.identifier,
+            },
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {
+            "book_id": [
+                f"Book with id={book_copy.book_edition.book_id} has available copies.",
+            ],
+        }
+
+    def test__create__already_reserved(self, anonymous_client, lent_out_copy):
+        # GIVEN
+        reservation = ReservationFactory(book=lent_out_copy.book_edition.book)
+
+        # WHEN
+        response = anonymous_client.post(
+            self.url,
+            data={
+                "book_id": reservation.book_id,
+                "visitor_identifier": reservation.visitor.identifier,
+            },
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {
+            "book_id": ["The visitor has already reserved this book."],
+        }
+
+    def test__return__holds_copy(self, anonymous_client, lent_out_copy):
+        # GIVEN
+        book = lent_out_copy.book_edition.book
+        first, second = (ReservationFactory(book=book) for _ in range(2))
+        other_visitor = VisitorFactory()
+
+        # WHEN
+        anonymous_client.post(
+            self.returns_url,
+            data={"book_copy_identifier": lent_out_copy.identifier},
+        )
+        other_response = anonymous_client.post(
+            self.loans_url,
+            data={
+                "book_copy_identifier": lent_out_copy.identifier,
+                "visitor_identifier": other_visitor.identifier,
+            },
+        )
+        waiting_response = anonymous_client.get(
+            self.url,
+            data={"visitor_identifier": second.visitor.identifier},
+        )
+        response = anonymous_client.post(
+            self.loans_url,
+            data={
+                "book_copy_identifier": lent_out_copy.identifier,
+                "visitor_identifier": first.visitor.identifier,
+            },
+        )
+
+        # THEN
+        assert other_response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.status_code == status.HTTP_201_CREATED
+        (waiting,) = waiting_response.json()["results"]
+        assert waiting["position"] == 1
+        # Holding the copy for the first visitor
+        # took it off the available copies
+        book.refresh_from_db()
+        assert book.copies_count_available == 0
+        first.refresh_from_db()
+        assert first.status == ReservationStatus.FULFILLED
+        assert first.book_copy == lent_out_copy
+
+    @pytest.mark.django_db(transaction=True)
+    def test__return__repeated_concurrently(
+        self,
+        anonymous_client,
+        lent_out_copy,
+        monkeypatch,
+    ):
+        # GIVEN
+        book = lent_out_copy.book_edition.book
+        first, second = (ReservationFactory(book=book) for _ in range(2))
+        allocating = threading.Event()
+        resume = threading.Event()
+        allocate_returned_copies = book_return_serializer.allocate_returned_copies
+
+        def pausing_allocate_returned_copies(book_loans):
+            # Keeps the first return open while the second one comes in
+            if not allocating.is_set():
+                allocating.set()
+                resume.wait(timeout=5)
+            return allocate_returned_copies(book_loans)
+
+        monkeypatch.setattr(
+            book_return_serializer,
+            "allocate_returned_copies",
+            pausing_allocate_returned_copies,
+        )
+        status_codes = []
+
+        def post_return():
+            try:
+                response = anonymous_client.post(
+                    self.returns_url,
+                    data={"book_copy_identifier": lent_out_copy.identifier},
+                )
+                status_codes.append(response.status_code)
+            finally:
+                connection.close()
+
+        # WHEN
+        threads = [threading.Thread(target=post_return) for _ in range(2)]
+        threads[0].start()
+        assert allocating.wait(timeout=5)
+        threads[1].start()
+        # NOTE: Gives the second return the time to wait for the first one
+        threads[1].join(timeout=0.5)
+        resume.set()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        # THEN
+        assert sorted(status_codes) == [
+            status.HTTP_200_OK,
+            status.HTTP_400_BAD_REQUEST,
+        ]
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.status == ReservationStatus.READY
+        assert second.status == ReservationStatus.WAITING
+
+    def test__return_batch__holds_copies(self, anonymous_client, lent_out_copy):
+        # GIVEN
+        other_copy = BookCopyFactory(is_available=False)
+        BookLoanFactory(book_copy=other_copy)
+        reservation = ReservationFactory(book=lent_out_copy.book_edition.book)
+
+        # WHEN
+        anonymous_client.post(
+            self.returns_batch_url,
+            data={
+                "items": [
+                    {"book_copy_identifier": lent_out_copy.identifier},
+                    {"book_copy_identifier": other_copy.identifier},
+                ],
+            },
+            format="json",
+        )
+
+        # THEN
+        reservation.refresh_from_db()
+        lent_out_copy.refresh_from_db()
+        other_copy.refresh_from_db()
+        assert reservation.status == ReservationStatus.READY
+        assert reservation.book_copy == lent_out_copy
+        assert not lent_out_copy.is_available
+        assert other_copy.is_available
+
+    def test__cancel(self, anonymous_client, lent_out_copy):
+        # GIVEN
+        book = lent_out_copy.book_edition.book
+        first, second = (ReservationFactory(book=book) for _ in range(2))
+        anonymous_client.post(
+            self.returns_url,
+            data={"book_copy_identifier": lent_out_copy.identifier},
+        )
+
+        # WHEN
+        for reservation in (first, second):
+            response = anonymous_client.delete(
+                reverse("books:reservation-detail", args=[reservation.pk]),
+            )
+            assert response.status_code == status.HTTP_204_NO_CONTENT
+        response = anonymous_client.delete(
+            reverse("books:reservation-detail", args=[first.pk]),
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        second.refresh_from_db()
+        assert second.book_copy == lent_out_copy
+        assert set(Reservation.objects.values_list("status", flat=True)) == {
+            ReservationStatus.CANCELLED,
+        }
+        lent_out_copy.refresh_from_db()
+        assert lent_out_copy.is_available
+        book.refresh_from_db()
+        assert book.copies_count_available == 1
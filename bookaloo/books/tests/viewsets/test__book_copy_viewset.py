@@ -0,0 +1,91 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from bookaloo.books.models import BookCopy
+from bookaloo.books.tests.factories import BookCopyFactory
+from bookaloo.books.tests.factories import BookEditionFactory
+
+
+@pytest.mark.django_db
+class TestBookCopyViewSet:
+    viewname = "books:book-edition-copies-list"
+
+    def test__url(self):
+        # WHEN / THEN
+        assert (
+            reverse(self.viewname, kwargs={"book_id": 1, "edition_id": 2})
+            == "/books/1/editions/2/copies/"
+        )
+
+    def test__list__scoped_to_edition(
+        self,
+        anonymous_client,
+        django_assert_num_queries,
+    ):
+        # GIVEN
+        edition = BookEditionFactory()
+        copies = BookCopyFactory.create_batch(2, book_edition=edition)
+        BookCopyFactory.create_batch(3, book_edition__book=edition.book)
+        url = reverse(
+            self.viewname,
+            kwargs={"book_id": edition.book_id, "edition_id": edition.pk},
+        )
+
+        # WHEN
+        with django_assert_num_queries(2):
+            response = anonymous_client.get(url)
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert [copy["id"] for copy in response.json()["results"]] == [
+            copy.pk for copy in copies
+        ]
+
+    def test__list__edition_of_other_book(self, anonymous_client):
+        # GIVEN
+        copy = BookCopyFactory()
+        other_edition = BookEditionFactory()
+
+        # WHEN
+        response = anonymous_client.get(
+            reverse(
+                self.viewname,
+                kwargs={
+                    "book_id": other_edition.book_id,
+                    "edition_id": copy.book_edition_id,
+                },
+            ),
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"] == []
+
+    @pytest.mark.parametrize(
+        argnames=("same_book", "expected_status"),
+        argvalues=[
+            pytest.param(True, status.HTTP_201_CREATED, id="edition_of_book"),
+            pytest.param(False, status.HTTP_404_NOT_FOUND, id="edition_of_other_book"),
+        ],
+    )
+    def test__create(self, anonymous_client, same_book, expected_status):
+        # GIVEN
+        edition, other_edition = BookEditionFactory.create_batch(2)
+        book_id = edition.book_id if same_book else other_edition.book_id
+
+        # WHEN
+        response = anonymous_client.post(
+            reverse(
+                self.viewname,
+                kwargs={"book_id": book_id, "edition_id": edition.pk},
+            ),
+            {"identifier": "A00001", "book_edition": other_edition.pk},
+        )
+
+        # THEN
+        assert response.status_code == expected_status
+        copies = BookCopy.objects.filter(identifier="A00001")
+        assert [copy.book_edition for copy in copies] == (
+            [edition] if same_book else []
+        )
@@ -0,0 +1,155 @@
+import pytest
+from django.urls import resolve
+from django.urls import reverse
+from rest_framework import status
+
+from bookaloo.books.enums import BookCondition
+from bookaloo.books.models import BookEdition
+from bookaloo.books.tests.factories import BookCopyFactory
+from bookaloo.books.tests.factories import BookEditionFactory
+from bookaloo.books.tests.factories import BookFactory
+from bookaloo.books.tests.factories import PublisherFactory
+from bookaloo.books.viewsets import BookEditionViewSet
+
+
+@pytest.mark.django_db
+class TestBookEditionViewSet:
+    viewname = "books:book-editions-list"
+
+    def test__url(self):
+        # WHEN
+        url = reverse(self.viewname, kwargs={"book_id": 1})
+
+        # THEN
+        assert url == "/books/1/editions/"
+        assert resolve(url).func.cls == BookEditionViewSet  # type: ignore[attr-defined]
+
+    @pytest.mark.parametrize(
+        argnames=("editions_count", "other_editions_count"),
+        argvalues=[
+            (1, 0),
+            (3, 5),
+        ],
+    )
+    def test__list__scoped_to_book(
+        self,
+        anonymous_client,
+        editions_count,
+        other_editions_count,
+        django_assert_num_queries,
+    ):
+        # GIVEN
+        book = BookFactory()
+        editions = BookEditionFactory.create_batch(editions_count, book=book)
+        BookEditionFactory.create_batch(other_editions_count)
+        url = reverse(self.viewname, kwargs={"book_id": book.pk})
+
+        # WHEN
+        with django_assert_num_queries(2) as captured:
+            response = anonymous_client.get(url)
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["count"] == editions_count
+        assert [edition["id"] for edition in response.json()["results"]] == [
+            edition.pk for edition in sorted(editions, key=lambda e: e.isbn)
+        ]
+        for query in captured.captured_queries:
+            assert f'"books_bookedition"."book_id" = {book.pk}' in query["sql"]
+
+    def test__retrieve__other_book(self, anonymous_client):
+        # GIVEN
+        edition = BookEditionFactory()
+        other_book = BookFactory()
+
+        # WHEN
+        response = anonymous_client.get(
+            reverse(
+                "books:book-editions-detail",
+                kwargs={"book_id": other_book.pk, "pk": edition.pk},
+            ),
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test__create__book_from_url(self, anonymous_client):
+        # GIVEN
+        book, other_book = BookFactory.create_batch(2)
+        publisher = PublisherFactory()
+        data = {
+            "book": other_book.pk,
+            "publisher": publisher.pk,
+            "publication_date": "1937-09-21",
+            "isbn": "9780048230706",
+        }
+
+        # WHEN
+        response = anonymous_client.post(
+            reverse(self.viewname, kwargs={"book_id": book.pk}),
+            data,
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["book"] == book.pk
+        assert BookEdition.objects.get(isbn="9780048230706").book == book
+
+    def test__create__missing_book(self, anonymous_client):
+        # GIVEN
+        publisher = PublisherFactory()
+        data = {
+            "publisher": publisher.pk,
+            "publication_date": "1937-09-21",
+            "isbn": "9780048230706",
+        }
+
+        # WHEN
+        response = anonymous_client.post(
+            reverse(self.viewname, kwargs={"book_id": 1}),
+            data,
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert not BookEdition.objects.exists()
+
+    def test__availability(self, anonymous_client, django_assert_num_queries):
+        # GIVEN
+        edition = BookEditionFactory()
+        BookCopyFactory(book_edition=edition, condition=BookCondition.ACCEPTABLE)
+        BookCopyFactory(book_edition=edition, is_available=False)
+        url = reverse(
+            "books:book-editions-availability",
+            kwargs={"book_id": edition.book_id, "pk": edition.pk},
+        )
+
+        # WHEN
+        with django_assert_num_queries(2):
+            response = anonymous_client.get(url)
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "book_edition": edition.pk,
+            "total": 2,
+            "available": 1,
+            "conditions": [
+                {"condition": BookCondition.VERY_GOOD, "total": 1, "available": 0},
+                {"condition": BookCondition.ACCEPTABLE, "total": 1, "available": 1},
+            ],
+        }
+
+    def test__availability__other_book(self, anonymous_client):
+        # GIVEN
+        edition = BookEditionFactory()
+        url = reverse(
+            "books:book-editions-availability",
+            kwargs={"book_id": BookFactory().pk, "pk": edition.pk},
+        )
+
+        # WHEN
+        response = anonymous_client.get(url)
+
+        # THEN
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -1,8 +1,13 @@
 import pytest
 from django.urls import resolve
+from django.urls import reverse
 from django.urls import reverse_lazy
 from rest_framework import status
 
+from bookaloo.books.enums import BookCondition
+from bookaloo.books.tests.factories import AuthorFactory
+from bookaloo.books.tests.factories import BookCopyFactory
+from bookaloo.books.tests.factories import BookEditionFactory
 from bookaloo.books.tests.factories import BookFactory
 from bookaloo.books.tests.factories import BookLoanFactory
 from bookaloo.books.viewsets import BookViewSet
@@ -27,8 +32,8 @@ class TestBookViewSet:
     @pytest.mark.parametrize(
         argnames=("books_count", "loans_count", "expected_num_queries"),
         argvalues=[
-            (1, 1, 4),
-            (3, 3, 4),
+            (1, 1, 2),
+            (3, 3, 2),
         ],
     )
     def test__list__num_queries(
@@ -51,3 +56,188 @@ class TestBookViewSet:
         with django_assert_num_queries(expected_num_queries):
             response = anonymous_client.get(self.url)
         assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize(
+        argnames=("search", "expected_titles"),
+        argvalues=[
+            pytest.param("hobb", ["The Hobbit"], id="title_prefix"),
+            pytest.param("J.R.R.", ["The Hobbit", "The Silmarillion"], id="initials"),
+            pytest.param("tolkien silm", ["The Silmarillion"], id="all_terms"),
+            pytest.param("dune", [], id="no_match"),
+        ],
+    )
+    def test__list__search(self, anonymous_client, search, expected_titles):
+        # GIVEN
+        author = AuthorFactory(full_name="J.R.R. Tolkien")
+        BookFactory(title="The Hobbit", author=author)
+        BookFactory(title="The Silmarillion", author=author)
+        BookFactory(title="A Game of Thrones")
+
+        # WHEN
+        response = anonymous_client.get(self.url, data={"search": search})
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        titles = sorted(book["title"] for book in response.json()["results"])
+        assert titles == expected_titles
+
+    def test__list__search__ranking(self, anonymous_client):
+        # GIVEN
+        by_author = BookFactory(author__full_name="Frank Herbert", title="Other")
+        by_title = BookFactory(title="Herbert's Guide")
+
+        # WHEN
+        response = anonymous_client.get(self.url, data={"search": "herbert"})
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        ids = [book["id"] for book in response.json()["results"]]
+        assert ids == [by_title.pk, by_author.pk]
+
+    @pytest.mark.parametrize(
+        "pagination_params",
+        [
+            pytest.param({"pagination": "cursor"}, id="pagination_cursor"),
+            pytest.param({"cursor": "eyJ2IjpbIkEiLCIxIl19"}, id="cursor"),
+        ],
+    )
+    def test__list__search__cursor_pagination(
+        self,
+        anonymous_client,
+        pagination_params,
+    ):
+        # GIVEN
+        BookFactory(title="Solaris")
+
+        # WHEN
+        response = anonymous_client.get(
+            self.url,
+            data={"search": "solaris", **pagination_params},
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == [
+            "Cursor pagination can't keep the order of these results; "
+            "use page numbers instead.",
+        ]
+
+    def test__list__search__author_renamed(self, anonymous_client):
+        # GIVEN
+        book = BookFactory(author__full_name="Richard Bachman")
+        author = book.author
+
+        # WHEN
+        author.full_name = "Stephen King"
+        author.save()
+        response = anonymous_client.get(self.url, data={"search": "king"})
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert [book["id"] for book in response.json()["results"]] == [book.pk]
+
+    @pytest.mark.parametrize(
+        argnames=("params", "expected_keys", "expected_join"),
+        argvalues=[
+            pytest.param(
+                {"fields": "id,title"},
+                {"id", "title"},
+                False,
+                id="fields",
+            ),
+            pytest.param(
+                {"fields": "id,author,unknown"},
+                {"id", "author"},
+                True,
+                id="fields_with_relation",
+            ),
+            pytest.param(
+                {"exclude": "author,copies_count"},
+                {"id", "title"},
+                False,
+                id="exclude",
+            ),
+        ],
+    )
+    def test__list__sparse_fieldset(
+        self,
+        anonymous_client,
+        params,
+        expected_keys,
+        expected_join,
+        django_assert_num_queries,
+    ):
+        # GIVEN
+        BookFactory()
+
+        # WHEN
+        with django_assert_num_queries(2) as captured:
+            response = anonymous_client.get(self.url, data=params)
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()["results"][0]
+        assert result.keys() == expected_keys
+        # COUNT and SELECT, outside of a transaction, see `bookaloo.replicas`
+        select_sql = captured.captured_queries[1]["sql"]
+        assert ("JOIN" in select_sql) is expected_join
+
+    def test__availability(self, anonymous_client, django_assert_num_queries):
+        # GIVEN
+        book = BookFactory()
+        first_edition, second_edition = BookEditionFactory.create_batch(2, book=book)
+        BookEditionFactory(book=book)
+        BookCopyFactory(book_edition=first_edition, condition=BookCondition.POOR)
+        BookCopyFactory.create_batch(
+            2,
+            book_edition=first_edition,
+            condition=BookCondition.GOOD,
+            is_available=False,
+        )
+        BookCopyFactory(book_edition=second_edition, condition=BookCondition.GOOD)
+        BookCopyFactory()
+        url = reverse("books:books-availability", kwargs={"pk": book.pk})
+
+        # WHEN
+        with django_assert_num_queries(2):
+            response = anonymous_client.get(url)
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "book": book.pk,
+            "total": 4,
+            "available": 2,
+            "conditions": [
+                {"condition": BookCondition.GOOD, "total": 3, "available": 1},
+                {"condition": BookCondition.POOR, "total": 1, "available": 1},
+            ],
+            "editions": [
+                {
+                    "book_edition": first_edition.pk,
+                    "total": 3,
+                    "available": 1,
+                    "conditions": [
+                        {"condition": BookCondition.GOOD, "total": 2, "available": 0},
+                        {"condition": BookCondition.POOR, "total": 1, "available": 1},
+                    ],
+                },
+                {
+                    "book_edition": second_edition.pk,
+                    "total": 1,
+                    "available": 1,
+                    "conditions": [
+                        {"condition": BookCondition.GOOD, "total": 1, "available": 1},
+                    ],
+                },
+            ],
+        }
+
+    def test__availability__missing_book(self, anonymous_client):
+        # WHEN
+        response = anonymous_client.get(
+            reverse("books:books-availability", kwargs={"pk": 1}),
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_404_NOT_FOUND
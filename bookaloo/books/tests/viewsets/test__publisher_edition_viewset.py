@@ -0,0 +1,57 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from bookaloo.books.tests.factories import BookEditionFactory
+from bookaloo.books.tests.factories import PublisherFactory
+
+
+@pytest.mark.django_db
+class TestPublisherEditionViewSet:
+    viewname = "books:publisher-editions-list"
+
+    def test__url(self):
+        # WHEN / THEN
+        assert (
+            reverse(self.viewname, kwargs={"publisher_id": 1})
+            == "/books/publishers/1/editions/"
+        )
+
+    def test__list__scoped_to_publisher(
+        self,
+        anonymous_client,
+        django_assert_num_queries,
+    ):
+        # GIVEN
+        publisher = PublisherFactory()
+        editions = BookEditionFactory.create_batch(2, publisher=publisher)
+        BookEditionFactory.create_batch(3)
+        url = reverse(self.viewname, kwargs={"publisher_id": publisher.pk})
+
+        # WHEN
+        with django_assert_num_queries(2) as captured:
+            response = anonymous_client.get(url)
+
+        # THEN
+        assert response.status_code == status.HTTP_200_OK
+        assert [edition["id"] for edition in response.json()["results"]] == [
+            edition.pk for edition in sorted(editions, key=lambda e: e.isbn)
+        ]
+        assert response.json()["results"][0]["publisher"] == publisher.pk
+        for query in captured.captured_queries:
+            assert (
+                f'"books_bookedition"."publisher_ref" = {publisher.pk}' in query["sql"]
+            )
+
+    def test__create__not_allowed(self, anonymous_client):
+        # GIVEN
+        publisher = PublisherFactory()
+
+        # WHEN
+        response = anonymous_client.post(
+            reverse(self.viewname, kwargs={"publisher_id": publisher.pk}),
+            {},
+        )
+
+        # THEN
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
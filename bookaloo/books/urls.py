@@ -1,13 +1,20 @@
+from django.db import transaction
 from django.urls import include
 from django.urls import path
 from rest_framework.routers import SimpleRouter
 
+from bookaloo.books.views import BookLoanBatchView
+from bookaloo.books.views import BookLoanExportView
 from bookaloo.books.views import BookLoanView
+from bookaloo.books.views import BookReturnBatchView
 from bookaloo.books.views import BookReturnView
+from bookaloo.books.views import ReservationDetailView
+from bookaloo.books.views import ReservationView
 from bookaloo.books.viewsets import AuthorViewSet
 from bookaloo.books.viewsets import BookCopyViewSet
 from bookaloo.books.viewsets import BookEditionViewSet
 from bookaloo.books.viewsets import BookViewSet
+from bookaloo.books.viewsets import PublisherEditionViewSet
 from bookaloo.books.viewsets import PublisherViewSet
 
 app_name = "books"
@@ -24,29 +31,66 @@ books_router.register(
     BookViewSet,
     basename="books",
 )
-books_router.register(
+
+# NOTE: Path converters in the prefixes need a path-based router; lookups
+#       are integers, see `NestedViewSetMixin.lookup_value_converter`
+nested_router = SimpleRouter(use_regex_path=False)
+nested_router.register(
     "<int:book_id>/editions",
     BookEditionViewSet,
     basename="book-editions",
 )
-books_router.register(
+nested_router.register(
     "<int:book_id>/editions/<int:edition_id>/copies",
     BookCopyViewSet,
     basename="book-edition-copies",
 )
+nested_router.register(
+    "publishers/<int:publisher_id>/editions",
+    PublisherEditionViewSet,
+    basename="publisher-editions",
+)
 
 urlpatterns = [
     path("", include(authors_router.urls)),
     path("", include(publishers_router.urls)),
     path("", include(books_router.urls)),
+    path("", include(nested_router.urls)),
     path(
         "loans",
         BookLoanView.as_view(),
         name="book-loans",
     ),
+    path(
+        "loans/batch",
+        BookLoanBatchView.as_view(),
+        name="book-loans-batch",
+    ),
+    path(
+        "loans/export",
+        # NOTE: Rows are streamed after the view has returned,
+        #       so the request transaction would be of no use
+        transaction.non_atomic_requests(BookLoanExportView.as_view()),
+        name="book-loans-export",
+    ),
     path(
         "returns",
         BookReturnView.as_view(),
         name="book-returns",
     ),
+    path(
+        "returns/batch",
+        BookReturnBatchView.as_view(),
+        name="book-returns-batch",
+    ),
+    path(
+        "reservations",
+        ReservationView.as_view(),
+        name="reservations",
+    ),
+    path(
+        "reservations/<int:pk>",
+        ReservationDetailView.as_view(),
+        name="reservation-detail",
+    ),
 ]
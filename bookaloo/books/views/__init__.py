@@ -1,2 +1,7 @@
+from .book_loan_batch_view import BookLoanBatchView
+from .book_loan_export_view import BookLoanExportView
 from .book_loan_view import BookLoanView
+from .book_return_batch_view import BookReturnBatchView
 from .book_return_view import BookReturnView
+from .reservation_view import ReservationDetailView
+from .reservation_view import ReservationView
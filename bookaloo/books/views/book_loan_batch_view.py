@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema_view
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+
+from bookaloo.books.circulation import checkout_many
+from bookaloo.books.circulation import get_default_due_date
+from bookaloo.books.enums import BatchItemStatus
+from bookaloo.books.enums import BatchMode
+from bookaloo.books.serializers import BookLoanBatchResultSerializer
+from bookaloo.books.serializers import BookLoanBatchSerializer
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary=_("Submit a batch of book loans"),
+        description=_(
+            "Allows the user to lend a stack of book copies to a single "
+            "library visitor at once. Returns the result of each book copy, "
+            "in the given order. In the `atomic` mode (default), nothing is "
+            "lent out and the response status is 400 unless all book copies "
+            "can be lent out; in the `best_effort` mode, the available book "
+            "copies are lent out anyway."
+        ),
+        request=BookLoanBatchSerializer,
+        responses={
+            201: BookLoanBatchResultSerializer,
+            400: BookLoanBatchResultSerializer,
+        },
+    ),
+)
+class BookLoanBatchView(GenericAPIView):
+    serializer_class = BookLoanBatchSerializer
+
+    @transaction.atomic(savepoint=False)
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        visitor = data["visitor_identifier"]
+        results = checkout_many(
+            visitor=visitor,
+            book_copy_identifiers=data["book_copy_identifiers"],
+            due_date=data.get("due_date") or get_default_due_date(),
+            atomic=data["mode"] == BatchMode.ATOMIC,
+        )
+        for result in results:
+            if result["book_loan"] is not None:
+                result["book_loan"].visitor = visitor
+        loaned = any(result["status"] == BatchItemStatus.LOANED for result in results)
+        return Response(
+            status=status.HTTP_201_CREATED if loaned else status.HTTP_400_BAD_REQUEST,
+            data=BookLoanBatchResultSerializer({"results": results}).data,
+        )
@@ -0,0 +1,58 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.utils import OpenApiResponse
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema_view
+from rest_framework.views import APIView
+
+from bookaloo.books.exports import EXPORT_CHUNK_SIZE
+from bookaloo.books.exports import EXPORT_FORMATS
+from bookaloo.books.exports import aiter_chunks
+from bookaloo.books.exports import get_loan_export_queryset
+from bookaloo.books.exports import iter_loan_rows
+from bookaloo.books.serializers import BookLoanExportQuerySerializer
+from bookaloo.renderers import CSVRenderer
+from bookaloo.renderers import NDJSONRenderer
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary=_("Export the loan history"),
+        description=_(
+            "Streams all book loans ordered by id, as newline-delimited JSON "
+            "(default) or CSV, selected with the `Accept` header or the "
+            "`format` query parameter. Incremental exports can pass the last "
+            "exported id as `since_id`."
+        ),
+        parameters=[BookLoanExportQuerySerializer],
+        responses={
+            200: OpenApiResponse(description=_("The exported loans")),
+        },
+    ),
+)
+class BookLoanExportView(APIView):
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    chunk_size = EXPORT_CHUNK_SIZE
+
+    def get(self, request, *args, **kwargs):
+        serializer = BookLoanExportQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        queryset = get_loan_export_queryset(serializer.validated_data.get("since_id"))
+        # NOTE: The rows are fetched as the response is streamed,
+        #       i.e. after the view has returned
+        chunks = EXPORT_FORMATS[renderer.format](
+            iter_loan_rows(queryset, self.chunk_size),
+            self.chunk_size,
+        )
+        if isinstance(request._request, ASGIRequest):  # noqa: SLF001
+            chunks = aiter_chunks(chunks)
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="loans.{renderer.format}"'
+        )
+        return response
@@ -1,14 +1,14 @@
-from datetime import timedelta
-
 from django.db import transaction
-from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.utils import extend_schema
 from drf_spectacular.utils import extend_schema_view
 from rest_framework.generics import ListCreateAPIView
 
+from bookaloo.books.circulation import get_default_due_date
+from bookaloo.books.filters import SparseFieldsetFilter
 from bookaloo.books.models import BookLoan
 from bookaloo.books.serializers import BookLoanSerializer
+from bookaloo.views import AsyncReadMixin
 
 
 @extend_schema_view(
@@ -23,8 +23,14 @@ from bookaloo.books.serializers import BookLoanSerializer
         ),
     ),
 )
-class BookLoanView(ListCreateAPIView):
+class BookLoanView(AsyncReadMixin, ListCreateAPIView):
     serializer_class = BookLoanSerializer
+    filter_backends = [SparseFieldsetFilter]
+    keyset_ordering = ("-loan_date", "-id")
+    sparse_fieldset_select_related = {
+        "visitor": ["visitor"],
+        "book": ["book_copy__book_edition__book__author"],
+    }
 
     def get_queryset(self):
         return BookLoan.objects.select_related(
@@ -32,12 +38,21 @@ class BookLoanView(ListCreateAPIView):
             "book_copy__book_edition__book__author",
         )
 
-    @transaction.atomic
+    @transaction.atomic(savepoint=False)
+    def create(self, request, *args, **kwargs):
+        """
+        Checks out a book copy with a fixed number of queries.
+
+        Within the request transaction, the budget is: one `SELECT ... FOR UPDATE`
+        of the copy (with its edition, book and author) and the visitor,
+        the loan `INSERT` wrapped in a savepoint, the `is_available` `UPDATE`
+        and one counters `UPDATE` for each of the edition and the book.
+        The response is serialized from the already fetched objects.
+        """
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         data = serializer.validated_data
         if data.get("due_date", None) is None:
-            due_date = now() + timedelta(weeks=2)
-            serializer.validated_data["due_date"] = due_date
+            serializer.validated_data["due_date"] = get_default_due_date()
         super().perform_create(serializer)
-        data["book_copy"].is_available = False
-        data["book_copy"].save()
@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema_view
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+
+from bookaloo.books.circulation import return_many
+from bookaloo.books.serializers import BookReturnBatchResultSerializer
+from bookaloo.books.serializers import BookReturnBatchSerializer
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary=_("Submit a batch of book returns"),
+        description=_(
+            "Allows the user to return a stack of book copies at once, "
+            "e.g. from a book drop. Each book copy may come with its condition; "
+            "if not provided, the condition will not be updated. Returns the "
+            "status of each book copy, in the given order: `returned`, "
+            "`not_loaned` (already returned), `not_found` or `duplicate`."
+        ),
+        request=BookReturnBatchSerializer,
+        responses={200: BookReturnBatchResultSerializer},
+    ),
+)
+class BookReturnBatchView(GenericAPIView):
+    serializer_class = BookReturnBatchSerializer
+
+    @transaction.atomic(savepoint=False)
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = return_many(serializer.validated_data["items"])
+        return Response(
+            status=status.HTTP_200_OK,
+            data=BookReturnBatchResultSerializer({"results": results}).data,
+        )
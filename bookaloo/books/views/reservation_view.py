@@ -0,0 +1,117 @@
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.utils import OpenApiParameter
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema_view
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import ListCreateAPIView
+from rest_framework.generics import RetrieveDestroyAPIView
+from rest_framework.response import Response
+
+from bookaloo.books.enums import ReservationStatus
+from bookaloo.books.models import Reservation
+from bookaloo.books.reservations import annotate_queue_positions
+from bookaloo.books.reservations import cancel_reservation
+from bookaloo.books.reservations import set_estimated_available_dates
+from bookaloo.books.serializers import ReservationSerializer
+
+
+class ReservationQuerysetMixin:
+    def get_queryset(self):
+        return annotate_queue_positions(
+            Reservation.objects.select_related("visitor", "book_copy"),
+        )
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary=_("List reservations"),
+        description=_(
+            "Lists the reservations, newest first, optionally of a single "
+            "visitor or book, with the position of the waiting ones in their "
+            "book's queue and the estimated date of their copy."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "visitor_identifier",
+                str,
+                description=_("Identifier of the visitor."),
+            ),
+            OpenApiParameter("book_id", int, description=_("Id of the book.")),
+        ],
+    ),
+    post=extend_schema(
+        summary=_("Reserve a book"),
+        description=_(
+            "Adds the visitor to the queue of a book whose copies are all lent "
+            "out. When a copy is returned, it is held for the first visitor "
+            "in the queue, and can only be checked out by them."
+        ),
+    ),
+)
+class ReservationView(ReservationQuerysetMixin, ListCreateAPIView):
+    serializer_class = ReservationSerializer
+    keyset_ordering = ("-created_at", "-id")
+
+    def get_queryset(self):
+        queryset = super().get_queryset().order_by(*self.keyset_ordering)
+        visitor_identifier = self.request.query_params.get("visitor_identifier")
+        if visitor_identifier:
+            queryset = queryset.filter(visitor__identifier=visitor_identifier)
+        book_id = self.request.query_params.get("book_id")
+        if book_id and book_id.isdigit():
+            queryset = queryset.filter(book_id=book_id)
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        set_estimated_available_dates(page)
+        return page
+
+    @transaction.atomic(savepoint=False)
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        reservation = serializer.save()
+        reservation = super().get_queryset().get(pk=reservation.pk)
+        set_estimated_available_dates([reservation])
+        return Response(
+            status=status.HTTP_201_CREATED,
+            data=self.get_serializer(reservation).data,
+        )
+
+
+@extend_schema_view(
+    get=extend_schema(summary=_("Retrieve a reservation")),
+    delete=extend_schema(
+        summary=_("Cancel a reservation"),
+        description=_(
+            "Cancels a waiting or ready reservation. A copy held for it goes "
+            "to the next visitor in the queue, or back on the shelf."
+        ),
+    ),
+)
+class ReservationDetailView(ReservationQuerysetMixin, RetrieveDestroyAPIView):
+    serializer_class = ReservationSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method == "DELETE":
+            return queryset.select_for_update(of=("self",))
+        return queryset
+
+    def get_object(self):
+        reservation = super().get_object()
+        set_estimated_available_dates([reservation])
+        return reservation
+
+    @transaction.atomic(savepoint=False)
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        if instance.status not in {ReservationStatus.WAITING, ReservationStatus.READY}:
+            msg = _("The reservation is already %s.") % instance.get_status_display()
+            raise ValidationError({"status": [msg]})
+        cancel_reservation(instance)
@@ -1,13 +1,25 @@
-from django.db.models import Count
-from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.utils import extend_schema
 from drf_spectacular.utils import extend_schema_view
-from rest_framework.filters import SearchFilter
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
+from rest_framework.viewsets import ReadOnlyModelViewSet
 
 from bookaloo.books import models
 from bookaloo.books import serializers
+from bookaloo.books.availability import get_book_availability
+from bookaloo.books.availability import get_edition_availability
+from bookaloo.books.cache import AUTHORS
+from bookaloo.books.cache import BOOKS
+from bookaloo.books.cache import COPIES
+from bookaloo.books.cache import EDITIONS
+from bookaloo.books.cache import PUBLISHERS
+from bookaloo.books.cache import CachedResponseMixin
+from bookaloo.books.filters import SearchVectorFilter
+from bookaloo.books.filters import SparseFieldsetFilter
+from bookaloo.replicas import ReplicaReadMixin
+from bookaloo.views import NestedViewSetMixin
 
 DEFAULT_HTTP_METHODS = [
     "head",
@@ -27,11 +39,13 @@ DEFAULT_HTTP_METHODS = [
     update=extend_schema(summary=_("Update a specific author")),
     destroy=extend_schema(summary=_("Delete a specific author")),
 )
-class AuthorViewSet(ModelViewSet):
+class AuthorViewSet(CachedResponseMixin, ReplicaReadMixin, ModelViewSet):
     queryset = models.Author.objects.all()
     serializer_class = serializers.AuthorSerializer
-    filter_backends = [SearchFilter]
+    filter_backends = [SearchVectorFilter, SparseFieldsetFilter]
     search_fields = ["full_name"]
+    cache_resources = (AUTHORS,)
+    keyset_ordering = ("full_name", "id")
     http_method_names = DEFAULT_HTTP_METHODS
 
 
@@ -43,11 +57,13 @@ class AuthorViewSet(ModelViewSet):
     update=extend_schema(summary=_("Update a specific publisher")),
     destroy=extend_schema(summary=_("Delete a specific publisher")),
 )
-class PublisherViewSet(ModelViewSet):
+class PublisherViewSet(CachedResponseMixin, ReplicaReadMixin, ModelViewSet):
     queryset = models.Publisher.objects.all()
     serializer_class = serializers.PublisherSerializer
-    filter_backends = [SearchFilter]
+    filter_backends = [SearchVectorFilter, SparseFieldsetFilter]
     search_fields = ["name", "address"]
+    cache_resources = (PUBLISHERS,)
+    keyset_ordering = ("name", "id")
     http_method_names = DEFAULT_HTTP_METHODS
 
 
@@ -58,58 +74,117 @@ class PublisherViewSet(ModelViewSet):
     partial_update=extend_schema(summary=_("Partially update a specific book")),
     update=extend_schema(summary=_("Update a specific book")),
     destroy=extend_schema(summary=_("Delete a specific book")),
+    availability=extend_schema(
+        summary=_("Summarize the availability of a book's copies"),
+        responses=serializers.BookAvailabilitySerializer,
+    ),
 )
-class BookViewSet(ModelViewSet):
+class BookViewSet(CachedResponseMixin, ReplicaReadMixin, ModelViewSet):
     serializer_class = serializers.BookSerializer
-    filter_backends = [SearchFilter]
+    filter_backends = [SearchVectorFilter, SparseFieldsetFilter]
     search_fields = ["title", "author__full_name"]
+    # NOTE: Copy counters and search documents
+    #       depend on editions and copies, too
+    cache_resources = (BOOKS, AUTHORS, EDITIONS, COPIES)
+    keyset_ordering = ("title", "id")
+    sparse_fieldset_select_related = {"author": ["author"]}
     http_method_names = DEFAULT_HTTP_METHODS
 
     def get_queryset(self):
+        # NOTE: Copy counts are read from the denormalized
+        #       counters, see `bookaloo.books.counters`.
         return models.Book.objects.select_related(
             "author",
-        ).annotate(
-            copies_count_total=Count("editions__copies"),
-            copies_count_available=Count(
-                "editions__copies",
-                filter=Q(editions__copies__is_available=True),
-            ),
         )
 
+    @action(detail=True, filter_backends=[])
+    def availability(self, request, *args, **kwargs):
+        # NOTE: Read from the aggregates, see `bookaloo.books.availability`
+        book = self.get_object()
+        serializer = serializers.BookAvailabilitySerializer(
+            get_book_availability(book.pk),
+        )
+        return Response(serializer.data)
+
 
 @extend_schema_view(
     create=extend_schema(summary=_("Create a new book edition")),
-    list=extend_schema(summary=_("List all book editions")),
+    list=extend_schema(summary=_("List all editions of a book")),
     retrieve=extend_schema(summary=_("Retrieve a specific book edition")),
     partial_update=extend_schema(summary=_("Partially update a specific book edition")),
     update=extend_schema(summary=_("Update a specific book edition")),
     destroy=extend_schema(summary=_("Delete a specific book edition")),
+    availability=extend_schema(
+        summary=_("Summarize the availability of a book edition's copies"),
+        responses=serializers.EditionAvailabilitySerializer,
+    ),
 )
-class BookEditionViewSet(ModelViewSet):
+class BookEditionViewSet(
+    NestedViewSetMixin,
+    CachedResponseMixin,
+    ReplicaReadMixin,
+    ModelViewSet,
+):
     queryset = models.BookEdition.objects.all()
     serializer_class = serializers.BookEditionSerializer
-    filter_backends = [SearchFilter]
+    filter_backends = [SearchVectorFilter, SparseFieldsetFilter]
     search_fields = [
         "isbn",
         "book__title",
         "publisher__name",
         "book__author__full_name",
     ]
+    # NOTE: Search documents depend on publisher names, too
+    cache_resources = (EDITIONS, BOOKS, AUTHORS, PUBLISHERS, COPIES)
+    # NOTE: Served by the `(book_id, isbn)` index
+    keyset_ordering = ("isbn",)
+    parent_lookups = {"book_id": "book_id"}
+    parent_field = "book"
     http_method_names = DEFAULT_HTTP_METHODS
 
+    @action(detail=True, filter_backends=[])
+    def availability(self, request, *args, **kwargs):
+        # NOTE: Read from the aggregates, see `bookaloo.books.availability`
+        edition = self.get_object()
+        serializer = serializers.EditionAvailabilitySerializer(
+            get_edition_availability(edition.pk),
+        )
+        return Response(serializer.data)
+
+
+@extend_schema_view(
+    list=extend_schema(summary=_("List all editions of a publisher")),
+    retrieve=extend_schema(summary=_("Retrieve a specific edition of a publisher")),
+)
+class PublisherEditionViewSet(
+    NestedViewSetMixin,
+    CachedResponseMixin,
+    ReplicaReadMixin,
+    ReadOnlyModelViewSet,
+):
+    queryset = models.BookEdition.objects.all()
+    serializer_class = serializers.BookEditionSerializer
+    filter_backends = [SearchVectorFilter, SparseFieldsetFilter]
+    search_fields = BookEditionViewSet.search_fields
+    cache_resources = BookEditionViewSet.cache_resources
+    # NOTE: Served by the `(publisher_ref, isbn)` index
+    keyset_ordering = ("isbn",)
+    parent_lookups = {"publisher_id": "publisher_id"}
+    http_method_names = ["head", "options", "get"]
+
 
 @extend_schema_view(
     create=extend_schema(summary=_("Create a new book copy")),
-    list=extend_schema(summary=_("List all book copies")),
+    list=extend_schema(summary=_("List all copies of a book edition")),
     retrieve=extend_schema(summary=_("Retrieve a specific book copy")),
     partial_update=extend_schema(summary=_("Partially update a specific book copy")),
     update=extend_schema(summary=_("Update a specific book copy")),
     destroy=extend_schema(summary=_("Delete a specific book copy")),
 )
-class BookCopyViewSet(ModelViewSet):
+class BookCopyViewSet(NestedViewSetMixin, ReplicaReadMixin, ModelViewSet):
     queryset = models.BookCopy.objects.all()
     serializer_class = serializers.BookCopySerializer
-    filter_backends = [SearchFilter]
+    filter_backends = [SearchVectorFilter, SparseFieldsetFilter]
     search_fields = [
         "identifier",
         "book_edition__isbn",
@@ -117,4 +192,11 @@ class BookCopyViewSet(ModelViewSet):
         "book_edition__book__author__full_name",
         "book_edition__publisher__name",
     ]
+    # NOTE: Served by the `(book_edition_id, identifier)` index
+    keyset_ordering = ("identifier",)
+    parent_lookups = {
+        "book_id": "book_edition__book_id",
+        "edition_id": "book_edition_id",
+    }
+    parent_field = "book_edition"
     http_method_names = DEFAULT_HTTP_METHODS
@@ -0,0 +1,308 @@
+"""
+Prometheus metrics of the API, the loan desk, the caches and Celery.
+
+With several worker processes (gunicorn, Celery's prefork pool), metrics
+are collected with `prometheus_client`'s multiprocess mode: every process
+writes its samples to files in `PROMETHEUS_MULTIPROC_DIR`, which must be
+set (and emptied) before the processes start, and `/metrics` aggregates
+them. Without the variable, the process' own registry is exposed.
+
+Request metrics are collected by `MetricsMiddleware` when `METRICS_ENABLED`
+is set, along with the state of the database connection pools (see the
+`DATABASE_POOL` setting) at the end of each request; Celery workers expose
+their metrics on `CELERY_METRICS_PORT`.
+
+`/metrics` is served along with the public URLs; with `METRICS_TOKEN` set
+(required in production), scrapers must send it as a bearer token.
+"""
+
+import hmac
+import logging
+import os
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from asgiref.sync import sync_to_async
+from celery.signals import task_postrun
+from celery.signals import task_prerun
+from celery.signals import worker_init
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import request_finished
+from django.db import connections
+from django.db import transaction
+from django.http import Http404
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client import REGISTRY
+from prometheus_client import CollectorRegistry
+from prometheus_client import Counter
+from prometheus_client import Gauge
+from prometheus_client import Histogram
+from prometheus_client import generate_latest
+from prometheus_client import multiprocess
+from prometheus_client import start_http_server
+from prometheus_client.core import CounterMetricFamily
+
+from bookaloo.timing import wrap_queries
+
+logger = logging.getLogger(__name__)
+
+REQUESTS = Counter(
+    "bookaloo_http_requests_total",
+    "HTTP requests, per view, method and status code.",
+    ["view", "method", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "bookaloo_http_request_duration_seconds",
+    "Duration of the HTTP requests, per view and method.",
+    ["view", "method"],
+)
+DB_QUERIES = Counter(
+    "bookaloo_db_queries_total",
+    "Database queries run by the HTTP requests, per view.",
+    ["view"],
+)
+LOAN_OPERATIONS = Counter(
+    "bookaloo_loan_operations_total",
+    "Book copies lent out (checkout) and taken back (return).",
+    ["operation"],
+)
+API_CACHE_REQUESTS = Counter(
+    "bookaloo_api_cache_requests_total",
+    "Lookups of the API response cache, per resource and outcome (hit/miss).",
+    ["resource", "outcome"],
+)
+CELERY_TASKS = Counter(
+    "bookaloo_celery_tasks_total",
+    "Celery tasks run, per task and final state.",
+    ["task", "state"],
+)
+CELERY_TASK_DURATION = Histogram(
+    "bookaloo_celery_task_duration_seconds",
+    "Duration of the Celery tasks, per task.",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, float("inf")),
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "bookaloo_db_pool_connections",
+    "Connections of the database pools, per database and state (in_use/idle).",
+    ["database", "state"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAITING = Gauge(
+    "bookaloo_db_pool_waiting_requests",
+    "Requests waiting for a connection of the database pools, per database.",
+    ["database"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Counter(
+    "bookaloo_db_pool_wait_seconds_total",
+    "Time spent waiting for a connection of the database pools, per database.",
+    ["database"],
+)
+DB_POOL_EVENTS = Counter(
+    "bookaloo_db_pool_events_total",
+    "Events of the database pools, per database: connections opened, lost "
+    "and returned broken, and requests timed out waiting for a connection.",
+    ["database", "event"],
+)
+
+# `psycopg_pool` statistics counted as `DB_POOL_EVENTS`
+DB_POOL_EVENT_STATS = {
+    "connections_num": "connection_opened",
+    "connections_lost": "connection_lost",
+    "returns_bad": "connection_returned_bad",
+    "requests_errors": "request_timed_out",
+}
+
+CHECKOUT = "checkout"
+RETURN = "return"
+
+
+def record_loan_operations(operation, count=1):
+    """
+    Counts lent out or returned copies once the transaction is committed.
+    """
+    if count:
+        transaction.on_commit(lambda: LOAN_OPERATIONS.labels(operation).inc(count))
+
+
+def get_registry():
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+class RedisCacheCollector:
+    """
+    Collects the hit and miss counts of the Redis server behind the default
+    cache, which all processes share.
+    """
+
+    def collect(self):
+        try:
+            from django_redis import get_redis_connection
+
+            stats = get_redis_connection("default").info("stats")
+        except Exception:  # noqa: BLE001
+            # Not a Redis cache, or Redis is unavailable
+            return
+        for name in ("keyspace_hits", "keyspace_misses"):
+            metric = CounterMetricFamily(
+                f"bookaloo_redis_{name}",
+                f"Redis {name.replace('_', ' ')} of the default cache.",
+            )
+            metric.add_metric([], stats[name])
+            yield metric
+
+
+def has_metrics_token(request):
+    """
+    Tells whether the request carries the `METRICS_TOKEN` bearer token,
+    if one is set.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        return True
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(
+        credentials.encode(),
+        token.encode(),
+    )
+
+
+def metrics_view(request):
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    if not has_metrics_token(request):
+        response = HttpResponse(status=401)
+        response["WWW-Authenticate"] = 'Bearer realm="metrics"'
+        return response
+    cache_registry = CollectorRegistry()
+    cache_registry.register(RedisCacheCollector())
+    return HttpResponse(
+        generate_latest(get_registry()) + generate_latest(cache_registry),
+        content_type=CONTENT_TYPE_LATEST,
+    )
+
+
+class MetricsMiddleware:
+    """
+    Counts and times the requests, and counts their queries, per view.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        counter = QueryCounter()
+        started_at = time.perf_counter()
+        with ExitStack() as stack:
+            wrap_queries(stack, counter)
+            response = self.get_response(request)
+        return self.record(request, response, started_at, counter.count)
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        started_at = time.perf_counter()
+        with ExitStack() as stack:
+            await sync_to_async(wrap_queries)(stack, counter)
+            response = await self.get_response(request)
+        return self.record(request, response, started_at, counter.count)
+
+    def record(self, request, response, started_at, query_count):
+        duration = time.perf_counter() - started_at
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        REQUESTS.labels(view, request.method, response.status_code).inc()
+        REQUEST_DURATION.labels(view, request.method).observe(duration)
+        DB_QUERIES.labels(view).inc(query_count)
+        return response
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def record_pool_stats():
+    """
+    Records the state of the connection pools of the current thread's
+    connections, and their events since the previous call.
+    """
+    for connection in connections.all(initialized_only=True):
+        # NOTE: Only PostgreSQL connections have pools
+        pool = getattr(connection, "pool", None)
+        if pool is None:
+            continue
+        alias = connection.alias
+        stats = pool.pop_stats()
+        idle = stats["pool_available"]
+        DB_POOL_CONNECTIONS.labels(alias, "idle").set(idle)
+        DB_POOL_CONNECTIONS.labels(alias, "in_use").set(stats["pool_size"] - idle)
+        DB_POOL_WAITING.labels(alias).set(stats["requests_waiting"])
+        DB_POOL_WAIT.labels(alias).inc(stats.get("requests_wait_ms", 0) / 1000)
+        for name, event in DB_POOL_EVENT_STATS.items():
+            DB_POOL_EVENTS.labels(alias, event).inc(stats.get(name, 0))
+
+
+@request_finished.connect
+def _on_request_finished(**kwargs):
+    # NOTE: Connected after Django's own handler, which hands the
+    # connections back to their pools
+    if settings.METRICS_ENABLED:
+        record_pool_stats()
+
+
+# Celery
+# ------------------------------------------------------------------------------
+_task_started_at = {}
+
+
+@task_prerun.connect
+def _on_task_prerun(task_id, task, **kwargs):
+    _task_started_at[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _on_task_postrun(task_id, task, state, **kwargs):
+    started_at = _task_started_at.pop(task_id, None)
+    CELERY_TASKS.labels(task.name, state).inc()
+    if started_at is not None:
+        CELERY_TASK_DURATION.labels(task.name).observe(
+            time.perf_counter() - started_at,
+        )
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(pid, **kwargs):
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
+
+
+@worker_init.connect
+def _on_worker_init(**kwargs):
+    port = settings.CELERY_METRICS_PORT
+    if settings.METRICS_ENABLED and port:
+        start_http_server(port, registry=get_registry())
+        logger.info("Serving the Celery metrics on port %s", port)
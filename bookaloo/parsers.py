@@ -0,0 +1,34 @@
+import codecs
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from bookaloo.renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """
+    A drop-in replacement of `JSONParser` based on `orjson`.
+
+    Like `JSONParser` with the default `STRICT_JSON` setting,
+    it rejects `NaN` and `Infinity` constants.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if not self.strict:
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            data = stream.read()
+            if codecs.lookup(encoding).name != "utf-8":
+                data = data.decode(encoding)
+            return orjson.loads(data)
+        except ValueError as exc:
+            msg = f"JSON parse error - {exc}"
+            raise ParseError(msg) from exc
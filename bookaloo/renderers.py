@@ -0,0 +1,105 @@
+import csv
+import io
+
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.renderers import JSONRenderer
+
+# Characters valid in JSON strings but not in JavaScript ones, as UTF-8
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    A drop-in replacement of `JSONRenderer` based on `orjson`.
+
+    It renders the same bytes as `JSONRenderer` with the default
+    `UNICODE_JSON` and `COMPACT_JSON` settings: types `orjson` doesn't
+    handle the same way (datetimes, decimals, lazy translation strings...)
+    are passed to DRF's `JSONEncoder`. Indented output (e.g. for the
+    browsable API) and any other settings are rendered by `JSONRenderer`.
+
+    Unlike `JSONRenderer`, which raises `ValueError` on NaN and infinite
+    floats (`STRICT_JSON`), it renders them as `null`. It can be swapped
+    back for `JSONRenderer` with the `API_ORJSON` setting.
+    """
+
+    options = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=self.options,
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers over 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escaped the same way `JSONRenderer` does,
+        # to output JSON that is a strict JavaScript subset
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(LINE_SEPARATOR, b"\\u2028").replace(
+                PARAGRAPH_SEPARATOR,
+                b"\\u2029",
+            )
+        return ret
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renders newline-delimited JSON: one line per item of a list,
+    or a single line otherwise (e.g. for error details).
+
+    Views streaming large NDJSON bodies (see `bookaloo.books.exports`)
+    use it for content negotiation and render their rows themselves.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        items = data if isinstance(data, list) else [data]
+        renderer = ORJSONRenderer()
+        return b"".join(renderer.render(item) + b"\n" for item in items)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renders a list of flat dicts (or a single one, e.g. error details)
+    as CSV with a header line.
+
+    Views streaming large CSV bodies (see `bookaloo.books.exports`)
+    use it for content negotiation and render their rows themselves.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset: str = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        items = data if isinstance(data, list) else [data]
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=list(items[0]) if items else [])
+        writer.writeheader()
+        writer.writerows(items)
+        return output.getvalue().encode(self.charset)
@@ -0,0 +1,190 @@
+"""
+Reads of the catalog from the database replicas.
+
+Replicas are configured with `DATABASE_REPLICA_URLS` (see the settings) and
+listed in `DATABASE_REPLICAS`. Views with `ReplicaReadMixin` run their
+safe-method requests against one of them, picked at random among the ones
+lagging behind the primary by less than `DATABASE_REPLICA_MAX_LAG` seconds,
+and fall back to the primary when there are none. `ReplicaRouter` routes
+the reads of the catalog models (the `books` app) within such requests,
+everything else, writes included, goes to the primary.
+
+Read-your-writes:
+
+- `ReplicaStickinessMiddleware` sets a cookie on the responses to successful
+  writes (loans, returns, catalog changes), which keeps the reads of that
+  client on the primary for `DATABASE_REPLICA_MAX_LAG` seconds;
+- cached responses (see `bookaloo.books.cache`) are read from the primary
+  while their resources were modified within the last
+  `DATABASE_REPLICA_MAX_LAG` seconds, so that a lagging replica can't get
+  a stale response cached under the new generation.
+
+The lag of each replica is checked at most every `REPLICA_LAG_CHECK_INTERVAL`
+seconds per process; a replica that can't be reached counts as lagging.
+"""
+
+import logging
+import math
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError
+from django.db import connections
+from django.db import transaction
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.permissions import SAFE_METHODS
+
+from bookaloo.views import AsyncReadMixin
+
+logger = logging.getLogger(__name__)
+
+REPLICA_APP_LABELS = {"books"}
+REPLICA_LAG_CHECK_INTERVAL = 5
+STICKY_COOKIE = "bookaloo_primary"
+
+# Database the reads of the current request are routed to (`None`: the primary)
+_read_database = ContextVar("read_database", default=None)
+
+# Last measured lag, in seconds, and when it was measured, per replica
+_replica_lags: dict[str, tuple[float, float]] = {}
+
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+          OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()),
+            'Infinity'
+        )
+    END
+"""
+
+
+def get_replica_lag(alias):
+    """
+    Returns the replication lag of the replica in seconds, cached for
+    `REPLICA_LAG_CHECK_INTERVAL` seconds. Caught up replicas lag by 0,
+    even if the primary hasn't written anything for a while.
+    """
+    checked_at, lag = _replica_lags.get(alias, (None, None))
+    if checked_at is not None and time.monotonic() - checked_at < (
+        REPLICA_LAG_CHECK_INTERVAL
+    ):
+        return lag
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            (value,) = cursor.fetchone()
+        lag = float(value)
+    except DatabaseError:
+        logger.warning("Replica %s is unavailable", alias, exc_info=True)
+        lag = math.inf
+    _replica_lags[alias] = (time.monotonic(), lag)
+    return lag
+
+
+def get_read_database(request):
+    """
+    Picks the replica to read from for the request, or `None` for the primary.
+    """
+    if not settings.DATABASE_REPLICAS or STICKY_COOKIE in request.COOKIES:
+        return None
+    replicas = [
+        alias
+        for alias in settings.DATABASE_REPLICAS
+        if get_replica_lag(alias) <= settings.DATABASE_REPLICA_MAX_LAG
+    ]
+    return random.choice(replicas) if replicas else None  # noqa: S311
+
+
+def is_reading_from_replica():
+    return _read_database.get() is not None
+
+
+@contextmanager
+def read_from(alias):
+    """
+    Routes the reads of the catalog within the block to `alias`
+    (`None` for the primary).
+    """
+    token = _read_database.set(alias)
+    try:
+        yield
+    finally:
+        _read_database.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in REPLICA_APP_LABELS:  # noqa: SLF001
+            return _read_database.get()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # NOTE: Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class ReplicaReadMixin(AsyncReadMixin):
+    """
+    Runs the safe-method requests of the view against a replica, without
+    a transaction; the other requests run against the primary, in one.
+    Reads can be served asynchronously, see `AsyncReadMixin`.
+    """
+
+    @classmethod
+    def as_view(cls, *args, **kwargs):
+        # NOTE: The transaction of the writes is opened in `dispatch`
+        return transaction.non_atomic_requests(super().as_view(*args, **kwargs))
+
+    @classmethod
+    def make_view_atomic(cls, view):
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            with transaction.atomic():
+                return super().dispatch(request, *args, **kwargs)
+        if self.is_async_request(request):
+            # NOTE: The replica is picked in `adispatch`
+            return super().dispatch(request, *args, **kwargs)
+        with read_from(get_read_database(request)):
+            return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        database = await sync_to_async(get_read_database)(request)
+        with read_from(database):
+            return await super().adispatch(request, *args, **kwargs)
+
+
+class ReplicaStickinessMiddleware(MiddlewareMixin):
+    """
+    Keeps the reads of a client on the primary for a while after its writes.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_response(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:  # noqa: PLR2004
+            response.set_cookie(
+                STICKY_COOKIE,
+                "1",
+                max_age=math.ceil(settings.DATABASE_REPLICA_MAX_LAG),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,277 @@
+"""
+Per-request timing of database queries, serialization and rendering.
+
+`ServerTimingMiddleware` times a sample of the requests (see the
+`SERVER_TIMING_SAMPLE_RATE` setting) and reports, in a `Server-Timing`
+header and a log line:
+
+- `db`: time spent executing queries, through the connections'
+  `execute_wrapper`, with the number of queries and of duplicates;
+- `serialize`: time spent building `serializer.data`, queries excluded;
+- `render`: time spent rendering the response, queries excluded;
+- `app`: the rest of the time spent in the view and the middleware;
+- `total`.
+
+Duplicate queries (typically N+1 patterns) are found by their fingerprint:
+the SQL without parameters, with `IN (...)` lists collapsed.
+
+When the middleware is disabled, it is removed from the middleware chain,
+and `measure` only looks up a context variable. Timing `serializer.data`
+takes wrapping DRF's `BaseSerializer.data`, which is only done at startup
+(see `BooksConfig.ready`) when `SERVER_TIMING_SAMPLE_RATE` is set.
+"""
+
+import hashlib
+import logging
+import random
+import re
+import time
+from collections import Counter
+from collections import defaultdict
+from contextlib import ExitStack
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+import orjson
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+_request_timing: ContextVar["RequestTiming | None"] = ContextVar(
+    "request_timing",
+    default=None,
+)
+
+IN_LIST_RE = re.compile(r"IN \((?:%s, )*%s\)")
+
+
+def get_query_fingerprint(sql):
+    normalized = " ".join(IN_LIST_RE.sub("IN (...)", sql).split())
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]  # noqa: S324
+
+
+class RequestTiming:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.durations = defaultdict(float)
+        self.query_count = 0
+        self.fingerprints: Counter[str] = Counter()
+        self.statements = {}
+        self._active_spans = set()
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.durations["db"] += time.perf_counter() - started_at
+            self.query_count += 1
+            fingerprint = get_query_fingerprint(sql)
+            self.fingerprints[fingerprint] += 1
+            self.statements.setdefault(fingerprint, sql)
+
+    @contextmanager
+    def span(self, name):
+        """
+        Adds the time spent in the block to `name`, queries excluded.
+        """
+        if name in self._active_spans:
+            # Already timed by an outer block
+            yield
+            return
+        self._active_spans.add(name)
+        started_at = time.perf_counter()
+        db_duration = self.durations["db"]
+        try:
+            yield
+        finally:
+            self._active_spans.discard(name)
+            self.durations[name] += (
+                time.perf_counter() - started_at - (self.durations["db"] - db_duration)
+            )
+
+    def get_repeated_queries(self):
+        return {
+            fingerprint: count
+            for fingerprint, count in self.fingerprints.most_common()
+            if count > 1
+        }
+
+    def get_metrics(self):
+        """
+        Returns the durations, in milliseconds.
+        """
+        total = time.perf_counter() - self.started_at
+        durations = {
+            name: self.durations[name] for name in ("db", "serialize", "render")
+        }
+        durations["app"] = max(total - sum(durations.values()), 0)
+        durations["total"] = total
+        return {name: round(duration * 1000, 2) for name, duration in durations.items()}
+
+
+def wrap_queries(stack, wrapper):
+    """
+    Wraps the queries of the current thread's connections with `wrapper`
+    until `stack` is closed.
+
+    Under ASGI, the sync code of a request, the queries of the async ORM
+    included, runs in a single thread (see asgiref's `ThreadSensitiveContext`),
+    so calling this with `sync_to_async` wraps all the queries of the request.
+    """
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(wrapper))
+
+
+@contextmanager
+def measure(name):
+    """
+    Times the block as `name`, if the current request is being timed.
+    """
+    timing = _request_timing.get()
+    if timing is None:
+        yield
+        return
+    with timing.span(name):
+        yield
+
+
+def _timed_serializer_data(fget):
+    @wraps(fget)
+    def data(self):
+        with measure("serialize"):
+            return fget(self)
+
+    data.is_timed = True  # type: ignore[attr-defined]
+    return property(data)
+
+
+def install_serializer_timing():
+    """
+    Times `serializer.data` of all serializers (nested serializers
+    are a part of their parents' data).
+    """
+    fget = vars(BaseSerializer)["data"].fget
+    if not getattr(fget, "is_timed", False):
+        setattr(BaseSerializer, "data", _timed_serializer_data(fget))  # noqa: B010
+
+
+def uninstall_serializer_timing():
+    """
+    Restores the original `serializer.data`.
+    """
+    fget = vars(BaseSerializer)["data"].fget
+    if getattr(fget, "is_timed", False):
+        setattr(BaseSerializer, "data", property(fget.__wrapped__))  # noqa: B010
+
+
+class ServerTimingMiddleware:
+    """
+    Reports the timing of a sample of the requests; see the module docstring.
+    Should come first, so that it times the other middleware, too.
+    """
+
+    header = "Server-Timing"
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.SERVER_TIMING_SAMPLE_RATE
+        if not self.sample_rate:
+            raise MiddlewareNotUsed
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:  # noqa: S311
+            return self.get_response(request)
+
+        timing = RequestTiming()
+        token = _request_timing.set(timing)
+        try:
+            with ExitStack() as stack:
+                wrap_queries(stack, timing.execute_wrapper)
+                response = self.get_response(request)
+        finally:
+            _request_timing.reset(token)
+        return self.report(request, response, timing)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:  # noqa: S311
+            return await self.get_response(request)
+
+        timing = RequestTiming()
+        token = _request_timing.set(timing)
+        try:
+            with ExitStack() as stack:
+                await sync_to_async(wrap_queries)(stack, timing.execute_wrapper)
+                response = await self.get_response(request)
+        finally:
+            _request_timing.reset(token)
+        return self.report(request, response, timing)
+
+    def report(self, request, response, timing):
+        metrics = timing.get_metrics()
+        repeated = timing.get_repeated_queries()
+        response[self.header] = self.get_header(metrics, timing.query_count, repeated)
+        self.log(request, response, metrics, timing, repeated)
+        return response
+
+    def process_template_response(self, request, response):
+        timing = _request_timing.get()
+        if timing is None:
+            return response
+        render = response.render
+
+        def timed_render():
+            with timing.span("render"):
+                return render()
+
+        response.render = timed_render
+        return response
+
+    def get_header(self, metrics, query_count, repeated):
+        db_description = f"{query_count} queries"
+        if repeated:
+            duplicates = sum(count - 1 for count in repeated.values())
+            db_description += f", {duplicates} duplicates"
+        entries = [f'db;dur={metrics["db"]};desc="{db_description}"']
+        entries.extend(
+            f"{name};dur={metrics[name]}"
+            for name in ("serialize", "render", "app", "total")
+        )
+        return ", ".join(entries)
+
+    def log(self, request, response, metrics, timing, repeated):
+        payload = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            **{f"{name}_ms": duration for name, duration in metrics.items()},
+            "queries": timing.query_count,
+            "repeated_queries": [
+                {
+                    "fingerprint": fingerprint,
+                    "count": count,
+                    "sql": timing.statements[fingerprint][:300],
+                }
+                for fingerprint, count in repeated.items()
+            ],
+        }
+        logger.info(
+            "server_timing %s",
+            orjson.dumps(payload).decode(),
+            extra={"server_timing": payload},
+        )
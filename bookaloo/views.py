@@ -1,6 +1,501 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode
+from base64 import urlsafe_b64encode
+from functools import wraps
+from typing import TYPE_CHECKING
+from typing import cast
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db import connections
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
+    from django.db.models import QuerySet
+    from rest_framework.generics import GenericAPIView
+
+    class _GenericAPIView(GenericAPIView): ...
+else:
+    _GenericAPIView = object
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination over a stable `(sort_key, id)` ordering.
+
+    Instead of `COUNT(*)` and `OFFSET`, each page is fetched with a
+    `WHERE (sort_key, id) > (last_sort_key, last_id)` condition, which is
+    served by a matching composite index, so the cost of a page doesn't
+    depend on how deep the client has gone.
+
+    The ordering is taken from the view's `keyset_ordering` attribute;
+    all of its fields must be non-nullable, local fields sorted
+    in the same direction, ending with a unique one. Querysets already
+    ordered otherwise, e.g. ranked by a search, are rejected with a 400.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = _("The pagination cursor value.")
+    page_size_query_param = "page_size"
+    page_size_query_description = _("Number of results to return per page.")
+    page_size = 100
+    max_page_size = 1000
+    ordering = ("id",)
+    invalid_cursor_message = _("Invalid cursor")
+    ordered_queryset_message = _(
+        "Cursor pagination can't keep the order of these results; "
+        "use page numbers instead.",
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.prepare_queryset(queryset, request, view)
+        return self.set_page(list(queryset[: self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.prepare_queryset(queryset, request, view)
+        return self.set_page([obj async for obj in queryset[: self.page_size + 1]])
+
+    def prepare_queryset(self, queryset, request, view):
+        """
+        Returns the ordered and filtered queryset of the requested page.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        ordering = self.get_ordering(view)
+        if queryset.query.order_by and tuple(queryset.query.order_by) != ordering:
+            # NOTE: E.g. ranked by `?search=`, which the seek can't follow
+            raise exceptions.ValidationError(self.ordered_queryset_message)
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip("-"))  # noqa: SLF001
+            for name in ordering
+        ]
+        descending = ordering[0].startswith("-")
+
+        self.cursor = self.decode_cursor(request)
+        self.backwards = bool(self.cursor and self.cursor["backwards"])
+        if self.backwards:
+            descending = not descending
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(*(prefix + field.name for field in self.fields))
+        if self.cursor is not None:
+            queryset = queryset.filter(
+                self.get_seek_filter(self.cursor["values"], descending=descending),
+            )
+        return queryset
+
+    def set_page(self, results):
+        """
+        Sets the page from the fetched rows, one more than the page size
+        if there are more to come.
+        """
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if self.backwards:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        self.page = results
+        return results
+
+    def get_ordering(self, view):
+        ordering = tuple(getattr(view, "keyset_ordering", self.ordering))
+        directions = {name.startswith("-") for name in ordering}
+        assert len(directions) == 1, (
+            "All `keyset_ordering` fields must be sorted in the same direction."
+        )
+        return ordering
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_seek_filter(self, values, *, descending):
+        """
+        Returns the condition selecting the rows placed after `values`.
+
+        For `(a, id)` ascending, this is `a >= x AND (a > x OR (a = x AND id > y))`;
+        the redundant first term lets the database range-scan the index.
+        """
+        lookup = "lt" if descending else "gt"
+        names = [field.name for field in self.fields]
+        seek = Q()
+        for index, name in enumerate(names):
+            equal = {names[i]: values[i] for i in range(index)}
+            seek |= Q(**equal, **{f"{name}__{lookup}": values[index]})
+        return Q(**{f"{names[0]}__{lookup}e": values[0]}) & seek
+
+    def encode_cursor(self, obj, *, backwards):
+        payload: dict[str, object] = {
+            "v": [field.value_to_string(obj) for field in self.fields],
+        }
+        if backwards:
+            payload["b"] = 1
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        token = urlsafe_b64encode(data).decode().rstrip("=")
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            raw_values = payload["v"]
+            if len(raw_values) != len(self.fields):
+                raise ValueError  # noqa: TRY301
+            values = [
+                field.to_python(value)
+                for field, value in zip(self.fields, raw_values, strict=True)
+            ]
+        except (
+            binascii.Error,
+            KeyError,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+        return {"values": values, "backwards": bool(payload.get("b"))}
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], backwards=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], backwards=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            },
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.page_size_query_description),
+                "schema": {"type": "integer"},
+            },
+        ]
 
 
 class DefaultPagination(PageNumberPagination):
+    """
+    Page number pagination, with opt-in keyset pagination.
+
+    Clients switch to keyset pagination per request with `?pagination=cursor`
+    (or by following a link carrying a `cursor`), which skips the `COUNT(*)`
+    and keeps the cost of deep pages constant.
+    """
+
     page_size = 100
     max_page_size = 1000
+    pagination_query_param = "pagination"
+    pagination_query_description = _(
+        "Set to `cursor` to use keyset pagination instead of page numbers.",
+    )
+    keyset_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_paginator = None
+        if self.is_keyset_requested(request):
+            self.keyset_paginator = self.keyset_pagination_class()
+            return self.keyset_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(self.order(queryset, view), request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Same as `paginate_queryset`, with the queries run asynchronously.
+        """
+        self.keyset_paginator = None
+        if self.is_keyset_requested(request):
+            self.keyset_paginator = self.keyset_pagination_class()
+            return await self.keyset_paginator.apaginate_queryset(
+                queryset,
+                request,
+                view,
+            )
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        queryset = self.order(queryset, view)
+        paginator = self.django_paginator_class(queryset, page_size)
+        # NOTE: Set in advance, as `Paginator.count` is a cached property
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number,
+                message=str(exc),
+            )
+            raise NotFound(msg) from exc
+        object_list = cast("QuerySet", self.page.object_list)
+        self.page.object_list = [obj async for obj in object_list]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return list(self.page)
+
+    def order(self, queryset, view):
+        if queryset.ordered:
+            return queryset
+        ordering = getattr(view, "keyset_ordering", KeysetPagination.ordering)
+        return queryset.order_by(*ordering)
+
+    def is_keyset_requested(self, request):
+        keyset_cursor = self.keyset_pagination_class.cursor_query_param
+        return (
+            request.query_params.get(self.pagination_query_param) == "cursor"
+            or keyset_cursor in request.query_params
+        )
+
+    def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        keyset_pagination = self.keyset_pagination_class()
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.pagination_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.pagination_query_description),
+                "schema": {"type": "string", "enum": ["page", "cursor"]},
+            },
+            *keyset_pagination.get_schema_operation_parameters(view),
+        ]
+
+
+class AsyncReadMixin(_GenericAPIView):
+    """
+    Serves the read-only actions of a generic view or viewset asynchronously,
+    when `ASYNC_VIEWS` is set (see `config.asgi`).
+
+    The actions listed in `async_actions` are served by their `a`-prefixed
+    counterparts, which run the queries with the async ORM, and the rest of
+    the request (authentication, serialization) on the event loop. The view
+    runs the other actions synchronously in a thread, as Django does for
+    sync views.
+
+    Generic views (not viewsets) map the `GET` requests to `list`.
+    """
+
+    async_actions = ("list", "retrieve")
+    action_map = {"get": "list", "head": "list"}
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+        if not settings.ASYNC_VIEWS:
+            return view
+        action_map = getattr(view, "actions", None) or cls.action_map
+        async_methods = {
+            method
+            for method, action in action_map.items()
+            if action in cls.async_actions
+        }
+        if "get" in async_methods:
+            async_methods.add("head")
+        sync_view = sync_to_async(cls.make_view_atomic(view))
+
+        @wraps(view)
+        async def async_view(request, *args, **kwargs):
+            if request.method.lower() in async_methods:
+                # NOTE: `dispatch` returns the coroutine of `adispatch`
+                return await cast("Awaitable[Response]", view(request, *args, **kwargs))
+            return await sync_view(request, *args, **kwargs)
+
+        # NOTE: Django can't wrap async views in `ATOMIC_REQUESTS`
+        #       transactions; the sync ones are wrapped above
+        async_view._non_atomic_requests = set(connections.settings)  # type: ignore[attr-defined]  # noqa: SLF001
+        return async_view
+
+    @classmethod
+    def make_view_atomic(cls, view):
+        """
+        Wraps the view in the transactions of `ATOMIC_REQUESTS`,
+        as Django does for sync views.
+        """
+        non_atomic_requests: set[str] = getattr(view, "_non_atomic_requests", set())
+        for alias, settings_dict in connections.settings.items():
+            if settings_dict["ATOMIC_REQUESTS"] and alias not in non_atomic_requests:
+                view = transaction.atomic(using=alias)(view)
+        return view
+
+    def is_async_request(self, request):
+        return (
+            settings.ASYNC_VIEWS
+            and self.action_map.get(request.method.lower()) in self.async_actions
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.is_async_request(request):
+            return self.adispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """
+        Same as `APIView.dispatch`, with an async handler.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            # NOTE: Authentication may query the sessions or tokens
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            action = self.action_map[request.method.lower()]
+            handler = getattr(self, f"a{action}")
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:  # noqa: BLE001
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+    async def apaginate_queryset(self, queryset):
+        # NOTE: Async views need a paginator with `apaginate_queryset`
+        paginator = cast("DefaultPagination | KeysetPagination | None", self.paginator)
+        if paginator is None:
+            return None
+        return await paginator.apaginate_queryset(
+            queryset,
+            self.request,
+            view=self,
+        )
+
+    async def aget_object(self):
+        """
+        Same as `GenericAPIView.get_object`, with the query run asynchronously.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+            )
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404 from None
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+class NestedViewSetMixin(_GenericAPIView):
+    """
+    Scopes a viewset registered under the URL of its parent, e.g.
+    `books/<int:book_id>/editions`, to the children of that parent.
+
+    `parent_lookups` maps the URL keyword arguments to the lookups filtering
+    the queryset, so that lists, lookups and writes only ever touch the
+    parent's children (and can be served by indexes starting with the parent's
+    foreign key). Created objects are attached to `get_parent()` as
+    `parent_field`, which isn't writable through the serializer.
+    """
+
+    parent_lookups: dict[str, str] = {}
+    parent_field: str | None = None
+    # NOTE: Path-based routers would otherwise match the lookups with `path`
+    lookup_value_converter = "int"
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if getattr(self, "swagger_fake_view", False):
+            # NOTE: Schema generation has no URL keyword arguments
+            return queryset.none()
+        return queryset.filter(
+            **{
+                lookup: self.kwargs[url_kwarg]
+                for url_kwarg, lookup in self.parent_lookups.items()
+            },
+        )
+
+    def get_parent(self):
+        """
+        Returns the parent the URL points to, or raises `Http404`.
+
+        The parent is looked up with the `parent_lookups` going through
+        `parent_field`, e.g. `book_edition_id` as its primary key and
+        `book_edition__book_id` as its `book_id`.
+        """
+        field = self.get_queryset().model._meta.get_field(self.parent_field)  # noqa: SLF001
+        prefix = f"{self.parent_field}__"
+        lookups = {}
+        for url_kwarg, lookup in self.parent_lookups.items():
+            if lookup in (self.parent_field, field.attname):
+                lookups["pk"] = self.kwargs[url_kwarg]
+            elif lookup.startswith(prefix):
+                lookups[lookup.removeprefix(prefix)] = self.kwargs[url_kwarg]
+        return get_object_or_404(field.related_model, **lookups)
+
+    def perform_create(self, serializer):
+        serializer.save(**{self.parent_field: self.get_parent()})
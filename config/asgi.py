@@ -0,0 +1,27 @@
+"""
+ASGI config for Bookaloo project.
+
+This module contains the ASGI application used by ASGI servers (uvicorn
+workers of gunicorn in production, see `compose/production/django/start`).
+It should expose a module-level variable named ``application``.
+
+Unlike under WSGI, the read-only catalog and loan list views are served
+asynchronously, with the async ORM (see `bookaloo.views.AsyncReadMixin`),
+so that slow clients and queries don't hold a worker thread each.
+
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# bookaloo directory.
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "bookaloo"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+os.environ.setdefault("DJANGO_ASYNC_VIEWS", "True")
+
+application = get_asgi_application()
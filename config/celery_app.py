@@ -26,3 +26,6 @@ def config_loggers(*args, **kwargs):
 
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks()
+
+# Connect the task metrics signal receivers, see `bookaloo.metrics`
+import bookaloo.metrics  # noqa: E402
@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration, loaded with `--config python:config.gunicorn`.
+"""
+
+import os
+
+from prometheus_client import multiprocess
+
+
+def child_exit(server, worker):
+    # Drops the live gauges of exited workers, see `bookaloo.metrics`
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def worker_exit(server, worker):
+    # Closes the connections of the database pools, see `DATABASE_POOL`
+    from django.db import connections
+
+    for connection in connections.all(initialized_only=True):
+        # NOTE: Only PostgreSQL connections have pools
+        close_pool = getattr(connection, "close_pool", None)
+        if close_pool is not None:
+            close_pool()
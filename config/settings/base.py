@@ -5,6 +5,7 @@ import ssl
 from pathlib import Path
 
 import environ
+from celery.schedules import crontab
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent.parent
 # bookaloo/
@@ -48,6 +49,16 @@ LOCALE_PATHS = [str(BASE_DIR / "locale")]
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {"default": env.db("DATABASE_URL")}
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Read replicas of the catalog, see `bookaloo.replicas`
+DATABASE_REPLICAS = []
+for index, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[])):
+    alias = f"replica{index + 1}"
+    DATABASES[alias] = env.db_url_config(url)
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+# Maximum replication lag of the replicas read from, in seconds
+DATABASE_REPLICA_MAX_LAG = env.float("DATABASE_REPLICA_MAX_LAG", default=5.0)
+DATABASE_ROUTERS = ["bookaloo.replicas.ReplicaRouter"]
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -57,6 +68,11 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 ROOT_URLCONF = "config.urls"
 # https://docs.djangoproject.com/en/dev/ref/settings/#wsgi-application
 WSGI_APPLICATION = "config.wsgi.application"
+# https://docs.djangoproject.com/en/dev/howto/deployment/asgi/
+ASGI_APPLICATION = "config.asgi.application"
+# Async implementations of the catalog and loan list views, for ASGI
+# servers (set by `config.asgi`), see `bookaloo.views.AsyncReadMixin`
+ASYNC_VIEWS = env.bool("DJANGO_ASYNC_VIEWS", default=False)
 
 # APPS
 # ------------------------------------------------------------------------------
@@ -69,6 +85,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     # "django.contrib.humanize", # Handy template tags
     "django.contrib.admin",
+    "django.contrib.postgres",
     "django.forms",
 ]
 THIRD_PARTY_APPS = [
@@ -136,6 +153,9 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "bookaloo.timing.ServerTimingMiddleware",
+    "bookaloo.metrics.MetricsMiddleware",
+    "bookaloo.replicas.ReplicaStickinessMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -300,6 +320,17 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 CELERY_TASK_SOFT_TIME_LIMIT = 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# https://docs.celeryq.dev/en/stable/userguide/periodic-tasks.html#beat-entries
+CELERY_BEAT_SCHEDULE = {
+    "scan-overdue-loans": {
+        "task": "bookaloo.books.tasks.scan_overdue_loans",
+        "schedule": crontab(minute=0),
+    },
+    "schedule-due-reminders": {
+        "task": "bookaloo.books.tasks.schedule_due_reminders",
+        "schedule": crontab(hour=8, minute=0),
+    },
+}
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-send-task-events
 CELERY_WORKER_SEND_TASK_EVENTS = True
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_send_sent_event
@@ -329,12 +360,28 @@ SOCIALACCOUNT_FORMS = {"signup": "bookaloo.users.forms.UserSocialSignupForm"}
 # django-rest-framework
 # -------------------------------------------------------------------------------
 # django-rest-framework - https://www.django-rest-framework.org/api-guide/settings/
+# Renders and parses JSON with `orjson` (see `bookaloo.renderers`), or with DRF's
+# stdlib-based renderer and parser when disabled
+API_ORJSON = env.bool("DJANGO_API_ORJSON", default=True)
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.TokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "bookaloo.renderers.ORJSONRenderer"
+        if API_ORJSON
+        else "rest_framework.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "bookaloo.parsers.ORJSONParser"
+        if API_ORJSON
+        else "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "bookaloo.views.DefaultPagination",
     "PAGE_SIZE": 100,
@@ -351,6 +398,30 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
     "SERVE_PERMISSIONS": ["rest_framework.permissions.AllowAny"],
     "SCHEMA_PATH_PREFIX": "/api/",
+    "ENUM_NAME_OVERRIDES": {
+        "BatchItemStatusEnum": "bookaloo.books.enums.BatchItemStatus",
+        "ReservationStatusEnum": "bookaloo.books.enums.ReservationStatus",
+    },
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+# API response cache and conditional GETs, see `bookaloo.books.cache`
+API_CACHE_ENABLED = env.bool("DJANGO_API_CACHE_ENABLED", default=False)
+API_CACHE_TIMEOUT = env.int("DJANGO_API_CACHE_TIMEOUT", default=5 * 60)
+API_CONDITIONAL_GET_ENABLED = env.bool(
+    "DJANGO_API_CONDITIONAL_GET_ENABLED",
+    default=False,
+)
+# Share of the requests reporting their timing in a `Server-Timing` header
+# and a log line (0 disables it), see `bookaloo.timing`
+SERVER_TIMING_SAMPLE_RATE = env.float("DJANGO_SERVER_TIMING_SAMPLE_RATE", default=0.0)
+# Prometheus metrics at `/metrics`, see `bookaloo.metrics`
+METRICS_ENABLED = env.bool("DJANGO_METRICS_ENABLED", default=False)
+# Bearer token the scrapers of `/metrics` must send (none required if unset)
+METRICS_TOKEN = env("DJANGO_METRICS_TOKEN", default="")
+# Port Celery workers serve their metrics on (none if unset)
+CELERY_METRICS_PORT = env.int("CELERY_METRICS_PORT", default=None)
+# ESP template of the due date reminders, sent as batches through Anymail
+# (rendered locally, one email at a time, if unset; required in production),
+# see `bookaloo.books.reminders`
+DUE_REMINDER_ESP_TEMPLATE = env("DJANGO_DUE_REMINDER_ESP_TEMPLATE", default="")
@@ -2,12 +2,14 @@
 import logging
 
 import sentry_sdk
+from psycopg_pool import ConnectionPool
 from sentry_sdk.integrations.celery import CeleryIntegration
 from sentry_sdk.integrations.django import DjangoIntegration
 from sentry_sdk.integrations.logging import LoggingIntegration
 from sentry_sdk.integrations.redis import RedisIntegration
 
 from .base import *  # noqa: F403
+from .base import ASYNC_VIEWS
 from .base import DATABASES
 from .base import INSTALLED_APPS
 from .base import REDIS_URL
@@ -23,7 +25,33 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["foxfactory.pl"])
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+# Behind a transaction-level pooler (PgBouncer's `pool_mode = transaction`),
+# a server connection is only ours for the duration of a transaction:
+# cursors can't outlive it, and session state can't be relied on.
+DATABASE_EXTERNAL_POOLER = env.bool("DATABASE_EXTERNAL_POOLER", default=False)
+# psycopg's connection pool, per worker process; pooled connections
+# are returned to the pool at the end of each request
+DATABASE_POOL = env.bool("DATABASE_POOL", default=False)
+for database in DATABASES.values():
+    # NOTE: Under ASGI, each request runs its queries in a thread of its own,
+    #       which would leave persistent connections behind; use the pool
+    database["CONN_MAX_AGE"] = (
+        0 if DATABASE_POOL or ASYNC_VIEWS else env.int("CONN_MAX_AGE", default=60)
+    )
+    # https://docs.djangoproject.com/en/dev/ref/databases/#transaction-pooling-server-side-cursors
+    database["DISABLE_SERVER_SIDE_CURSORS"] = DATABASE_EXTERNAL_POOLER
+    if DATABASE_POOL:
+        # https://www.psycopg.org/psycopg3/docs/api/pool.html#psycopg_pool.ConnectionPool
+        database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": env.int("DATABASE_POOL_MIN_SIZE", default=1),
+            "max_size": env.int("DATABASE_POOL_MAX_SIZE", default=4),
+            # Seconds to wait for a connection before failing the request
+            "timeout": env.float("DATABASE_POOL_TIMEOUT", default=10.0),
+            "max_idle": env.float("DATABASE_POOL_MAX_IDLE", default=300.0),
+            "max_lifetime": env.float("DATABASE_POOL_MAX_LIFETIME", default=3600.0),
+            # Health check of the connections, before handing them out
+            "check": ConnectionPool.check_connection,
+        }
 
 # CACHES
 # ------------------------------------------------------------------------------
@@ -151,6 +179,9 @@ ANYMAIL = {
     "POSTMARK_SERVER_TOKEN": env("POSTMARK_SERVER_TOKEN"),
     "POSTMARK_API_URL": env("POSTMARK_API_URL", default="https://api.postmarkapp.com/"),
 }
+# NOTE: Without a template, Postmark gets an API request per due date
+#       reminder instead of one per chunk, see `bookaloo.books.reminders`
+DUE_REMINDER_ESP_TEMPLATE = env("DJANGO_DUE_REMINDER_ESP_TEMPLATE")
 
 # Collectfasta
 # ------------------------------------------------------------------------------
@@ -225,3 +256,14 @@ SPECTACULAR_SETTINGS["SERVERS"] = [
 ]
 # Your stuff...
 # ------------------------------------------------------------------------------
+# API response cache and conditional GETs, see `bookaloo.books.cache`
+API_CACHE_ENABLED = env.bool("DJANGO_API_CACHE_ENABLED", default=True)
+API_CONDITIONAL_GET_ENABLED = env.bool(
+    "DJANGO_API_CONDITIONAL_GET_ENABLED",
+    default=True,
+)
+# Prometheus metrics, see `bookaloo.metrics`
+METRICS_ENABLED = env.bool("DJANGO_METRICS_ENABLED", default=False)
+if METRICS_ENABLED:
+    # NOTE: `/metrics` is served along with the public URLs
+    METRICS_TOKEN = env("DJANGO_METRICS_TOKEN")
@@ -8,6 +8,8 @@ from drf_spectacular.views import SpectacularAPIView
 from drf_spectacular.views import SpectacularSwaggerView
 from rest_framework.authtoken.views import obtain_auth_token
 
+from bookaloo.metrics import metrics_view
+
 urlpatterns = [
     path(
         "",
@@ -22,6 +24,7 @@ urlpatterns = [
     # path("accounts/", include("allauth.urls")),
     # path("api/auth-token/", obtain_auth_token, name="obtain_auth_token"),
     path("api/schema/", SpectacularAPIView.as_view(), name="api-schema"),
+    path("metrics", metrics_view, name="metrics"),
     # Media URLs
     *static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT),
 ]